@@ -0,0 +1,441 @@
+"""
+Network Benchmark
+Drives a local game server with a swarm of headless bots.
+
+Each bot is a NetworkClient (no pygame) following a scripted movement
+pattern. For every scenario (number of bots) a fresh server is started,
+the bots connect, warm up, and are then measured for a fixed time:
+
+    - input-to-snapshot latency: time from sending a new direction until
+      a snapshot shows the bot moving that way
+    - snapshots/s and bytes/s received per client, input bytes/s sent
+    - server CPU time (user + system) while it was running
+
+Results are written as JSON so runs from different versions can be
+compared with --compare.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from game.constants import *
+from game.movement import movement_vector
+from game.multiplayer.client import NetworkClient
+from game.multiplayer.protocol import CODEC_BINARY, CODEC_JSON
+
+RESULT_FORMAT = 1
+
+# Movement scripts; each bot cycles through one, changing every interval.
+# Consecutive entries are opposite so a change is visible in the next snapshot.
+PATTERNS = [
+    (MOVE_RIGHT, MOVE_LEFT),
+    (MOVE_DOWN, MOVE_UP),
+    (MOVE_DOWN_RIGHT, MOVE_UP_LEFT),
+    (MOVE_RIGHT, MOVE_NONE, MOVE_LEFT, MOVE_NONE),
+]
+
+# Metrics checked by --compare: (path in a scenario, True if higher is better)
+COMPARED_METRICS = [
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("snapshots_per_s",), True),
+    (("bytes_per_s",), False),
+    (("server_cpu_percent",), False),
+]
+
+
+class BotClient(NetworkClient):
+    """NetworkClient that plays a movement script and times its effect."""
+
+    def __init__(self, pattern, phase, codecs, use_udp):
+        # Bots measure raw snapshots; rendering aids would only cost CPU
+        super().__init__(codecs=codecs, use_udp=use_udp, predict=False, interpolation_delay=0)
+        self.pattern = pattern
+        self.step = phase
+        self.movement = MOVE_NONE
+        self.last_position = None
+        self.change_time = None  # Set while waiting to see the latest change
+        self.recording = False
+        self.latencies = []
+
+    def change_direction(self):
+        """Switch to the next movement in the script and send it."""
+        self.step = (self.step + 1) % len(self.pattern)
+        self.movement = self.pattern[self.step]
+        self.change_time = time.perf_counter() if self.movement != MOVE_NONE else None
+        self.send_input(self.movement)
+
+    def _merge_snapshot(self, snapshot):
+        seq = super()._merge_snapshot(snapshot)
+        if seq is None:
+            return seq
+        me = self.players.get(self.player_id)
+        if me is None or "x" not in me:
+            return seq
+        position = (me["x"], me["y"])
+        if self.change_time is not None and self.last_position is not None:
+            dx, dy = movement_vector(self.movement)
+            moved_x = (position[0] - self.last_position[0]) * dx
+            moved_y = (position[1] - self.last_position[1]) * dy
+            if moved_x > 0 or moved_y > 0:
+                if self.recording:
+                    self.latencies.append((time.perf_counter() - self.change_time) * 1000)
+                self.change_time = None
+        self.last_position = position
+        return seq
+
+
+def run_bots(worker, host, port, first_bot, count, settings, ready, go, results):
+    """
+    Worker process: connect `count` bots, wait for `go`, play and measure.
+
+    Puts one dict of raw measurements on `results`.
+    """
+    codecs = CODEC_JSON if settings["codec"] == "json" else CODEC_BINARY
+    bots = []
+    failures = 0
+    for index in range(first_bot, first_bot + count):
+        pattern = PATTERNS[index % len(PATTERNS)]
+        bot = BotClient(pattern, index % len(pattern), codecs, settings["udp"])
+        success, _ = bot.connect(host, port, f"bot{index}", f"bench-bot-{index}", settings["room"])
+        if success:
+            bots.append(bot)
+        else:
+            failures += 1
+    ready.put(worker)
+    go.wait()
+
+    frame = 1.0 / settings["input_rate"]
+    start = time.perf_counter()
+    measure_start = start + settings["warmup"]
+    end = measure_start + settings["duration"]
+    # Spread direction changes so bots do not all turn on the same tick
+    next_change = [start + settings["change_interval"] * (i + 1) / max(1, len(bots)) for i in range(len(bots))]
+    counters = None
+    next_frame = start
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        if counters is None and now >= measure_start:
+            counters = [(bot.bytes_received, bot.snapshots_received, bot.bytes_sent) for bot in bots]
+            for bot in bots:
+                bot.recording = True
+        for i, bot in enumerate(bots):
+            if now >= next_change[i]:
+                bot.change_direction()
+                next_change[i] += settings["change_interval"]
+            else:
+                # Like the game client, report the held direction every
+                # frame; queued changes go out once the rate cap allows
+                bot.send_input(bot.movement)
+        next_frame += frame
+        delay = next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_frame = time.perf_counter()
+    elapsed = time.perf_counter() - measure_start
+
+    counters = counters or [(bot.bytes_received, bot.snapshots_received, bot.bytes_sent) for bot in bots]
+    report = {
+        "connected": len(bots),
+        "failed": failures,
+        "disconnected": sum(1 for bot in bots if not bot.is_connected()),
+        "elapsed": elapsed,
+        "latencies": [latency for bot in bots for latency in bot.latencies],
+        "bytes": [bot.bytes_received - before[0] for bot, before in zip(bots, counters)],
+        "snapshots": [bot.snapshots_received - before[1] for bot, before in zip(bots, counters)],
+        "sent": [bot.bytes_sent - before[2] for bot, before in zip(bots, counters)],
+    }
+    for bot in bots:
+        bot.disconnect()
+    results.put(report)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, bots, args):
+    """Start server/game_server.py in a subprocess and wait until it accepts."""
+    command = [
+        sys.executable, str(ROOT / "server" / "game_server.py"),
+        "-H", "127.0.0.1", "-p", str(port), "-m", str(bots),
+        "-t", str(args.tick_rate), "--snapshot-rate", str(args.snapshot_rate), "--mode", args.mode,
+    ]
+    if args.udp:
+        command.append("--udp")
+    if args.shards > 1:
+        command += ["--shards", str(args.shards)]
+    log = open(args.server_log, "a") if args.server_log else subprocess.DEVNULL
+    process = subprocess.Popen(command, cwd=ROOT, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            # Shard workers take a moment longer than the supervisor's socket
+            time.sleep(0.5 if args.shards > 1 else 0.1)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Server did not start (see --server-log)")
+
+
+def stop_server(process):
+    """
+    Stop the server and return the CPU seconds it (and its shards) used.
+
+    Returns:
+        float or None: None where child CPU time is not available
+    """
+    try:
+        import resource
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    except ImportError:
+        resource = None
+    if os.name == "nt":
+        process.terminate()
+    else:
+        process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    if resource is None:
+        return None
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+
+def run_scenario(bots, args):
+    """Run one scenario and return its summary."""
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+        server = None
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = start_server(port, bots, args)
+        server_start = time.perf_counter()
+
+    settings = {
+        "codec": args.codec,
+        "udp": args.udp,
+        "room": args.room,
+        "input_rate": args.input_rate,
+        "change_interval": args.change_interval,
+        "warmup": args.warmup,
+        "duration": args.duration,
+    }
+    context = multiprocessing.get_context("spawn")
+    ready, go, results = context.Queue(), context.Event(), context.Queue()
+    workers = max(1, min(args.workers, bots))
+    processes = []
+    first = 0
+    for worker in range(workers):
+        count = bots // workers + (1 if worker < bots % workers else 0)
+        process = context.Process(
+            target=run_bots,
+            args=(worker, host, port, first, count, settings, ready, go, results),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+        first += count
+    for _ in processes:
+        ready.get(timeout=120)
+    go.set()
+    reports = [results.get(timeout=args.warmup + args.duration + 120) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+
+    cpu = None
+    if server:
+        cpu = stop_server(server)
+        server_time = time.perf_counter() - server_start
+
+    latencies = sorted(latency for report in reports for latency in report["latencies"])
+    elapsed = max(report["elapsed"] for report in reports)
+    per_client_bytes = [b / elapsed for report in reports for b in report["bytes"]]
+    per_client_snapshots = [s / elapsed for report in reports for s in report["snapshots"]]
+    per_client_sent = [b / elapsed for report in reports for b in report["sent"]]
+    return {
+        "bots": bots,
+        "connected": sum(report["connected"] for report in reports),
+        "failed": sum(report["failed"] for report in reports),
+        "disconnected": sum(report["disconnected"] for report in reports),
+        "duration_s": round(elapsed, 3),
+        "latency_ms": {
+            "samples": len(latencies),
+            "mean": round(statistics.fmean(latencies), 3) if latencies else None,
+            "p50": _rounded(percentile(latencies, 0.50)),
+            "p90": _rounded(percentile(latencies, 0.90)),
+            "p99": _rounded(percentile(latencies, 0.99)),
+            "max": _rounded(latencies[-1] if latencies else None),
+        },
+        "snapshots_per_s": _rounded(statistics.fmean(per_client_snapshots) if per_client_snapshots else 0),
+        "bytes_per_s": _rounded(statistics.fmean(per_client_bytes) if per_client_bytes else 0),
+        "bytes_per_s_total": _rounded(sum(per_client_bytes)),
+        "sent_bytes_per_s": _rounded(statistics.fmean(per_client_sent) if per_client_sent else 0),
+        # Averaged over the server's whole life (startup and connects included)
+        "server_cpu_s": _rounded(cpu),
+        "server_cpu_percent": _rounded(cpu / server_time * 100) if cpu is not None else None,
+    }
+
+
+def _rounded(value, digits=3):
+    return round(value, digits) if value is not None else None
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_scenario(result):
+    latency = result["latency_ms"]
+    cpu = result["server_cpu_percent"]
+    print(
+        f"  {result['bots']:>4} bots | connected {result['connected']:>4} | "
+        f"latency p50 {_fmt(latency['p50'])} p90 {_fmt(latency['p90'])} p99 {_fmt(latency['p99'])} ms | "
+        f"{result['snapshots_per_s']:.1f} snapshots/s | {result['bytes_per_s'] / 1024:.1f} KiB/s down "
+        f"{result['sent_bytes_per_s']:.0f} B/s up per client | "
+        f"server CPU {_fmt(cpu)}%"
+    )
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _metric(scenario, path):
+    value = scenario
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print current results against a baseline file.
+
+    Returns:
+        int: Number of metrics that got worse by more than `tolerance`
+    """
+    regressions = 0
+    old_scenarios = {scenario["bots"]: scenario for scenario in baseline.get("scenarios", [])}
+    print()
+    print(f"Compared with {baseline.get('git') or 'baseline'} ({baseline.get('timestamp', '?')}), tolerance {tolerance:.0%}:")
+    for scenario in results["scenarios"]:
+        old = old_scenarios.get(scenario["bots"])
+        if old is None:
+            print(f"  {scenario['bots']} bots: not in baseline")
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            before, after = _metric(old, path), _metric(scenario, path)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > tolerance else ""
+            regressions += 1 if flag else 0
+            name = ".".join(path)
+            print(f"  {scenario['bots']:>4} bots {name:<16} {before:>12.2f} -> {after:>12.2f} ({change:+.1%}) {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dash Dash network benchmark (headless bot swarm)")
+    parser.add_argument("--bots", type=int, nargs="+", default=[8, 64],
+                        help="Bot counts to run, one scenario each (default: 8 64)")
+    parser.add_argument("--duration", type=float, default=10, help="Measured seconds per scenario (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before that (default: 2)")
+    parser.add_argument("--mode", choices=("threaded", "event"), default="threaded", help="Server mode (default: threaded)")
+    parser.add_argument("--shards", type=int, default=1, help="Server shard processes (default: 1)")
+    parser.add_argument("--udp", action="store_true", help="Use the UDP channel")
+    parser.add_argument("--tick-rate", type=int, default=60, help="Server ticks per second (default: 60)")
+    parser.add_argument("--snapshot-rate", type=int, default=0,
+                        help="Server snapshots per second, 0 for every tick (default: 0)")
+    parser.add_argument("--codec", choices=("binary", "json"), default="binary", help="Payload codec (default: binary)")
+    parser.add_argument("--room", default="", help="Room every bot joins (default: the default room)")
+    parser.add_argument("--input-rate", type=float, default=60,
+                        help="Inputs per second while moving, like the game loop (default: 60)")
+    parser.add_argument("--change-interval", type=float, default=0.5,
+                        help="Seconds between direction changes per bot (default: 0.5)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Bot processes, so the bots are not limited by one GIL (default: 1)")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="Use an already running server instead of starting one (no CPU figures)")
+    parser.add_argument("--server-log", help="Append the server's output to this file")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative change reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    results = {
+        "format": RESULT_FORMAT,
+        "benchmark": "network",
+        "git": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "server_log")},
+        "scenarios": [],
+    }
+    print(f"Network benchmark: {args.mode} server, {'UDP' if args.udp else 'TCP'}, {args.codec} codec, "
+          f"{args.tick_rate} ticks/s, {args.duration:g}s per scenario")
+    for bots in args.bots:
+        result = run_scenario(bots, args)
+        results["scenarios"].append(result)
+        print_scenario(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
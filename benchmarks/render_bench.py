@@ -0,0 +1,352 @@
+"""
+Render Benchmark
+Times the game screen and the menus without a display or a server.
+
+Screens draw into SDL's dummy video driver. The game screen gets a fake
+NetworkClient with a fixed set of synthetic players, part of which move
+every frame. For every scenario (a menu, or the game screen with N
+players) frames are drawn for a warm-up and then measured:
+
+    - draw: the whole screen.draw() call, including the display update
+    - text: time spent getting text surfaces from the text cache
+    - flip: pygame.display.flip() / update() alone
+
+Results are written as JSON so runs from different versions can be
+compared with --compare. A baseline from the last release is kept in
+render_baseline.json next to this file, and is what --compare uses when no
+file is given. Timings depend on the machine, so regenerate the baseline
+(with -o) on the machine you compare on before trusting small changes.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+# Add parent directory to path for imports
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+
+from benchmarks.network_bench import git_revision, percentile
+from game.constants import *
+from gui import text_cache as text_cache_module
+from library.config_manager import ConfigManager
+
+RESULT_FORMAT = 1
+
+# Committed baseline used by --compare without a file
+BASELINE = Path(__file__).parent / "render_baseline.json"
+
+MENUS = ("main_menu", "multiplayer", "settings")
+
+# Metrics checked by --compare (lower is better for all of them)
+COMPARED_METRICS = [
+    ("draw_ms", "p50"),
+    ("draw_ms", "p99"),
+    ("text_ms", "p50"),
+    ("flip_ms", "p50"),
+]
+
+
+class FakeClient:
+    """
+    Stands in for NetworkClient: a fixed set of players, some of them moving.
+
+    Like the real client, get_players() returns a read-only snapshot that is
+    replaced (not changed) and get_render_positions() returns where each
+    player is drawn this frame.
+    """
+
+    def __init__(self, players, moving, bounds):
+        self.player_id = 1
+        self.bounds = bounds
+        self.frame = 0
+        self.players = MappingProxyType({
+            pid: MappingProxyType({"name": f"Player{pid}", "x": 0, "y": 0})
+            for pid in range(1, players + 1)
+        })
+        # Players move on circles around fixed points; the first `moving`
+        # share of them move, the rest stand still
+        self.paths = {}
+        for pid in self.players:
+            cx = bounds.left + (pid * 97) % max(1, bounds.width - PLAYER_SIZE)
+            cy = bounds.top + (pid * 61) % max(1, bounds.height - PLAYER_SIZE)
+            self.paths[pid] = (cx, cy, (pid - 1) < players * moving)
+        self.positions = {}
+        self.advance()
+
+    def advance(self):
+        """Move to the next frame."""
+        self.frame += 1
+        angle = self.frame / 30
+        positions = {}
+        for pid, (cx, cy, moving) in self.paths.items():
+            if moving:
+                positions[pid] = (cx + 40 * math.cos(angle + pid), cy + 40 * math.sin(angle + pid))
+            else:
+                positions[pid] = (cx, cy)
+        self.positions = positions
+
+    def get_players(self):
+        return self.players
+
+    def get_render_positions(self):
+        return self.positions
+
+    def is_connected(self):
+        return True
+
+    def send_input(self, movement, flush=False):
+        pass
+
+
+class FrameTimer:
+    """Accumulates time spent in a wrapped function during one frame."""
+
+    def __init__(self, function):
+        self.function = function
+        self.elapsed = 0.0
+
+    def __call__(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+    def take(self):
+        """Time accumulated since the last call."""
+        elapsed, self.elapsed = self.elapsed, 0.0
+        return elapsed
+
+
+def make_config(directory, resolution):
+    """Default settings, kept in `directory` so the real ones are untouched."""
+    class BenchConfig(ConfigManager):
+        CONFIG_DIR = Path(directory)
+        CONFIG_FILE = CONFIG_DIR / "settings.yaml"
+
+    config = BenchConfig()
+    config.set("display.resolution", list(resolution))
+    return config
+
+
+def make_screen(name, display, config, players, moving):
+    """Build the screen to measure and the per-frame action that drives it."""
+    if name == "game":
+        from gui.screens.game_screen import GameScreen
+        w, h = config.resolution
+        bounds = pygame.Rect(UI_SIDE_MARGIN, UI_TOP_HEIGHT, w - 2 * UI_SIDE_MARGIN, h - UI_TOP_HEIGHT - UI_BOTTOM_HEIGHT)
+        client = FakeClient(players, moving, bounds)
+        return GameScreen(display, config, client, True, None), client.advance
+
+    if name == "main_menu":
+        from gui.screens.main_menu import MainMenu
+        screen = MainMenu(display, config, {})
+    elif name == "multiplayer":
+        from gui.screens.multiplayer_menu import MultiplayerMenu
+        screen = MultiplayerMenu(display, config, {})
+    else:
+        from gui.screens.settings_menu import SettingsMenu
+        screen = SettingsMenu(display, config, {})
+
+    # Sweep the mouse across the screen so buttons change hover state
+    w, h = config.resolution
+    frame = [0]
+
+    def step():
+        frame[0] += 1
+        pos = ((frame[0] * 7) % w, (frame[0] * 3) % h)
+        screen.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+        screen.update(1 / 60)
+    return screen, step
+
+
+def _distribution(samples):
+    """Summary of per-frame times, in milliseconds."""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        "mean": round(statistics.fmean(values), 4),
+        "p50": round(percentile(values, 0.50), 4),
+        "p90": round(percentile(values, 0.90), 4),
+        "p99": round(percentile(values, 0.99), 4),
+        "max": round(values[-1], 4),
+    }
+
+
+def run_scenario(name, players, display, config, args):
+    """Draw one screen for the configured number of frames and return its summary."""
+    cache = text_cache_module.text_cache
+    text_timer = FrameTimer(cache.render)
+    flip_timer = FrameTimer(pygame.display.flip)
+    update_timer = FrameTimer(pygame.display.update)
+    cache.clear()
+    cache.render = text_timer
+    pygame.display.flip = flip_timer
+    pygame.display.update = update_timer
+    try:
+        screen, step = make_screen(name, display, config, players, args.moving)
+        screen.invalidate()
+        draw, text, flip = [], [], []
+        lookups = (cache.hits, cache.misses)
+        for frame in range(args.warmup + args.frames):
+            step()
+            text_timer.take()
+            flip_timer.take()
+            update_timer.take()
+            started = time.perf_counter()
+            screen.draw()
+            elapsed = time.perf_counter() - started
+            if frame == args.warmup - 1:
+                lookups = (cache.hits, cache.misses)
+            if frame >= args.warmup:
+                draw.append(elapsed)
+                text.append(text_timer.take())
+                flip.append(flip_timer.take() + update_timer.take())
+    finally:
+        del cache.render
+        pygame.display.flip = flip_timer.function
+        pygame.display.update = update_timer.function
+
+    hits, misses = cache.hits - lookups[0], cache.misses - lookups[1]
+    return {
+        "screen": name,
+        "players": players,
+        "frames": args.frames,
+        "draw_ms": _distribution(draw),
+        "text_ms": _distribution(text),
+        "flip_ms": _distribution(flip),
+        "full_redraws": screen.renderer.flips,
+        "partial_updates": screen.renderer.updates,
+        "text_cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+    }
+
+
+def print_scenario(result):
+    label = f"{result['screen']} {result['players']} players" if result["screen"] == "game" else result["screen"]
+    draw, text, flip = result["draw_ms"], result["text_ms"], result["flip_ms"]
+    print(
+        f"  {label:<20} | draw p50 {draw['p50']:.3f} p99 {draw['p99']:.3f} ms | "
+        f"text p50 {text['p50']:.3f} ms | flip p50 {flip['p50']:.3f} ms | "
+        f"{result['full_redraws']} full / {result['partial_updates']} partial | "
+        f"text cache {_percent(result['text_cache_hit_rate'])}"
+    )
+
+
+def _percent(value):
+    return "-" if value is None else f"{value:.1%}"
+
+
+def _key(scenario):
+    return (scenario["screen"], scenario["players"])
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Print current results against a baseline file.
+
+    Returns:
+        int: Number of metrics that got worse by more than `tolerance` and
+            by at least `min_delta` milliseconds
+    """
+    regressions = 0
+    old_scenarios = {_key(scenario): scenario for scenario in baseline.get("scenarios", [])}
+    print()
+    print(f"Compared with {baseline.get('git') or 'baseline'} ({baseline.get('timestamp', '?')}), tolerance {tolerance:.0%}:")
+    for key, value in results["settings"].items():
+        if key in baseline.get("settings", {}) and baseline["settings"][key] != value:
+            print(f"  Note: {key} was {baseline['settings'][key]} in the baseline, now {value}")
+    if baseline.get("platform") != results["platform"]:
+        print(f"  Note: baseline is from {baseline.get('platform', 'another machine')}")
+    for scenario in results["scenarios"]:
+        old = old_scenarios.get(_key(scenario))
+        label = f"{scenario['screen']}/{scenario['players']}"
+        if old is None:
+            print(f"  {label}: not in baseline")
+            continue
+        for metric, stat in COMPARED_METRICS:
+            before, after = old[metric][stat], scenario[metric][stat]
+            change = (after - before) / before if before else 0.0
+            flag = "REGRESSION" if change > tolerance and after - before >= min_delta else ""
+            regressions += 1 if flag else 0
+            name = f"{metric}.{stat}"
+            print(f"  {label:<16} {name:<12} {before:>9.3f} -> {after:>9.3f} ({change:+.1%}) {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dash Dash render benchmark (SDL dummy video driver)")
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 10, 100, 500],
+                        help="Player counts for the game screen, one scenario each (default: 1 10 100 500)")
+    parser.add_argument("--menus", nargs="*", choices=MENUS, default=list(MENUS),
+                        help="Menus to measure (default: all)")
+    parser.add_argument("--frames", type=int, default=600, help="Measured frames per scenario (default: 600)")
+    parser.add_argument("--warmup", type=int, default=60, help="Unmeasured frames before that (default: 60)")
+    parser.add_argument("--moving", type=float, default=0.5,
+                        help="Share of players moving every frame (default: 0.5)")
+    parser.add_argument("--resolution", default="800x600", help="Window size WxH (default: 800x600)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", nargs="?", const=str(BASELINE),
+                        help=f"Compare with a previous results file (default: {BASELINE.relative_to(ROOT)})")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Relative change reported as a regression (default: 0.20)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Smallest change in ms reported as a regression, so noise on "
+                             "near-zero timings is ignored (default: 0.05)")
+    args = parser.parse_args()
+    resolution = tuple(int(part) for part in args.resolution.lower().split("x"))
+
+    pygame.display.init()
+    pygame.font.init()
+    display = pygame.display.set_mode(resolution)
+
+    results = {
+        "format": RESULT_FORMAT,
+        "benchmark": "render",
+        "git": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+        "video_driver": pygame.display.get_driver(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "tolerance", "min_delta")},
+        "scenarios": [],
+    }
+    print(f"Render benchmark: {results['video_driver']} video driver, {resolution[0]}x{resolution[1]}, "
+          f"{args.frames} frames per scenario")
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(directory, resolution)
+        scenarios = [(menu, 0) for menu in args.menus] + [("game", players) for players in args.players]
+        for name, players in scenarios:
+            result = run_scenario(name, players, display, config, args)
+            results["scenarios"].append(result)
+            print_scenario(result)
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance, args.min_delta):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
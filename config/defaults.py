@@ -16,7 +16,9 @@ DEFAULT_CONFIG = {
     },
     "singleplayer": {"speed": 10, "difficulty": "medium"},
     "multiplayer": {"lobby_name": "My Lobby", "lobby_password": "", "max_players": 4, "speed": 10},
-    "server": {"ip": "127.0.0.1", "port": 50000, "timeout": 5}
+    "server": {"ip": "127.0.0.1", "port": 50000, "timeout": 5, "connect_retries": 3, "retry_backoff": 0.5, "udp": False},
+    "logging": {"level": "INFO", "rate": 20},
+    "network": {"prediction": True, "interpolation_delay": 0.1, "max_extrapolation": 0.1, "input_rate": 30}
 }
 
 CONSTRAINTS = {
@@ -0,0 +1,51 @@
+"""
+Movement Rules
+Shared by the server simulation and anything that must reproduce it.
+"""
+
+from game.constants import *
+
+
+def movement_vector(movement):
+    """
+    Convert a movement bitmask into a direction.
+
+    Args:
+        movement: int (bitwise MOVE_* flags)
+
+    Returns:
+        tuple: (dx, dy), each -1, 0 or 1
+    """
+    dx = dy = 0
+    if movement & MOVE_UP:
+        dy -= 1
+    if movement & MOVE_DOWN:
+        dy += 1
+    if movement & MOVE_LEFT:
+        dx -= 1
+    if movement & MOVE_RIGHT:
+        dx += 1
+    return (dx, dy)
+
+
+# Precomputed for every 4-bit mask (opposite keys cancel out)
+MOVEMENT_VECTORS = {movement: movement_vector(movement) for movement in range(16)}
+
+
+def step(x, y, movement, speed=PLAYER_SPEED, diagonal_speed=PLAYER_SPEED_DIAGONAL):
+    """
+    Apply one simulation tick of movement.
+
+    Args:
+        x, y: Current position
+        movement: int (bitwise MOVE_* flags)
+        speed: Distance per tick along one axis
+        diagonal_speed: Distance per tick along each axis when moving diagonally
+
+    Returns:
+        tuple: New (x, y)
+    """
+    dx, dy = MOVEMENT_VECTORS[movement & 0xF]
+    if dx != 0 and dy != 0:
+        speed = diagonal_speed
+    return (x + dx * speed, y + dy * speed)
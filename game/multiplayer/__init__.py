@@ -4,5 +4,6 @@
 """Multiplayer module."""
 
 from .client import NetworkClient
+from .connector import ConnectAttempt
 
-__all__ = ['NetworkClient']
+__all__ = ['NetworkClient', 'ConnectAttempt']
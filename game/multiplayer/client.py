@@ -3,35 +3,96 @@ Network Client
 Handles connection to game server and data synchronization.
 """
 
+import logging
 import socket
 import threading
-import json
 import time
+from types import MappingProxyType
+
+from game.multiplayer.protocol import *
+from game.multiplayer.udp import wrap_udp_socket
+from game.multiplayer.prediction import Predictor
+from game.multiplayer.interpolation import InterpolationBuffer
+
+log = logging.getLogger("client")
+snapshot_log = logging.getLogger("client.snapshot")  # Every snapshot; DEBUG only
+
+NO_PLAYERS = MappingProxyType({})
 
 
 class NetworkClient:
     """Manages client-server communication."""
     
-    def __init__(self):
+    SNAPSHOT_HISTORY = 32  # Applied snapshots kept as possible delta baselines
+    UDP_RESEND_INTERVAL = 0.1  # Seconds between UDP bind retries / input refreshes
+    
+    def __init__(self, codecs=CODEC_BINARY | CODEC_JSON, use_udp=False, udp_loss=0.0, predict=True,
+                 interpolation_delay=0.1, max_extrapolation=0.1, input_rate=30):
+        """
+        Args:
+            codecs: Payload codecs to offer the server (CODEC_* bit flags)
+            use_udp: Ask for inputs and snapshots over UDP (TCP stays for the handshake)
+            udp_loss: Artificial UDP packet loss (0.0-1.0), for testing
+            predict: Predict the local player's movement between snapshots
+            interpolation_delay: Seconds remote players are drawn in the past (0 = off)
+            max_extrapolation: Seconds remote players may be extrapolated when late
+            input_rate: Most input packets sent per second (0 = no cap)
+        """
         self.socket = None
         self.connected = False
         self.running = False
-        self.players = {}
+        self.players = NO_PLAYERS  # Latest snapshot, read-only; replaced, never modified
         self.player_name = "Player"
         self.client_id = None  # Store client ID
-        self.lock = threading.Lock()
         self.receive_thread = None
         self.connection_error = None
+        self.rejected = False  # The last connect() was refused by the server (not worth retrying)
+        self.codecs = codecs
+        self.codec = None
+        self.player_id = None
+        self.predict = predict
+        self.predictor = None  # Created once the server's tick rate is known
+        self.interpolation_delay = interpolation_delay
+        self.max_extrapolation = max_extrapolation
+        self.interpolation = None
+        self.tick_rate = 0
+        self.decoder = FrameDecoder()
+        self.send_lock = threading.RLock()  # Receive threads send acks and inputs too
+        self.snapshots = {}  # {seq: players} deltas may be based on
+        self.snapshot_seq = 0
+        self.snapshot_lock = threading.Lock()  # Snapshots arrive on TCP and UDP threads
+        self.input_seq = 0
+        self.acked_input_seq = 0  # Latest input seq a snapshot said the server applied
+        self.last_movement = 0
+        self.last_input_time = 0.0
+        self.input_interval = 1.0 / input_rate if input_rate else 0.0
+        self.pending_inputs = []  # [(seq, movement)] changes waiting for the next send slot
+        self.use_udp = use_udp
+        self.udp_loss = udp_loss
+        self.udp_socket = None
+        self.udp_port = 0
+        self.udp_token = 0
+        self.udp_bound = False
+        self.udp_thread = None
+        self.bytes_received = 0  # Traffic counters (TCP and UDP), used by benchmarks
+        self.bytes_sent = 0
+        self.inputs_sent = 0
+        self.snapshots_received = 0
     
-    def connect(self, host, port, username, client_id):
+    def connect(self, host, port, username, client_id, room="", timeout=5):
         """
         Connect to game server.
         
+        Blocks until connected or failed; see game.multiplayer.connector
+        for connecting in the background.
+        
         Args:
             host: Server IP address
             port: Server port
             username: Player name
             client_id: Unique client identifier
+            room: Room (lobby) to join; players only see others in the same room
+            timeout: Seconds to wait for the connection and the handshake
             
         Returns:
             tuple: (success: bool, error_message: str or None)
@@ -40,15 +101,17 @@ class NetworkClient:
             # Close existing connection if any
             if self.socket:
                 self.disconnect()
+            self.rejected = False
             
             # Create new socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(5)  # 5 second timeout for connection
+            self.socket.settimeout(timeout)
+            # Inputs are already batched; don't let Nagle hold them back
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             
             # Try to connect
-            print(f"Connecting to {host}:{port}...")
+            log.info("Connecting to %s:%s...", host, port)
             self.socket.connect((host, port))
-            self.socket.settimeout(None)  # Remove timeout after connection
             
             self.connected = True
             self.running = True
@@ -57,111 +120,306 @@ class NetworkClient:
             self.connection_error = None
             
             # Send initial handshake with client_id
-            initial_state = {
-                "movement": 0,
-                "name": username,
-                "client_id": client_id
-            }
-            self.socket.sendall(json.dumps(initial_state).encode())
+            self.decoder = FrameDecoder()
+            self.codec = None
+            self.predictor = None
+            self.interpolation = None
+            self.snapshots = {}
+            self.snapshot_seq = 0
+            self.input_seq = 0
+            self.acked_input_seq = 0
+            self.last_movement = 0
+            self.last_input_time = 0.0
+            self.pending_inputs = []
+            flags = HELLO_UDP if self.use_udp else 0
+            self.socket.sendall(encode_hello(username, client_id, self.codecs, flags, room))
             
-            # Wait for response
-            data = self.socket.recv(4096)
-            if data:
-                response = json.loads(data.decode())
-                # Check for error (duplicate client_id)
-                if isinstance(response, dict) and "error" in response:
-                    if response["error"] == "CLIENT_ALREADY_CONNECTED":
+            # Wait for response (welcome or error); the initial snapshot
+            # usually arrives in the same read
+            while self.codec is None:
+                if not self.decoder.recv_from(self.socket):
+                    raise ConnectionError("Server closed connection during handshake")
+                for msg_type, payload in self.decoder.frames():
+                    if msg_type == MSG_ERROR:
+                        error = decode_error(payload)
                         self.socket.close()
+                        self.socket = None
                         self.connected = False
-                        error_msg = "This client is already connected to the server"
-                        print(f"Connection failed: {error_msg}")
+                        self.rejected = True
+                        if error == ERROR_CLIENT_ALREADY_CONNECTED:
+                            error_msg = "This client is already connected to the server"
+                        else:
+                            error_msg = f"Server rejected connection: {error}"
+                        log.warning("Connection failed: %s", error_msg)
                         return (False, error_msg)
-                
-                # Success - store initial player data
-                with self.lock:
-                    self.players = response
+                    self._handle_frame(msg_type, payload)
+            self.socket.settimeout(None)
             
             # Start receive thread
             self.receive_thread = threading.Thread(target=self._receive_data, daemon=True)
             self.receive_thread.start()
+            if self.udp_token:
+                self._open_udp(host)
             
-            print(f"Connected to server at {host}:{port}")
+            log.info("Connected to server at %s:%s", host, port)
             return (True, None)
             
         except socket.timeout:
             self.connected = False
             error_msg = "Connection timeout - server not responding"
-            print(f"Connection failed: {error_msg}")
+            log.warning("Connection failed: %s", error_msg)
             return (False, error_msg)
             
         except ConnectionRefusedError:
             self.connected = False
             error_msg = "Connection refused - server not running"
-            print(f"Connection failed: {error_msg}")
+            log.warning("Connection failed: %s", error_msg)
             return (False, error_msg)
             
         except Exception as e:
             self.connected = False
+            self.codec = None
             error_msg = f"Connection error: {str(e)}"
-            print(f"Connection failed: {error_msg}")
+            log.warning("Connection failed: %s", error_msg)
             return (False, error_msg)
     
+    def abort_connect(self):
+        """Make a connect() running on another thread fail promptly."""
+        sock = self.socket
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
     def disconnect(self):
         """Disconnect from server."""
-        print("Disconnecting from server...")
+        log.info("Disconnecting from server...")
         self.running = False
         self.connected = False
         
         if self.socket:
+            try:
+                # Wake the receive thread blocked in recv() and notify the server
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
             try:
                 self.socket.close()
             except:
                 pass
             self.socket = None
+        if self.udp_socket:
+            try:
+                self.udp_socket.close()
+            except OSError:
+                pass
+            self.udp_socket = None
         
-        # Wait for receive thread to finish
+        # Wait for receive threads to finish
         if self.receive_thread and self.receive_thread.is_alive():
             self.receive_thread.join(timeout=1)
+        if self.udp_thread and self.udp_thread.is_alive():
+            self.udp_thread.join(timeout=1)
         
-        with self.lock:
-            self.players = {}
+        self.players = NO_PLAYERS
+        self.codec = None
+        self.player_id = None
+        self.predictor = None
+        self.interpolation = None
+        self.udp_token = 0
+        self.udp_bound = False
         
-        print("Disconnected")
+        log.info("Disconnected")
     
     def _receive_data(self):
         """Background thread to receive game state from server."""
         while self.running and self.connected:
             try:
-                data = self.socket.recv(4096)
-                if not data:
-                    print("Server closed connection")
+                count = self.decoder.recv_from(self.socket)
+                if not count:
+                    log.info("Server closed connection")
                     self.connected = False
                     self.connection_error = "Server closed connection"
                     break
+                self.bytes_received += count
                 
-                # Deserialize player data
-                with self.lock:
-                    self.players = json.loads(data.decode())
-                    print(f"Received player data: {self.players}")
+                # Handle every complete frame (TCP may merge or split
+                # them), parsed in place from the receive buffer
+                for msg_type, payload in self.decoder.frames():
+                    self._handle_frame(msg_type, payload)
                     
             except ConnectionResetError:
-                print("Connection reset by server")
+                log.info("Connection reset by server")
                 self.connected = False
                 self.connection_error = "Connection lost"
                 break
                 
             except Exception as e:
                 if self.running:  # Only log if not intentionally disconnecting
-                    print(f"Receive error: {e}")
+                    log.error("Receive error: %s", e)
                     self.connected = False
                     self.connection_error = f"Network error: {str(e)}"
                 break
         
-        print("Receive thread stopped")
+        log.info("Receive thread stopped")
+    
+    def _handle_frame(self, msg_type, payload):
+        """Apply one frame received from the server."""
+        if msg_type == MSG_WELCOME:
+            welcome = decode_welcome(payload)
+            self.player_id = welcome["player_id"]
+            self.codec = welcome["codec"]
+            self.udp_port = welcome["udp_port"]
+            self.udp_token = welcome["udp_token"]
+            self.tick_rate = welcome["tick_rate"]
+            if self.predict and self.tick_rate:
+                self.predictor = Predictor(self.tick_rate, welcome["speed"])
+            if self.interpolation_delay > 0 and self.tick_rate:
+                self.interpolation = InterpolationBuffer(self.interpolation_delay, self.max_extrapolation)
+        elif msg_type == MSG_SNAPSHOT:
+            self._apply_snapshot(decode_snapshot(payload, self.codec))
+        elif msg_type == MSG_SETTINGS:
+            speed = decode_settings(payload)["speed"]
+            log.info("Server changed player speed to %s", speed)
+            if self.predictor:
+                self.predictor.set_speed(speed)
+        elif msg_type == MSG_ERROR:
+            raise ProtocolError(decode_error(payload))
+    
+    def _open_udp(self, host):
+        """Create the UDP socket and start announcing our address to the server."""
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp.connect((host, self.udp_port))
+        udp.settimeout(self.UDP_RESEND_INTERVAL)
+        self.udp_socket = wrap_udp_socket(udp, self.udp_loss)
+        self.udp_bound = False
+        self.udp_thread = threading.Thread(target=self._receive_udp, daemon=True)
+        self.udp_thread.start()
+    
+    def _receive_udp(self):
+        """
+        Background thread for the UDP channel.
+        
+        Besides receiving snapshots it retries the address binding until the
+        server confirms it, and resends the latest input until the server has
+        applied it (in case the game loop is not calling send_input), so a
+        lost datagram cannot leave the player stuck moving (or stopped).
+        """
+        udp = self.udp_socket
+        buffer = memoryview(bytearray(2048))  # Reused for every datagram
+        while self.running and self.connected:
+            if not self.udp_bound:
+                self._send_datagram(encode_frame(MSG_UDP_BIND))
+            unacked = self.acked_input_seq < self.input_seq
+            if unacked and time.monotonic() - self.last_input_time >= self.UDP_RESEND_INTERVAL:
+                self._resend_input()
+            try:
+                count = udp.recv_into(buffer)
+                msg_type, token, payload = decode_datagram(buffer[:count])
+            except socket.timeout:
+                continue
+            except ProtocolError:
+                continue
+            except OSError:
+                break
+            if token != self.udp_token:
+                continue
+            self.bytes_received += count
+            self.udp_bound = True
+            if msg_type == MSG_SNAPSHOT:
+                try:
+                    self._apply_snapshot(decode_snapshot(payload, self.codec))
+                except ProtocolError:
+                    continue
+    
+    def _send_datagram(self, frame):
+        """Send a frame over UDP (losses are expected and ignored)."""
+        try:
+            datagram = encode_datagram(frame, self.udp_token)
+            self.udp_socket.send(datagram)
+            self.bytes_sent += len(datagram)
+        except (OSError, AttributeError):
+            pass
+    
+    def _apply_snapshot(self, snapshot):
+        """Rebuild the player map from a keyframe or delta and acknowledge it."""
+        with self.snapshot_lock:
+            seq = self._merge_snapshot(snapshot)
+        if seq is None:
+            return
+        ack = encode_ack(seq, self.codec)
+        if self.udp_socket:
+            self._send_datagram(ack)
+        else:
+            self._send(ack)
+    
+    def _merge_snapshot(self, snapshot):
+        """
+        Build the new player map and publish it.
+        
+        Snapshots are frozen (read-only mappings) once built; the next one
+        copies only the entries it changes, so the renderer can keep using
+        whichever snapshot it last got without locking.
+        
+        Returns:
+            int or None: Seq to acknowledge, or None if the snapshot was dropped
+        """
+        seq = snapshot["seq"]
+        base = snapshot["base"]
+        if seq <= self.snapshot_seq:
+            return None  # Stale (reordered or duplicated datagram)
+        if base == KEYFRAME:
+            players = {}
+        elif base in self.snapshots:
+            players = dict(self.snapshots[base])
+        else:
+            return None  # Baseline unknown; the server falls back to a keyframe
+        
+        for pid, fields in snapshot["players"].items():
+            player = dict(players.get(pid, {}))
+            player.update(fields)
+            players[pid] = MappingProxyType(player)
+        for pid in snapshot["removed"]:
+            players.pop(pid, None)
+        players = MappingProxyType(players)
+        
+        # The server never goes back to a baseline older than this one (a
+        # keyframe says nothing about which acks the server has seen yet)
+        for old_seq in [s for s in self.snapshots if s < base]:
+            del self.snapshots[old_seq]
+        self.snapshots[seq] = players
+        if len(self.snapshots) > self.SNAPSHOT_HISTORY:
+            del self.snapshots[min(self.snapshots)]
+        self.snapshot_seq = seq
+        self.snapshots_received += 1
+        self.acked_input_seq = max(self.acked_input_seq, snapshot["input_seq"])
+        
+        if self.interpolation:
+            self.interpolation.add(snapshot["tick"] / self.tick_rate, players, time.perf_counter())
+        me = players.get(self.player_id)
+        if self.predictor and me and "x" in me:
+            self.predictor.reconcile(me["x"], me["y"], snapshot["input_seq"], snapshot["input_ticks"])
+        
+        self.players = players  # Published with one reference swap
+        snapshot_log.debug("Received player data: %s", players)
+        return seq
+    
+    def _send(self, data):
+        """Send raw frame bytes (callers run on both the game and receive threads)."""
+        with self.send_lock:
+            self.socket.sendall(data)
+            self.bytes_sent += len(data)
     
-    def send_input(self, movement_direction):
+    def send_input(self, movement_direction, flush=False):
         """
-        Send player input to server.
+        Report the player's input; call it every frame.
+        
+        The server keeps applying the last movement it received, so only
+        changes go on the wire. Changes arriving faster than the input rate
+        cap are queued and sent together in one batch at the next free slot.
+        Over UDP the latest input is repeated at that rate until a snapshot
+        shows the server has applied it.
         
         Args:
             movement_direction: int (bitwise flags) representing movement direction
@@ -174,42 +432,98 @@ class NetworkClient:
                 9 = up-right (1 | 8)
                 6 = down-left (2 | 4)
                 10 = down-right (2 | 8)
+            flush: Send queued changes now, ignoring the rate cap
             
         Returns:
-            bool: True if sent successfully
+            bool: True unless the connection failed
         """
         if not self.connected or not self.socket:
             return False
         
         try:
-            # Create input state with movement, name, and client_id
-            input_state = {
-                "movement": movement_direction,
-                "name": self.player_name,
-                "client_id": self.client_id
-            }
-            
-            # Serialize and send
-
-            data = json.dumps(input_state).encode()
-            self.socket.sendall(data)
+            # Name and client_id were sent once in the handshake
+            with self.send_lock:
+                if movement_direction != self.last_movement:
+                    self.input_seq += 1
+                    self.last_movement = movement_direction
+                    if self.predictor:
+                        self.predictor.record_input(self.input_seq, movement_direction)
+                    self.pending_inputs.append((self.input_seq, movement_direction))
+                    del self.pending_inputs[:-MAX_INPUT_BATCH]
+                unacked = self.udp_socket and self.acked_input_seq < self.input_seq
+                if not self.pending_inputs and not unacked:
+                    return True
+                now = time.monotonic()
+                if not flush and now - self.last_input_time < self.input_interval:
+                    return True
+                self._send_inputs(self.pending_inputs or [(self.input_seq, self.last_movement)], now)
+                self.pending_inputs = []
             return True
             
         except Exception as e:
-            print(f"Send error: {e}")
+            log.error("Send error: %s", e)
             self.connected = False
             self.connection_error = "Failed to send data"
             return False
     
+    def _resend_input(self):
+        """Resend the latest input (the server ignores seqs it already has)."""
+        with self.send_lock:
+            inputs = self.pending_inputs or [(self.input_seq, self.last_movement)]
+            self._send_inputs(inputs, time.monotonic())
+            self.pending_inputs = []
+    
+    def _send_inputs(self, inputs, now):
+        frame = encode_inputs(inputs, self.codec)
+        if self.udp_socket:
+            self._send_datagram(frame)
+        else:
+            self._send(frame)
+        self.last_input_time = now
+        self.inputs_sent += 1
+    
     def get_players(self):
         """
         Get current player positions.
         
+        The latest snapshot is returned as is: neither locked nor copied.
+        It never changes; call again for a newer one.
+        
+        Returns:
+            Mapping: Read-only {player_id (int): {"x": x, "y": y, "name": name}}
+        """
+        return self.players
+    
+    def get_render_positions(self):
+        """
+        Get where to draw players this frame.
+        
+        Remote players are placed by the interpolation buffer and the local
+        player where prediction puts it. Players not listed are drawn at
+        their get_players() position.
+        
+        Returns:
+            dict: {player_id (int): (x, y)}, new on every call
+        """
+        interpolation = self.interpolation
+        positions = interpolation.positions(time.perf_counter()) if interpolation else {}
+        predicted = self.get_predicted_position()
+        if predicted:
+            positions[self.player_id] = predicted
+        return positions
+    
+    def get_predicted_position(self):
+        """
+        Get where to draw the local player.
+        
         Returns:
-            dict: {player_id: {"x": x, "y": y, "name": name}}
+            tuple or None: (x, y), or None without prediction (use get_players())
         """
-        with self.lock:
-            return self.players.copy()
+        predictor = self.predictor
+        if predictor is None:
+            return None
+        predictor.advance(time.perf_counter())
+        return predictor.get_position()
     
     def is_connected(self):
         """Check if connected to server."""
@@ -0,0 +1,105 @@
+"""
+Background Connect
+Connects a NetworkClient on a worker thread so the UI keeps running.
+"""
+
+import logging
+import threading
+import time
+
+log = logging.getLogger("client")
+
+
+class ConnectAttempt:
+    """
+    Connects a NetworkClient on a worker thread, retrying with backoff.
+
+    The UI polls `state` (with `attempt`, `error` and `retry_in()`) every
+    frame instead of blocking in NetworkClient.connect(). Failed attempts
+    are retried up to `retries` times, waiting `backoff`, then twice as
+    long each time (at most MAX_BACKOFF); a rejection by the server (full,
+    already connected, ...) is final.
+
+    The client must not be used by anyone else until `done` is True.
+    """
+
+    CONNECTING = "connecting"
+    WAITING = "waiting"        # Backing off before the next attempt
+    CONNECTED = "connected"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    MAX_BACKOFF = 8.0
+
+    def __init__(self, client, host, port, username, client_id, room="", timeout=5, retries=3, backoff=0.5):
+        """
+        Args:
+            client: NetworkClient to connect
+            host, port, username, client_id, room: As for NetworkClient.connect()
+            timeout: Seconds allowed for each attempt
+            retries: Further attempts after the first one fails
+            backoff: Seconds to wait before the first retry
+        """
+        self.client = client
+        self.address = (host, port)
+        self.identity = (username, client_id, room)
+        self.timeout = timeout
+        self.attempts = retries + 1
+        self.backoff = backoff
+        self.state = self.CONNECTING
+        self.attempt = 0
+        self.error = None
+        self.retry_at = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    @property
+    def done(self):
+        return self.state in (self.CONNECTED, self.FAILED, self.CANCELLED)
+
+    def retry_in(self):
+        """
+        Returns:
+            float: Seconds until the next attempt (0 unless waiting)
+        """
+        if self.state != self.WAITING or self.retry_at is None:
+            return 0.0
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def cancel(self):
+        """Stop retrying and abort the attempt in progress (done soon after)."""
+        self.cancelled.set()
+        if self.state == self.CONNECTING:
+            self.client.abort_connect()
+
+    def _run(self):
+        delay = self.backoff
+        while True:
+            self.attempt += 1
+            self.state = self.CONNECTING
+            host, port = self.address
+            username, client_id, room = self.identity
+            success, error = self.client.connect(host, port, username, client_id, room, self.timeout)
+            if self.cancelled.is_set():
+                if success:
+                    self.client.disconnect()
+                self.state = self.CANCELLED
+                return
+            if success:
+                self.state = self.CONNECTED
+                return
+            self.error = error
+            if self.client.rejected or self.attempt >= self.attempts:
+                self.state = self.FAILED
+                return
+            log.info("Retrying in %.1fs (attempt %s/%s)", delay, self.attempt + 1, self.attempts)
+            self.retry_at = time.monotonic() + delay
+            self.state = self.WAITING
+            if self.cancelled.wait(delay):
+                self.state = self.CANCELLED
+                return
+            delay = min(delay * 2, self.MAX_BACKOFF)
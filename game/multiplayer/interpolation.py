@@ -0,0 +1,114 @@
+"""
+Snapshot Interpolation
+Smooth rendering of remote players from irregularly arriving snapshots.
+"""
+
+import threading
+
+
+class InterpolationBuffer:
+    """
+    Ring buffer of recent snapshots stamped with server time.
+
+    Remote players are drawn `delay` seconds in the past, between the two
+    snapshots bracketing that moment, so uneven packet arrival (or a low
+    server snapshot rate) does not show as stutter. If no newer snapshot has
+    arrived yet, positions are extrapolated from the last two, for at most
+    `max_extrapolation` seconds.
+
+    Server time comes from the tick number in each snapshot; the offset to
+    the local clock is estimated from arrival times.
+
+    The history and clock offset are published together as one immutable
+    tuple, so positions() (the render thread) never takes a lock.
+    """
+
+    SIZE = 32               # Snapshots kept
+    CLOCK_SMOOTHING = 0.05  # Weight of each new sample in the clock offset estimate
+
+    def __init__(self, delay, max_extrapolation):
+        """
+        Args:
+            delay: Seconds behind the newest server state to render
+            max_extrapolation: Seconds to extrapolate past the newest snapshot
+        """
+        self.delay = delay
+        self.max_extrapolation = max_extrapolation
+        # (((server time, players), ...) oldest first, server time - local time)
+        self.state = ((), None)
+        self.lock = threading.Lock()  # Writers only
+
+    def add(self, server_time, players, local_time):
+        """
+        Store a snapshot.
+
+        Args:
+            server_time: Server simulation time of the snapshot (seconds)
+            players: {player_id: {"x", "y", ...}}; not modified afterwards
+            local_time: time.perf_counter() when it arrived
+        """
+        with self.lock:
+            snapshots, clock_offset = self.state
+            if snapshots and server_time <= snapshots[-1][0]:
+                # Same tick (or reordered): keep the newest state only
+                if server_time == snapshots[-1][0]:
+                    self.state = (snapshots[:-1] + ((server_time, players),), clock_offset)
+                return
+            snapshots = snapshots[1 - self.SIZE:] + ((server_time, players),)
+            sample = server_time - local_time
+            if clock_offset is None or sample > clock_offset:
+                # First sample, or arrived faster than estimated: less
+                # latency than assumed
+                clock_offset = sample
+            else:
+                clock_offset += (sample - clock_offset) * self.CLOCK_SMOOTHING
+            self.state = (snapshots, clock_offset)
+
+    def positions(self, local_time):
+        """
+        Interpolated positions at `local_time` minus the delay.
+
+        Returns:
+            dict: {player_id: (x, y)} for players in the buffered snapshots
+        """
+        snapshots, clock_offset = self.state
+        if not snapshots:
+            return {}
+        render_time = local_time + clock_offset - self.delay
+        newest_time, newest = snapshots[-1]
+        if render_time >= newest_time:
+            if len(snapshots) < 2:
+                return _positions(newest)
+            older_time, older = snapshots[-2]
+            render_time = min(render_time, newest_time + self.max_extrapolation)
+            return _blend(older, newest, (render_time - older_time) / (newest_time - older_time))
+        previous_time, previous = snapshots[0]
+        if render_time <= previous_time:
+            return _positions(previous)
+        for snapshot_time, players in snapshots:
+            if snapshot_time >= render_time:
+                return _blend(previous, players, (render_time - previous_time) / (snapshot_time - previous_time))
+            previous_time, previous = snapshot_time, players
+        return _positions(newest)
+
+    def clear(self):
+        with self.lock:
+            self.state = ((), None)
+
+
+def _positions(players):
+    return {pid: (p["x"], p["y"]) for pid, p in players.items() if "x" in p}
+
+
+def _blend(start, end, fraction):
+    """Positions a `fraction` of the way from `start` to `end` (beyond 1 extrapolates)."""
+    positions = {}
+    for pid, p in end.items():
+        if "x" not in p:
+            continue
+        s = start.get(pid)
+        if s is None or "x" not in s:
+            positions[pid] = (p["x"], p["y"])  # Just appeared
+        else:
+            positions[pid] = (s["x"] + (p["x"] - s["x"]) * fraction, s["y"] + (p["y"] - s["y"]) * fraction)
+    return positions
@@ -0,0 +1,124 @@
+"""
+Client-Side Prediction
+Moves the local player immediately and reconciles with the server.
+"""
+
+import math
+import threading
+from collections import deque
+
+from game.constants import *
+from game.movement import step
+
+
+class Predictor:
+    """
+    Predicts the local player's position between server snapshots.
+
+    The server applies the latest movement bitmask once per tick. The
+    predictor runs the same rules (game.movement.step) at the server's tick
+    rate and remembers, for every input sent, how many local ticks it was
+    held. A snapshot says which input the server applied last and for how
+    many ticks; the predicted position is the authoritative one plus the
+    movement the server has not simulated yet. The server stays the only
+    authority: the prediction is rebuilt from its position every snapshot.
+
+    Small corrections are blended out over a few frames instead of snapping.
+    """
+
+    MAX_PENDING = 512        # Unacknowledged inputs remembered
+    MAX_CATCHUP_TICKS = 5    # Local ticks run per call before dropping the backlog
+    SNAP_DISTANCE = PLAYER_SIZE * 2  # Corrections larger than this are applied at once
+    SMOOTHING = 15.0         # Rate (1/s) at which a correction is blended out
+
+    def __init__(self, tick_rate, speed):
+        """
+        Args:
+            tick_rate: Server ticks per second
+            speed: Server player speed (distance per tick along one axis)
+        """
+        self.tick_interval = 1.0 / tick_rate
+        self.speed = speed
+        self.lock = threading.Lock()  # Inputs come from the game thread, snapshots from receive threads
+        self.position = None          # Predicted (x, y); None until the first snapshot
+        self.offset = (0.0, 0.0)      # Correction still being blended out
+        self.movement = MOVE_NONE
+        self.pending = deque()        # [[input seq, movement, local ticks held], ...]
+        self.next_tick = None
+        self.last_advance = None
+
+    def record_input(self, seq, movement):
+        """Remember an input that was just sent."""
+        with self.lock:
+            self.pending.append([seq, movement, 0])
+            if len(self.pending) > self.MAX_PENDING:
+                self.pending.popleft()
+            self.movement = movement
+
+    def set_speed(self, speed):
+        """Use a new server player speed (changed while connected)."""
+        with self.lock:
+            self.speed = speed
+
+    def advance(self, now):
+        """
+        Run the local ticks due by `now` with the current movement.
+
+        Args:
+            now: time.perf_counter() timestamp
+        """
+        with self.lock:
+            if self.position is None:
+                return
+            if self.next_tick is None:
+                self.next_tick = now + self.tick_interval
+                self.last_advance = now
+            ticks = 0
+            while self.next_tick <= now and ticks < self.MAX_CATCHUP_TICKS:
+                self.position = step(self.position[0], self.position[1], self.movement, self.speed)
+                if self.pending:
+                    self.pending[-1][2] += 1
+                self.next_tick += self.tick_interval
+                ticks += 1
+            if self.next_tick <= now:
+                self.next_tick = now + self.tick_interval
+            decay = math.exp(-self.SMOOTHING * (now - self.last_advance))
+            self.offset = (self.offset[0] * decay, self.offset[1] * decay)
+            self.last_advance = now
+
+    def reconcile(self, x, y, input_seq, input_ticks):
+        """
+        Rebuild the prediction from an authoritative position.
+
+        Args:
+            x, y: Local player's position in the snapshot
+            input_seq: Last input seq the server had applied
+            input_ticks: Ticks the server simulated with that input
+        """
+        with self.lock:
+            while self.pending and self.pending[0][0] < input_seq:
+                self.pending.popleft()
+            px, py = x, y
+            for seq, movement, ticks in self.pending:
+                if seq == input_seq:
+                    ticks -= input_ticks  # May be negative if the server ran it longer
+                if ticks and movement != MOVE_NONE:
+                    px, py = step(px, py, movement, self.speed * ticks, PLAYER_SPEED_DIAGONAL * ticks)
+            if self.position is not None:
+                error_x = self.position[0] + self.offset[0] - px
+                error_y = self.position[1] + self.offset[1] - py
+                if math.hypot(error_x, error_y) <= self.SNAP_DISTANCE:
+                    self.offset = (error_x, error_y)
+                else:
+                    self.offset = (0.0, 0.0)
+            self.position = (px, py)
+
+    def get_position(self):
+        """
+        Returns:
+            tuple or None: Position to draw the local player at
+        """
+        with self.lock:
+            if self.position is None:
+                return None
+            return (self.position[0] + self.offset[0], self.position[1] + self.offset[1])
@@ -0,0 +1,472 @@
+"""
+Wire Protocol
+Length-prefixed frames shared by the game client and server.
+
+Every frame is a 5 byte header (payload length, message type) followed by
+the payload. The handshake and settings changes are always struct-packed;
+inputs and snapshots use the codec negotiated during the handshake
+(compact binary, or JSON as a fallback for debugging and older tools).
+
+When UDP is negotiated, inputs, acks and snapshots may also travel as
+datagrams: a 5 byte header (message type, UDP token) followed by the same
+payload a frame would carry.
+"""
+
+import json
+import struct
+
+PROTOCOL_VERSION = 6
+
+# Frame header: payload length, message type
+HEADER = struct.Struct("!IB")
+MAX_PAYLOAD_SIZE = 1 << 20
+
+# Message types
+MSG_HELLO = 1     # client -> server: version, codecs, flags, name, client_id, room
+MSG_WELCOME = 2   # server -> client: player_id, chosen codec, UDP port/token, tick rate, speed
+MSG_ERROR = 3     # server -> client: error code
+MSG_INPUT = 4     # client -> server: one or more (input seq, movement bitmask)
+MSG_SNAPSHOT = 5  # server -> client: player states (delta or keyframe)
+MSG_ACK = 6       # client -> server: last applied snapshot seq
+MSG_UDP_BIND = 7  # both ways over UDP: announce / confirm the client's UDP address
+MSG_SETTINGS = 8  # server -> client: player speed changed while connected
+
+# Hello flags
+HELLO_UDP = 1     # Client wants inputs and snapshots over UDP
+
+# Payload codecs (bit flags so a client can offer several)
+CODEC_BINARY = 1
+CODEC_JSON = 2
+CODEC_NAMES = {CODEC_BINARY: "binary", CODEC_JSON: "json"}
+
+# Error codes
+ERROR_CLIENT_ALREADY_CONNECTED = "CLIENT_ALREADY_CONNECTED"
+ERROR_PROTOCOL_MISMATCH = "PROTOCOL_MISMATCH"
+
+_HELLO = struct.Struct("!HBB")       # version, offered codecs, HELLO_* flags
+_WELCOME = struct.Struct("!IBHIHf")  # player_id, codec, UDP port (0 = none), UDP token, tick rate, player speed
+_INPUT = struct.Struct("!IB")        # input seq, movement (repeated in a batch)
+_DATAGRAM = struct.Struct("!BI")     # message type, UDP token
+_ACK = struct.Struct("!I")           # snapshot seq
+_SETTINGS = struct.Struct("!f")      # player speed
+_SNAPSHOT = struct.Struct("!IIHHIHI")  # seq, base seq, changed count, removed count, input seq, input ticks, server tick
+_ENTRY = struct.Struct("!IB")        # player_id, FIELD_* flags
+_POSITION = struct.Struct("!ff")     # x, y
+_PLAYER_ID = struct.Struct("!I")     # removed player_id
+_STR = struct.Struct("!B")           # string length
+
+# Fields present in a snapshot entry
+FIELD_POSITION = 1
+FIELD_NAME = 2
+
+# Snapshot base seq meaning "not a delta"
+KEYFRAME = 0
+
+# Most inputs sent in one MSG_INPUT batch
+MAX_INPUT_BATCH = 32
+
+# Movement bits an input may set (MOVE_* flags)
+MOVEMENT_MASK = 0xF
+
+# Largest input seq (binary inputs carry it as an unsigned 32 bit int)
+MAX_INPUT_SEQ = 0xFFFFFFFF
+
+# Largest input_ticks value a snapshot can carry
+MAX_INPUT_TICKS = 0xFFFF
+
+# Largest datagram sent; bigger snapshots go over TCP to avoid fragmentation
+MAX_DATAGRAM_SIZE = 1200
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed frame or message."""
+
+
+def encode_frame(msg_type, payload=b""):
+    """Prefix a payload with the frame header."""
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+class FrameDecoder:
+    """
+    Incremental frame parser over a reusable receive buffer.
+
+    Sockets read straight into a preallocated buffer (recv_into) and frames
+    are parsed in place: payloads are memoryview slices of the buffer, so
+    nothing is copied until a decoder turns them into values. A payload is
+    only valid until the next read; decode it before reading again.
+
+    TCP may split a frame across several reads or deliver several frames in
+    one, so an incomplete frame stays buffered until the rest arrives.
+    """
+
+    MIN_READ = 2048  # Free space wanted before each read (compacts the buffer if less)
+
+    def __init__(self, size=65536):
+        """
+        Args:
+            size: Initial buffer size; grows if a single frame needs more
+        """
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # First byte not yet parsed
+        self.end = 0    # End of received bytes
+
+    def recv_from(self, sock):
+        """
+        Read whatever the socket has (up to the free space) into the buffer.
+
+        Returns:
+            int: Bytes read; 0 if the peer closed the connection
+
+        Raises:
+            OSError: As socket.recv_into (BlockingIOError if non-blocking
+                and nothing is waiting)
+        """
+        self._make_room(self.MIN_READ)
+        count = sock.recv_into(self.view[self.end:])
+        self.end += count
+        return count
+
+    def feed(self, data):
+        """Add bytes received some other way (parse them with frames())."""
+        self._make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def frames(self):
+        """
+        Yield every complete frame in the buffer.
+
+        Yields:
+            tuple: (msg_type, payload memoryview)
+        """
+        while self.end - self.start >= HEADER.size:
+            length, msg_type = HEADER.unpack_from(self.buffer, self.start)
+            if length > MAX_PAYLOAD_SIZE:
+                raise ProtocolError(f"Frame too large ({length} bytes)")
+            end = self.start + HEADER.size + length
+            if end > self.end:
+                # Make sure the rest of this frame will fit
+                self._make_room(end - self.end)
+                return
+            payload = self.view[self.start + HEADER.size:end]
+            self.start = end
+            yield msg_type, payload
+
+    def _make_room(self, needed):
+        """Ensure `needed` free bytes after the buffered data."""
+        if self.start == self.end:
+            self.start = self.end = 0
+        if len(self.buffer) - self.end >= needed:
+            return
+        pending = self.end - self.start
+        if pending + needed > len(self.buffer):
+            # Replace rather than resize: payload views may still point at the old one
+            size = len(self.buffer)
+            while size < pending + needed:
+                size *= 2
+            buffer = bytearray(size)
+            buffer[:pending] = self.view[self.start:self.end]
+            self.buffer = buffer
+            self.view = memoryview(buffer)
+        else:
+            # Copy out first: the ranges may overlap
+            self.buffer[:pending] = bytes(self.view[self.start:self.end])
+        self.start, self.end = 0, pending
+
+
+def encode_datagram(frame, token):
+    """Turn an encoded frame into a UDP datagram carrying `token`."""
+    msg_type = frame[HEADER.size - 1]
+    return _DATAGRAM.pack(msg_type, token) + frame[HEADER.size:]
+
+
+def decode_datagram(data):
+    """
+    Returns:
+        tuple: (msg_type, token, payload) with the payload a slice of
+            `data` (a memoryview for a receive buffer)
+    """
+    if len(data) < _DATAGRAM.size:
+        raise ProtocolError("Datagram too short")
+    msg_type, token = _DATAGRAM.unpack_from(data, 0)
+    return msg_type, token, data[_DATAGRAM.size:]
+
+
+def _pack_str(text):
+    data = text.encode("utf-8")[:255]
+    return _STR.pack(len(data)) + data
+
+
+def _unpack_str(payload, offset):
+    (length,) = _STR.unpack_from(payload, offset)
+    offset += _STR.size
+    if offset + length > len(payload):
+        raise ProtocolError("Truncated string")
+    return str(payload[offset:offset + length], "utf-8", "replace"), offset + length
+
+
+def choose_codec(offered):
+    """Pick the preferred codec from a client's offered bitmask (or None)."""
+    for codec in (CODEC_BINARY, CODEC_JSON):
+        if offered & codec:
+            return codec
+    return None
+
+
+# ----------------------------------------------------------------------
+# Handshake (always binary)
+# ----------------------------------------------------------------------
+
+def encode_hello(name, client_id, codecs=CODEC_BINARY | CODEC_JSON, flags=0, room=""):
+    payload = _HELLO.pack(PROTOCOL_VERSION, codecs, flags) + _pack_str(name) + _pack_str(client_id or "") + _pack_str(room or "")
+    return encode_frame(MSG_HELLO, payload)
+
+
+def decode_hello(payload):
+    try:
+        version, codecs, flags = _HELLO.unpack_from(payload, 0)
+        name, offset = _unpack_str(payload, _HELLO.size)
+        client_id, offset = _unpack_str(payload, offset)
+        # Room was added later; older clients omit it and join the default room
+        room = _unpack_str(payload, offset)[0] if offset < len(payload) else ""
+    except struct.error as e:
+        raise ProtocolError(f"Bad hello: {e}")
+    return {"version": version, "codecs": codecs, "flags": flags, "name": name, "client_id": client_id or None, "room": room}
+
+
+def encode_welcome(player_id, codec, udp_port=0, udp_token=0, tick_rate=0, speed=0.0):
+    payload = _WELCOME.pack(player_id, codec, udp_port, udp_token, tick_rate, speed)
+    return encode_frame(MSG_WELCOME, payload)
+
+
+def decode_welcome(payload):
+    try:
+        player_id, codec, udp_port, udp_token, tick_rate, speed = _WELCOME.unpack_from(payload, 0)
+    except struct.error as e:
+        raise ProtocolError(f"Bad welcome: {e}")
+    return {"player_id": player_id, "codec": codec, "udp_port": udp_port, "udp_token": udp_token,
+            "tick_rate": tick_rate, "speed": speed}
+
+
+def encode_settings(speed):
+    return encode_frame(MSG_SETTINGS, _SETTINGS.pack(speed))
+
+
+def decode_settings(payload):
+    try:
+        (speed,) = _SETTINGS.unpack_from(payload, 0)
+    except struct.error as e:
+        raise ProtocolError(f"Bad settings: {e}")
+    return {"speed": speed}
+
+
+def encode_error(code):
+    return encode_frame(MSG_ERROR, _pack_str(code))
+
+
+def decode_error(payload):
+    try:
+        return _unpack_str(payload, 0)[0]
+    except struct.error as e:
+        raise ProtocolError(f"Bad error message: {e}")
+
+
+# ----------------------------------------------------------------------
+# Inputs and snapshots (negotiated codec)
+# ----------------------------------------------------------------------
+
+def encode_input(seq, movement, codec):
+    return encode_inputs([(seq, movement)], codec)
+
+
+def encode_inputs(inputs, codec):
+    """
+    Encode a batch of inputs, oldest first.
+
+    Args:
+        inputs: [(seq, movement), ...], at most MAX_INPUT_BATCH
+        codec: CODEC_BINARY or CODEC_JSON
+    """
+    if codec == CODEC_JSON:
+        message = {"inputs": [{"seq": seq, "movement": movement} for seq, movement in inputs]}
+        return encode_frame(MSG_INPUT, json.dumps(message).encode())
+    return encode_frame(MSG_INPUT, b"".join(_INPUT.pack(seq, movement) for seq, movement in inputs))
+
+
+def _is_int(value, maximum):
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= maximum
+
+
+def _check_input(input_state):
+    """Reject an input the simulation cannot use, before it reaches a tick."""
+    if not _is_int(input_state.get("seq"), MAX_INPUT_SEQ):
+        raise ProtocolError(f"Bad input seq: {input_state.get('seq')!r}")
+    if not _is_int(input_state.get("movement"), MOVEMENT_MASK):
+        raise ProtocolError(f"Bad movement: {input_state.get('movement')!r}")
+    if "name" in input_state and not isinstance(input_state["name"], str):
+        raise ProtocolError(f"Bad name: {input_state['name']!r}")
+
+
+def decode_inputs(payload, codec):
+    """
+    Returns:
+        list: Dicts with "seq" and "movement" (and any extra JSON fields), oldest first
+
+    Raises:
+        ProtocolError: If the payload is malformed, or any input lacks an
+            integer seq or has a movement outside MOVEMENT_MASK
+    """
+    try:
+        if codec == CODEC_JSON:
+            message = json.loads(bytes(payload))
+            if not isinstance(message, dict):
+                raise ProtocolError("Input must be an object")
+            inputs = message.get("inputs", [message])  # A bare object is a single input
+            if not isinstance(inputs, list) or not all(isinstance(i, dict) for i in inputs):
+                raise ProtocolError("Inputs must be objects")
+        else:
+            if not payload or len(payload) % _INPUT.size:
+                raise ProtocolError(f"Bad input batch size ({len(payload)} bytes)")
+            inputs = [
+                {"seq": seq, "movement": movement}
+                for seq, movement in _INPUT.iter_unpack(payload)
+            ]
+    except (struct.error, ValueError) as e:
+        raise ProtocolError(f"Bad input: {e}")
+    if len(inputs) > MAX_INPUT_BATCH:
+        raise ProtocolError(f"Too many inputs in one batch ({len(inputs)})")
+    for input_state in inputs:
+        _check_input(input_state)
+    return inputs
+
+
+def encode_ack(seq, codec):
+    if codec == CODEC_JSON:
+        return encode_frame(MSG_ACK, json.dumps({"ack": seq}).encode())
+    return encode_frame(MSG_ACK, _ACK.pack(seq))
+
+
+def decode_ack(payload, codec):
+    """Returns: int snapshot seq"""
+    try:
+        if codec == CODEC_JSON:
+            return int(json.loads(bytes(payload))["ack"])
+        return _ACK.unpack_from(payload, 0)[0]
+    except (struct.error, ValueError, KeyError, TypeError) as e:
+        raise ProtocolError(f"Bad ack: {e}")
+
+
+def encode_entry(player_id, fields, codec):
+    """
+    Encode one player's snapshot entry.
+
+    Entries are self-contained fragments, so the server can cache them per
+    player and assemble snapshots with encode_snapshot_entries().
+
+    Args:
+        player_id: Player the entry describes
+        fields: "x"/"y" and/or "name"
+        codec: CODEC_BINARY or CODEC_JSON
+    """
+    if codec == CODEC_JSON:
+        return json.dumps({str(player_id): fields})[1:-1].encode()
+    flags = 0
+    if "x" in fields:
+        flags |= FIELD_POSITION
+    if "name" in fields:
+        flags |= FIELD_NAME
+    parts = [_ENTRY.pack(player_id, flags)]
+    if flags & FIELD_POSITION:
+        parts.append(_POSITION.pack(fields["x"], fields["y"]))
+    if flags & FIELD_NAME:
+        parts.append(_pack_str(fields["name"]))
+    return b"".join(parts)
+
+
+def encode_snapshot_entries(seq, base, entries, removed, codec, input_seq=0, input_ticks=0, tick=0):
+    """
+    Encode a snapshot from entries already produced by encode_entry().
+
+    Args:
+        seq: Snapshot sequence number (per client, starting at 1)
+        base: Seq the delta applies to, or KEYFRAME for a full state
+        entries: [encoded entry, ...] for the changed players
+        removed: [player_id, ...] present in the base but gone now
+        codec: CODEC_BINARY or CODEC_JSON
+        input_seq: Last input seq of the receiving client the state includes
+        input_ticks: Ticks simulated with that input so far
+        tick: Server tick the state belongs to (a timestamp for interpolation)
+    """
+    input_ticks = min(input_ticks, MAX_INPUT_TICKS)
+    if codec == CODEC_JSON:
+        payload = b"".join((
+            b'{"seq": %d, "base": %d, "input_seq": %d, "input_ticks": %d, "tick": %d, "players": {'
+            % (seq, base, input_seq, input_ticks, tick),
+            b", ".join(entries),
+            b'}, "removed": ',
+            json.dumps(list(removed)).encode(),
+            b"}",
+        ))
+        return encode_frame(MSG_SNAPSHOT, payload)
+    parts = [_SNAPSHOT.pack(seq, base, len(entries), len(removed), input_seq, input_ticks, tick)]
+    parts.extend(entries)
+    for pid in removed:
+        parts.append(_PLAYER_ID.pack(pid))
+    return encode_frame(MSG_SNAPSHOT, b"".join(parts))
+
+
+def encode_snapshot(seq, base, players, removed, codec, input_seq=0, input_ticks=0, tick=0):
+    """
+    Encode a snapshot.
+
+    Args:
+        seq: Snapshot sequence number (per client, starting at 1)
+        base: Seq the delta applies to, or KEYFRAME for a full state
+        players: {player_id: fields}, fields being "x"/"y" and/or "name"
+        removed: [player_id, ...] present in the base but gone now
+        codec: CODEC_BINARY or CODEC_JSON
+        input_seq: Last input seq of the receiving client the state includes
+        input_ticks: Ticks simulated with that input so far
+        tick: Server tick the state belongs to (a timestamp for interpolation)
+    """
+    entries = [encode_entry(pid, fields, codec) for pid, fields in players.items()]
+    return encode_snapshot_entries(seq, base, entries, removed, codec, input_seq, input_ticks, tick)
+
+
+def decode_snapshot(payload, codec):
+    """
+    Returns:
+        dict: {"seq": int, "base": int, "input_seq": int, "input_ticks": int, "tick": int,
+               "players": {player_id (int): fields}, "removed": [player_id, ...]}
+    """
+    try:
+        if codec == CODEC_JSON:
+            message = json.loads(bytes(payload))
+            message["players"] = {int(pid): fields for pid, fields in message["players"].items()}
+            message.setdefault("input_seq", 0)
+            message.setdefault("input_ticks", 0)
+            message.setdefault("tick", 0)
+            return message
+        seq, base, changed, removed_count, input_seq, input_ticks, tick = _SNAPSHOT.unpack_from(payload, 0)
+        offset = _SNAPSHOT.size
+        players = {}
+        for _ in range(changed):
+            pid, flags = _ENTRY.unpack_from(payload, offset)
+            offset += _ENTRY.size
+            fields = {}
+            if flags & FIELD_POSITION:
+                fields["x"], fields["y"] = _POSITION.unpack_from(payload, offset)
+                offset += _POSITION.size
+            if flags & FIELD_NAME:
+                fields["name"], offset = _unpack_str(payload, offset)
+            players[pid] = fields
+        removed = []
+        for _ in range(removed_count):
+            removed.append(_PLAYER_ID.unpack_from(payload, offset)[0])
+            offset += _PLAYER_ID.size
+    except (struct.error, ValueError, KeyError, AttributeError) as e:
+        raise ProtocolError(f"Bad snapshot: {e}")
+    return {"seq": seq, "base": base, "input_seq": input_seq, "input_ticks": input_ticks, "tick": tick,
+            "players": players, "removed": removed}
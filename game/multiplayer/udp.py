@@ -0,0 +1,77 @@
+"""
+UDP Helpers
+Artificial packet loss for exercising the UDP channel on loopback.
+"""
+
+import random
+
+
+class LossySocket:
+    """
+    Wraps a UDP socket and silently drops a fraction of datagrams.
+
+    Sends and receives are both affected, so loss can be simulated from
+    either end. Everything else is forwarded to the wrapped socket.
+    """
+
+    def __init__(self, sock, loss, seed=None):
+        """
+        Args:
+            sock: UDP socket to wrap
+            loss: Probability (0.0-1.0) that a datagram is dropped
+            seed: Optional random seed for reproducible runs
+        """
+        self.sock = sock
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.dropped = 0
+
+    def _drop(self):
+        if self.loss > 0 and self.random.random() < self.loss:
+            self.dropped += 1
+            return True
+        return False
+
+    def send(self, data):
+        if self._drop():
+            return len(data)
+        return self.sock.send(data)
+
+    def sendto(self, data, addr):
+        if self._drop():
+            return len(data)
+        return self.sock.sendto(data, addr)
+
+    def recv(self, size):
+        while True:
+            data = self.sock.recv(size)
+            if not self._drop():
+                return data
+
+    def recvfrom(self, size):
+        while True:
+            data, addr = self.sock.recvfrom(size)
+            if not self._drop():
+                return data, addr
+
+    def recv_into(self, buffer):
+        while True:
+            count = self.sock.recv_into(buffer)
+            if not self._drop():
+                return count
+
+    def recvfrom_into(self, buffer):
+        while True:
+            count, addr = self.sock.recvfrom_into(buffer)
+            if not self._drop():
+                return count, addr
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+def wrap_udp_socket(sock, loss=0.0, seed=None):
+    """Return `sock` itself, or a LossySocket if `loss` is non-zero."""
+    if loss and loss > 0:
+        return LossySocket(sock, loss, seed)
+    return sock
@@ -0,0 +1,66 @@
+"""
+Dirty Rectangle Tracking
+Pushes only the parts of the screen that changed to the display.
+"""
+
+import pygame
+
+
+class DirtyRects:
+    """
+    Collects the screen areas redrawn this frame and updates just those.
+
+    Updating a few small rects is much cheaper than flipping the whole
+    screen, especially on software-rendered displays. Once the dirty area
+    grows past `full_ratio` of the screen (or there are too many rects)
+    the frame is marked full, and the screen should redraw everything and
+    flip instead.
+    """
+
+    MAX_RECTS = 64
+
+    def __init__(self, surface, full_ratio=0.4):
+        """
+        Args:
+            surface: Display surface the rects refer to
+            full_ratio: Dirty share of the screen above which a full redraw is cheaper
+        """
+        self.bounds = surface.get_rect()
+        self.full_ratio = full_ratio
+        self.rects = []
+        self.area = 0
+        self.full = True  # Nothing has been drawn yet
+        self.flips = 0
+        self.updates = 0
+
+    def invalidate(self):
+        """Redraw and flip the whole screen next frame."""
+        self.full = True
+
+    def add(self, rect):
+        """
+        Mark an area as changed.
+
+        Returns:
+            pygame.Rect: The area clipped to the screen (may be empty)
+        """
+        rect = self.bounds.clip(rect)
+        if rect.width and rect.height and not self.full:
+            self.rects.append(rect)
+            self.area += rect.width * rect.height
+            if (len(self.rects) > self.MAX_RECTS
+                    or self.area > self.full_ratio * self.bounds.width * self.bounds.height):
+                self.full = True
+        return rect
+
+    def present(self):
+        """Update the display with this frame's changes and start a new frame."""
+        if self.full:
+            pygame.display.flip()
+            self.flips += 1
+        elif self.rects:
+            pygame.display.update(self.rects)
+            self.updates += 1
+        self.rects = []
+        self.area = 0
+        self.full = False
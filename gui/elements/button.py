@@ -1,6 +1,8 @@
 """Button UI Element."""
 
 import pygame
+from gui.text_cache import render_text
+from gui.fonts import get_font
 
 
 class Button:
@@ -8,7 +10,7 @@ class Button:
         self.text = text
         self.rect = pygame.Rect(rect)
         self.action = action
-        self.font = pygame.font.SysFont(None, font_size)
+        self.font = get_font(None, font_size)
         self.hover = False
         self.enabled = enabled
         # self.enabled = False
@@ -21,9 +23,13 @@ class Button:
         else:
             color = theme.get('button_color', (0, 150, 200))
         pygame.draw.rect(surface, color, self.rect, border_radius=5)
-        text_surf = self.font.render(self.text, True, theme.get('text_color', (255, 255, 255)))
+        text_surf = render_text(self.font, self.text, theme.get('text_color', (255, 255, 255)))
         surface.blit(text_surf, text_surf.get_rect(center=self.rect.center))
     
+    def render_key(self):
+        """Everything that changes how the button looks."""
+        return (self.text, self.hover, self.enabled, tuple(self.rect))
+    
     def handle_event(self, event):
         if not self.enabled:
             return
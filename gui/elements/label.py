@@ -1,6 +1,8 @@
 """Label UI Element."""
 
 import pygame
+from gui.text_cache import render_text
+from gui.fonts import get_font
 
 
 class Label:
@@ -9,7 +11,7 @@ class Label:
     def __init__(self, text, rect, font_size=24):
         self.text = text
         self.rect = pygame.Rect(rect)
-        self.font = pygame.font.SysFont(None, font_size)
+        self.font = get_font(None, font_size)
     
     def draw(self, surface, theme):
         """Draw the label."""
@@ -18,9 +20,13 @@ class Label:
         pygame.draw.rect(surface, color, self.rect, border_radius=5)
         
         # Draw text
-        text_surf = self.font.render(self.text, True, theme.get('text_color', (255, 255, 255)))
+        text_surf = render_text(self.font, self.text, theme.get('text_color', (255, 255, 255)))
         surface.blit(text_surf, text_surf.get_rect(center=self.rect.center))
     
+    def render_key(self):
+        """Everything that changes how the label looks."""
+        return (self.text, tuple(self.rect))
+    
     def handle_event(self, event):
         """Labels don't handle events."""
         pass
@@ -32,7 +38,7 @@ class Label2:
     def __init__(self, text, rect):
         self.text = text
         self.rect = pygame.Rect(rect)
-        self.font = pygame.font.SysFont(None, 18)
+        self.font = get_font(None, 18)
     
     def draw(self, surface, theme):
         """Draw the label."""
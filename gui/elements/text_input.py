@@ -1,6 +1,8 @@
 """Text Input UI Element."""
 
 import pygame
+from gui.text_cache import render_text
+from gui.fonts import get_font
 
 class TextInput:
     def __init__(self, rect, default_text="", max_length=32, placeholder=""):
@@ -11,7 +13,7 @@ class TextInput:
         self.active = False
         self.cursor_visible = True
         self.cursor_timer = 0
-        self.font = pygame.font.SysFont(None, 22)
+        self.font = get_font(None, 22)
     
     def draw(self, surface, theme):
         border_color = theme.get('input_active' if self.active else 'input_border', (100, 100, 100))
@@ -25,7 +27,7 @@ class TextInput:
             display, color = "", theme.get('text_color', (255, 255, 255))
         
         if display:
-            text_surf = self.font.render(display, True, color)
+            text_surf = render_text(self.font, display, color)
             clip_rect = self.rect.inflate(-16, -4)
             surface.set_clip(clip_rect)
             surface.blit(text_surf, text_surf.get_rect(midleft=(self.rect.x + 8, self.rect.centery)))
@@ -35,6 +37,10 @@ class TextInput:
             x = min(self.rect.x + 8 + self.font.size(self.text)[0], self.rect.right - 8)
             pygame.draw.line(surface, color, (x, self.rect.y + 6), (x, self.rect.bottom - 6), 2)
     
+    def render_key(self):
+        """Everything that changes how the input looks."""
+        return (self.text, self.active, self.cursor_visible, tuple(self.rect))
+    
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             self.active = self.rect.collidepoint(event.pos)
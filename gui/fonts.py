@@ -0,0 +1,65 @@
+"""
+Font Registry
+Fonts shared by every screen and UI element.
+"""
+
+import pygame
+
+# Fonts used by the menus, elements and game screen as (name, size, bold)
+PRELOAD_FONTS = (
+    (None, 18, False),
+    (None, 20, False),
+    (None, 22, False),
+    (None, 24, False),
+    (None, 28, False),
+    (None, 28, True),
+    (None, 36, True),
+    (None, 72, True),
+)
+
+
+class FontRegistry:
+    """
+    Resolves each font once and hands out the same object afterwards.
+
+    pygame.font.SysFont() looks the font up among the system fonts on every
+    call. Sharing one Font per (name, size, bold) also lets the text cache
+    hit across screens, since it is keyed by the font object.
+    """
+
+    def __init__(self):
+        self.fonts = {}  # {(name, size, bold): pygame.font.Font}
+
+    def get(self, name, size, bold=False):
+        """
+        Args:
+            name: System font name, None for pygame's default font
+            size: Point size
+            bold: Bold variant
+
+        Returns:
+            pygame.font.Font: The shared font
+        """
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def preload(self, specs=PRELOAD_FONTS):
+        """Resolve fonts ahead of time, e.g. while the window first opens."""
+        for name, size, bold in specs:
+            self.get(name, size, bold)
+
+    def clear(self):
+        self.fonts.clear()
+
+
+# Shared by all screens and elements
+fonts = FontRegistry()
+
+
+def get_font(name, size, bold=False):
+    """Shared replacement for pygame.font.SysFont (see FontRegistry.get)."""
+    return fonts.get(name, size, bold)
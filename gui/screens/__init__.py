@@ -3,10 +3,25 @@
 # ==========================================
 """GUI Screens module."""
 
+import importlib
+
 from .base_screen import BaseScreen
-from .main_menu import MainMenu
-from .settings_menu import SettingsMenu
-from .multiplayer_menu import MultiplayerMenu
-from .game_screen import GameScreen
+
+# Screens are imported on first use: the multiplayer and game screens pull
+# in the networking code, which the main menu does not need
+_SCREEN_MODULES = {
+    'MainMenu': '.main_menu',
+    'SettingsMenu': '.settings_menu',
+    'MultiplayerMenu': '.multiplayer_menu',
+    'GameScreen': '.game_screen',
+}
+
+
+def __getattr__(name):
+    if name in _SCREEN_MODULES:
+        module = importlib.import_module(_SCREEN_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ['BaseScreen', 'MainMenu', 'SettingsMenu', 'MultiplayerMenu', 'GameScreen']
@@ -1,6 +1,7 @@
 """Base Screen Class."""
 
 import pygame
+from gui.dirty_rects import DirtyRects
 
 
 class BaseScreen:
@@ -12,6 +13,11 @@ class BaseScreen:
         self.buttons = []
         self.inputs = []
         self.labels = []
+        self.renderer = DirtyRects(screen)
+        self.config_snapshot = None  # Settings the theme was built from
+        self.theme = None
+        self.background = None  # Screen contents under the widgets
+        self.widget_keys = {}   # {widget: render key when last drawn}
     
     def add_button(self, button):
         """Add a button to this screen."""
@@ -27,6 +33,8 @@ class BaseScreen:
     
     def handle_event(self, event):
         """Handle input events."""
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.renderer.invalidate()
         for button in self.buttons:
             button.handle_event(event)
         for input_field in self.inputs:
@@ -39,28 +47,69 @@ class BaseScreen:
         for input_field in self.inputs:
             input_field.update(dt)
     
-    def draw(self):
-        """Draw the screen."""
+    def get_theme(self):
+        """Colors passed to the UI elements."""
+        theme = self.config.snapshot.theme
+        return {
+            'bg_color': theme.bg_color,
+            'button_color': theme.button_color,
+            'button_hover': theme.button_hover,
+            'text_color': theme.text_color,
+            'input_border': theme.input_border,
+            'input_active': theme.input_active,
+            'label_color': theme.label_color,
+            'button_disabled': theme.button_disabled
+        }
+    
+    def get_widgets(self):
+        """UI elements to draw, in drawing order."""
+        return self.labels + self.buttons + self.inputs
+    
+    def draw_background(self, theme):
+        """Draw everything except the widgets (titles, panels, ...)."""
         self.screen.fill(self.config.bg_color)
+    
+    def draw(self):
+        """
+        Draw the screen and update the display.
         
-        theme = {
-            'button_color': self.config.button_color,
-            'button_hover': self.config.button_hover,
-            'text_color': self.config.text_color,
-            'input_border': self.config.input_border,
-            'input_active': self.config.input_active,
-            'label_color': self.config.label_color,
-            'button_disabled': self.config.button_disabled
-        }
+        The background and every widget are only drawn on a full redraw
+        (first frame, theme change, invalidate()). The theme is rebuilt
+        only when the config snapshot changes. Otherwise only widgets
+        whose render key changed are redrawn over a copy of the background,
+        and only their rects are pushed to the display.
+        """
+        snapshot = self.config.snapshot
+        if snapshot is not self.config_snapshot:
+            # Settings changed (or first frame); the theme may have too
+            self.config_snapshot = snapshot
+            theme = self.get_theme()
+            if theme != self.theme:
+                self.theme = theme
+                self.renderer.invalidate()
+        theme = self.theme
         
-        for label in self.labels:
-            label.draw(self.screen, theme)
-        for button in self.buttons:
-            button.draw(self.screen, theme)
-        for input_field in self.inputs:
-            input_field.draw(self.screen, theme)
+        widget_keys = {widget: widget.render_key() for widget in self.get_widgets()}
+        changed = [widget for widget, key in widget_keys.items() if self.widget_keys.get(widget) != key]
+        self.widget_keys = widget_keys
+        for widget in changed:
+            self.renderer.add(widget.rect)
+        
+        if self.renderer.full:
+            self.draw_background(theme)
+            self.background = self.screen.copy()
+            changed = list(widget_keys)
+        else:
+            for widget in changed:
+                self.screen.blit(self.background, widget.rect, widget.rect)
+        for widget in changed:
+            widget.draw(self.screen, theme)
         
-        # pygame.display.flip()
+        self.renderer.present()
+    
+    def invalidate(self):
+        """Redraw the whole screen next frame."""
+        self.renderer.invalidate()
     
     def on_enter(self):
         """Called when entering this screen."""
@@ -3,14 +3,24 @@ Game Screen - Updated with Play Area Border and Fixed Player List
 The actual gameplay screen where players move around.
 """
 
+import logging
 import pygame
+from gui.dirty_rects import DirtyRects
 from gui.screens.base_screen import BaseScreen
+from gui.text_cache import render_text, text_cache
+from gui.fonts import get_font
 from game.constants import *
 
+log = logging.getLogger("gui")
+
 
 class GameScreen(BaseScreen):
     """Main game screen with multiplayer support."""
     
+    # Player list grid in the top UI
+    ROSTER_ROWS = 2
+    ROSTER_COLS = 4
+    
     def __init__(self, screen, config, client, is_host, back_callback):
         """
         Initialize game screen.
@@ -28,18 +38,18 @@ class GameScreen(BaseScreen):
         self.back_callback = back_callback
         
         # Fonts
-        self.font_small = pygame.font.SysFont(None, 20)
-        self.font_medium = pygame.font.SysFont(None, 24)
-        self.font_title = pygame.font.SysFont(None, 36, bold=True)
+        self.font_small = get_font(None, 20)
+        self.font_medium = get_font(None, 24)
+        self.font_title = get_font(None, 36, bold=True)
         
-        # Calculate play area
-        screen_w, screen_h = self.config.resolution
-        self.play_area = pygame.Rect(
-            UI_SIDE_MARGIN,
-            UI_TOP_HEIGHT,
-            screen_w - 2 * UI_SIDE_MARGIN,
-            screen_h - UI_TOP_HEIGHT - UI_BOTTOM_HEIGHT
-        )
+        # Layout and static background, (re)built by _build_background()
+        self.play_area = None
+        self.top_rect = None
+        self.background_key = None
+        
+        # What is on screen, for dirty-rect drawing
+        self.sprites = {}     # {player_id: (bounds, x, y, color, name_surface, name_rect)}
+        self.roster = None    # Player list in the top UI
     
     def handle_event(self, event):
         """Handle input events."""
@@ -56,7 +66,7 @@ class GameScreen(BaseScreen):
         
         # Check if still connected
         if not self.client.is_connected():
-            print("Connection lost during game!")
+            log.warning("Connection lost during game!")
             self._exit_game()
             return
         
@@ -74,150 +84,243 @@ class GameScreen(BaseScreen):
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
             movement |= MOVE_RIGHT
 
-        if movement != MOVE_NONE:
-            self.client.send_input(movement)
+        # The client only sends changes (rate capped); the server keeps
+        # applying the last bitmask every tick
+        self.client.send_input(movement)
     
     def draw(self):
-        """Draw the game."""
-        screen_w, screen_h = self.config.resolution
+        """
+        Draw the game.
         
-        # Fill background
-        self.screen.fill(COLOR_BG)
+        Only what changed since the last frame is redrawn: the old and new
+        bounds of players that moved, and the top bar when the player list
+        changed. The cached background is restored under each of those
+        rects, the players overlapping them are drawn clipped to them, and
+        only those rects are pushed to the display. When too much changed at
+        once the whole screen is drawn and flipped instead.
+        """
+        # Checked every frame (it is cheap): the window can change size
+        # without a settings change
+        background_key = (self.screen.get_size(), self.config.snapshot.display.resolution)
+        if background_key != self.background_key:
+            self.background_key = background_key
+            self._build_background()
         
-        # Draw UI areas
-        self._draw_ui_background()
+        # Latest snapshot from the server (shared, read-only); remote players
+        # are drawn where interpolation puts them and the local player where
+        # prediction does, instead of a round trip behind
+        players = self.client.get_players()
+        positions = self.client.get_render_positions()
+        sprites = self._layout_players(players, positions)
+        roster = self._build_roster(players)
         
-        # Draw play area background and border
-        self._draw_play_area_background()
+        renderer = self.renderer
+        dirty = []
+        for player_id, sprite in sprites.items():
+            old = self.sprites.get(player_id)
+            if old != sprite:
+                dirty.append(sprite[0])
+                if old:
+                    dirty.append(old[0])
+        for player_id, old in self.sprites.items():
+            if player_id not in sprites:
+                dirty.append(old[0])
         
-        # Get all players from server
-        players = self.client.get_players()
+        # The player list is drawn over the players, so any change under it
+        # means redrawing it as well
+        top_dirty = roster != self.roster or self.top_rect.collidelist(dirty) != -1
+        if top_dirty:
+            dirty.append(self.top_rect)
+        dirty = [rect for rect in map(renderer.add, dirty) if rect.width and rect.height]
         
-        # Draw all players (server handles wrapping now)
-        self._draw_players(players)
+        self.sprites = sprites
+        self.roster = roster
         
-        # Draw UI overlay
-        self._draw_top_ui(players)
-        self._draw_bottom_ui()
+        if renderer.full:
+            self.screen.blit(self.background, (0, 0))
+            self._draw_players(sprites.values())
+            self._draw_top_ui(roster)
+        else:
+            bounds = [sprite[0] for sprite in sprites.values()]
+            sprite_list = list(sprites.values())
+            for rect in dirty:
+                self.screen.set_clip(rect)
+                self.screen.blit(self.background, rect, rect)
+                self._draw_players(sprite_list[i] for i in rect.collidelistall(bounds))
+            self.screen.set_clip(None)
+            if top_dirty:
+                self._draw_top_ui(roster)
         
-        pygame.display.flip()
+        renderer.present()
     
-    def _draw_ui_background(self):
+    def _build_background(self):
+        """
+        Lay out the screen and compose everything that does not change for a
+        given resolution (UI bars, play area and its border, controls hint)
+        into one surface in the display's pixel format, so a full redraw
+        starts with a single blit.
+        """
+        screen_w, screen_h = self.config.resolution
+        self.play_area = pygame.Rect(
+            UI_SIDE_MARGIN,
+            UI_TOP_HEIGHT,
+            screen_w - 2 * UI_SIDE_MARGIN,
+            screen_h - UI_TOP_HEIGHT - UI_BOTTOM_HEIGHT
+        )
+        self.top_rect = pygame.Rect(0, 0, screen_w, UI_TOP_HEIGHT)
+        
+        self.background = pygame.Surface(self.screen.get_size()).convert(self.screen)
+        self.background.fill(COLOR_BG)
+        self._draw_ui_background(self.background)
+        self._draw_play_area_background(self.background)
+        self._draw_bottom_ui(self.background)
+        
+        self.renderer = DirtyRects(self.screen)
+        self.sprites = {}
+        self.roster = None
+    
+    def _draw_ui_background(self, surface):
         """Draw background for UI areas."""
         screen_w, screen_h = self.config.resolution
         
         # Top UI area
         top_rect = pygame.Rect(0, 0, screen_w, UI_TOP_HEIGHT)
-        pygame.draw.rect(self.screen, COLOR_UI_BG, top_rect)
+        pygame.draw.rect(surface, COLOR_UI_BG, top_rect)
         
         # Bottom UI area
         bottom_rect = pygame.Rect(0, screen_h - UI_BOTTOM_HEIGHT, screen_w, UI_BOTTOM_HEIGHT)
-        pygame.draw.rect(self.screen, COLOR_UI_BG, bottom_rect)
+        pygame.draw.rect(surface, COLOR_UI_BG, bottom_rect)
     
-    def _draw_play_area_background(self):
+    def _draw_play_area_background(self, surface):
         """Draw play area background with visible border."""
         # Play area background (slightly different color)
-        pygame.draw.rect(self.screen, (40, 40, 40), self.play_area)
+        pygame.draw.rect(surface, (40, 40, 40), self.play_area)
         
         # Draw border around play area
         border_color = (100, 100, 100)
-        pygame.draw.rect(self.screen, border_color, self.play_area, 2)  # 2px border
+        pygame.draw.rect(surface, border_color, self.play_area, 2)  # 2px border
     
-    def _draw_players(self, players):
-        """Draw all players (server handles wrapping)."""
+    def _layout_players(self, players, positions):
+        """
+        Work out where each player is drawn.
+        
+        Returns:
+            dict: {player_id: (bounds, x, y, color, name_surface, name_rect)},
+                name_surface is None when the name is not shown
+        """
+        sprites = {}
         for player_id, player_data in players.items():
-            x = player_data.get("x", 0)
-            y = player_data.get("y", 0)
+            position = positions.get(player_id)
+            if position:
+                x, y = position
+            else:
+                x = player_data.get("x", 0)
+                y = player_data.get("y", 0)
             name = player_data.get("name", f"Player{player_id}")
             
             # Determine color (own player is blue, others are orange)
-            is_self = (name == self.config.username)
+            is_self = (player_id == self.client.player_id)
             color = COLOR_SELF if is_self else COLOR_OTHER
             
-            # Draw player rectangle
+            # Player rectangle
             player_rect = pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
-            pygame.draw.rect(self.screen, color, player_rect)
             
-            # Draw player name above rectangle (only if visible in play area)
+            # Player name above rectangle (only if visible in play area)
             name_y = y - 10
             if name_y > self.play_area.top:
-                name_surface = self.font_medium.render(name, True, COLOR_TEXT)
+                name_surface = render_text(self.font_medium, name, COLOR_TEXT)
                 name_rect = name_surface.get_rect(
                     center=(x + PLAYER_SIZE // 2, name_y)
                 )
+                bounds = player_rect.union(name_rect)
+            else:
+                name_surface = name_rect = None
+                bounds = player_rect
+            sprites[player_id] = (bounds, x, y, color, name_surface, name_rect)
+        return sprites
+    
+    def _draw_players(self, sprites):
+        """Draw players laid out by _layout_players()."""
+        for bounds, x, y, color, name_surface, name_rect in sprites:
+            pygame.draw.rect(self.screen, color, (x, y, PLAYER_SIZE, PLAYER_SIZE))
+            if name_surface:
                 self.screen.blit(name_surface, name_rect)
     
-    def _draw_top_ui(self, players):
+    def _build_roster(self, players):
+        """
+        Returns:
+            tuple: (player count, ((display name, color), ...)) for the top UI
+        """
+        entries = []
+        for player_id, player_data in sorted(players.items())[:self.ROSTER_ROWS * self.ROSTER_COLS]:
+            name = player_data.get("name", f"Player{player_id}")
+            is_self = (player_id == self.client.player_id)
+            display_name = f"• {name}" + (" (You)" if is_self else "")
+            entries.append((display_name, COLOR_SELF if is_self else COLOR_TEXT_DIM))
+        return len(players), tuple(entries)
+    
+    def _draw_top_ui(self, roster):
         """Draw top UI elements (title and player grid)."""
         # Draw title
         role_text = "HOST" if self.is_host else "CLIENT"
-        title = self.font_title.render(f"DASH DASH - {role_text}", True, COLOR_TEXT)
+        title = render_text(self.font_title, f"DASH DASH - {role_text}", COLOR_TEXT)
         self.screen.blit(title, (UI_SIDE_MARGIN, 10))
 
         # Draw player list header
+        count, entries = roster
         y_offset = 50
-        player_list_title = self.font_medium.render(f"Players ({len(players)}):", True, COLOR_TEXT)
+        player_list_title = render_text(self.font_medium, f"Players ({count}):", COLOR_TEXT)
         self.screen.blit(player_list_title, (UI_SIDE_MARGIN, y_offset))
 
-        # Collect player info
-        player_names = []
-        for player_id, player_data in sorted(players.items()):
-            name = player_data.get("name", f"Player{player_id}")
-            is_self = (name == self.config.username)
-            player_names.append({'name': name, 'is_self': is_self})
-
         # Grid layout parameters
-        max_rows = 2
-        max_cols = 4
         row_height = 18
         col_spacing = 120  # horizontal spacing between columns
         x_start = UI_SIDE_MARGIN + 10
         y_start = y_offset + 25
 
-        for i, player_info in enumerate(player_names):
-            row = i % max_rows
-            col = i // max_rows
-            if col >= max_cols:
-                # More players than grid can display
-                if i == max_rows * max_cols:
-                    more_text = self.font_small.render(
-                        f"... and {len(player_names) - max_rows * max_cols} more",
-                        True,
-                        COLOR_TEXT_DIM
-                    )
-                    self.screen.blit(more_text, (x_start, y_start + row * row_height))
-                break
-
+        for i, (display_name, color) in enumerate(entries):
+            row = i % self.ROSTER_ROWS
+            col = i // self.ROSTER_ROWS
             x = x_start + col * col_spacing
             y = y_start + row * row_height
-
-            display_name = f"• {player_info['name']}" + (" (You)" if player_info['is_self'] else "")
-            color = COLOR_SELF if player_info['is_self'] else COLOR_TEXT_DIM
-            name_surface = self.font_small.render(display_name, True, color)
+            name_surface = render_text(self.font_small, display_name, color)
             self.screen.blit(name_surface, (x, y))
+
+        if count > len(entries):
+            # More players than grid can display
+            more_text = render_text(
+                self.font_small,
+                f"... and {count - len(entries)} more",
+                COLOR_TEXT_DIM
+            )
+            self.screen.blit(more_text, (x_start, y_start))
     
-    def _draw_bottom_ui(self):
+    def _draw_bottom_ui(self, surface):
         """Draw bottom UI elements (controls hint)."""
         screen_w, screen_h = self.config.resolution
         
         # Controls hint
-        controls_text = self.font_small.render(
+        controls_text = render_text(
+            self.font_small,
             "Controls: WASD / Arrow Keys to move  |  ESC to exit",
-            True,
             COLOR_TEXT_DIM
         )
         controls_rect = controls_text.get_rect(
             center=(screen_w // 2, screen_h - UI_BOTTOM_HEIGHT // 2)
         )
-        self.screen.blit(controls_text, controls_rect)
+        surface.blit(controls_text, controls_rect)
     
     def _exit_game(self):
         """Exit the game and return to menu."""
-        print("Exiting game...")
+        log.info("Exiting game...")
+        
+        # Stop moving while back in the menus
+        self.client.send_input(MOVE_NONE, flush=True)
         
         if self.back_callback:
             self.back_callback()
     
     def on_exit(self):
         """Called when leaving this screen."""
-        print("Game screen exited")
+        log.info("Game screen exited")
+        log.debug("Text cache: %s", text_cache.stats())
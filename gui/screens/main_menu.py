@@ -3,6 +3,7 @@
 import pygame
 from gui.screens.base_screen import BaseScreen
 from gui.elements.button import Button
+from gui.fonts import get_font
 
 
 class MainMenu(BaseScreen):
@@ -28,13 +29,12 @@ class MainMenu(BaseScreen):
             rect = pygame.Rect(cx - bw // 2, y - bh // 2, bw, bh)
             self.add_button(Button(txt, rect, cb, 28))
     
-    def draw(self):
-        super().draw()
-        font = pygame.font.SysFont(None, 72, bold=True)
+    def draw_background(self, theme):
+        super().draw_background(theme)
+        font = get_font(None, 72, bold=True)
         title = font.render("DASH DASH", True, self.config.text_color)
         self.screen.blit(title, title.get_rect(center=(self.config.resolution[0] // 2, 100)))
         
-        vfont = pygame.font.SysFont(None, 20)
+        vfont = get_font(None, 20)
         ver = vfont.render(f"v{self.config.get('game.version')}", True, (150, 150, 150))
         self.screen.blit(ver, ver.get_rect(bottomright=(self.config.resolution[0] - 10, self.config.resolution[1] - 10)))
-        pygame.display.flip()
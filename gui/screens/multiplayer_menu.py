@@ -3,11 +3,16 @@ Multiplayer Menu Screen
 Connect to server, host or join games.
 """
 
+import logging
 import pygame
 from gui.screens.base_screen import BaseScreen
 from gui.elements.button import Button
 from gui.elements.label import Label
+from gui.fonts import get_font
 from game.multiplayer.client import NetworkClient
+from game.multiplayer.connector import ConnectAttempt
+
+log = logging.getLogger("gui")
 
 
 class MultiplayerMenu(BaseScreen):
@@ -16,7 +21,16 @@ class MultiplayerMenu(BaseScreen):
     def __init__(self, screen, config, callbacks):
         super().__init__(screen, config)
         self.callbacks = callbacks
-        self.client = NetworkClient()
+        self.client = NetworkClient(
+            use_udp=self.config.get('server.udp', False),
+            predict=self.config.get('network.prediction', True),
+            interpolation_delay=self.config.get('network.interpolation_delay', 0.1),
+            max_extrapolation=self.config.get('network.max_extrapolation', 0.1),
+            input_rate=self.config.get('network.input_rate', 30)
+        )
+        self.connect_attempt = None  # ConnectAttempt running in the background
+        self.server_info = None      # Status line at the bottom, redrawn when it changes
+        self.server_info_key = None
         
         # UI elements (will be populated in _build_ui)
         self.status_label = None
@@ -83,57 +97,89 @@ class MultiplayerMenu(BaseScreen):
         self.add_button(self.back_btn)
     
     def _connect_to_server(self):
-        """Attempt to connect to the server or disconnect."""
+        """Start connecting to the server, or cancel / disconnect."""
+        if self.connect_attempt:
+            self._cancel_connect()
+            return
+        
         # Check if already connected
         if self.client.is_connected():
             # Disconnect
             self._disconnect_from_server()
             return
         
-        print("Attempting to connect to server...")
-        
-        # Update UI to show connecting state
-        self.status_label.text = "Connecting..."
-        self.connect_btn.enabled = False
-        
-        # Force a draw update to show "Connecting..."
-        self.draw()
+        log.info("Attempting to connect to server...")
         
         # Get server info from config
         host = self.config.server_ip
         port = self.config.server_port
         username = self.config.username
         client_id = self.config.client_id
+        room = self.config.lobby_name
         
-        print(f"Connecting to {host}:{port} as {username} (ID: {client_id})")
+        log.info("Connecting to %s:%s as %s (ID: %s)", host, port, username, client_id)
         
-        # Try to connect
-        success, error = self.client.connect(host, port, username, client_id)
+        # Connect in the background; update() follows the progress
+        self.connect_attempt = ConnectAttempt(
+            self.client, host, port, username, client_id, room,
+            timeout=self.config.get('server.timeout', 5),
+            retries=self.config.get('server.connect_retries', 3),
+            backoff=self.config.get('server.retry_backoff', 0.5)
+        ).start()
+        self.status_label.text = "Connecting..."
+        self.connect_btn.text = "Cancel"
+        self.join_btn.enabled = False
+        self.host_btn.enabled = False
+    
+    def _cancel_connect(self):
+        """Abort the connection attempt in progress."""
+        log.info("Cancelling connection...")
+        self.connect_attempt.cancel()
+        self.status_label.text = "Cancelling..."
+        self.connect_btn.enabled = False
+    
+    def _poll_connect(self):
+        """Show the progress of the background connection attempt."""
+        attempt = self.connect_attempt
+        if not attempt.done:
+            if attempt.cancelled.is_set():
+                return
+            if attempt.state == ConnectAttempt.WAITING:
+                self.status_label.text = f"Retrying in {attempt.retry_in():.1f}s"
+            elif attempt.attempt > 1:
+                self.status_label.text = f"Connecting ({attempt.attempt}/{attempt.attempts})..."
+            return
         
-        if success:
+        self.connect_attempt = None
+        self.connect_btn.enabled = True
+        if attempt.state == ConnectAttempt.CANCELLED:
+            self.status_label.text = "Disconnected"
+            self.connect_btn.text = "Connect to Server"
+            log.info("Connection cancelled")
+        elif attempt.state == ConnectAttempt.CONNECTED:
             # Connection successful
             self.status_label.text = "Connected"
             self.connect_btn.text = "Disconnect"
-            self.connect_btn.enabled = True
             
             # Enable join/host buttons
             self.join_btn.enabled = True
             self.host_btn.enabled = True
             
-            print("Connected successfully!")
+            log.info("Connected successfully!")
         else:
             # Connection failed
+            error = attempt.error or ""
             if "already connected" in error.lower():
                 self.status_label.text = "Already Connected"
             else:
                 self.status_label.text = "Connection Failed"
-            self.connect_btn.enabled = True
+            self.connect_btn.text = "Connect to Server"
             
-            print(f"Connection failed: {error}")
+            log.warning("Connection failed: %s", error)
     
     def _disconnect_from_server(self):
         """Disconnect from server."""
-        print("Disconnecting...")
+        log.info("Disconnecting...")
         
         self.client.disconnect()
         
@@ -146,11 +192,11 @@ class MultiplayerMenu(BaseScreen):
         self.join_btn.enabled = False
         self.host_btn.enabled = False
         
-        print("Disconnected")
+        log.info("Disconnected")
     
     def _join_game(self):
         """Join an existing game."""
-        print("Joining game...")
+        log.info("Joining game...")
         # TODO: Show lobby browser or join directly
         # For now, just start the game
         if self.callbacks.get('start_game'):
@@ -158,7 +204,7 @@ class MultiplayerMenu(BaseScreen):
     
     def _host_game(self):
         """Host a new game."""
-        print("Hosting game...")
+        log.info("Hosting game...")
         # TODO: Create lobby with settings
         # For now, just start the game as host
         if self.callbacks.get('start_game'):
@@ -166,8 +212,10 @@ class MultiplayerMenu(BaseScreen):
     
     def _go_back(self):
         """Return to main menu."""
-        # Disconnect if connected
-        if self.client.is_connected():
+        # Stop connecting (the attempt cleans up after itself) or disconnect
+        if self.connect_attempt:
+            self.connect_attempt.cancel()
+        elif self.client.is_connected():
             self.client.disconnect()
         
         # Go back to main menu
@@ -178,6 +226,10 @@ class MultiplayerMenu(BaseScreen):
         """Update connection status."""
         super().update(dt)
         
+        if self.connect_attempt:
+            self._poll_connect()
+            return
+        
         # Check connection status and update UI
         if self.client.is_connected():
             # Connected - make sure UI reflects this
@@ -200,32 +252,36 @@ class MultiplayerMenu(BaseScreen):
                 # Check for error message
                 error = self.client.get_error()
                 if error:
-                    print(f"Connection error: {error}")
+                    log.warning("Connection error: %s", error)
     
     def draw(self):
         """Draw the multiplayer menu."""
+        info_key = (self.config.snapshot, self.status_label.text)
+        if info_key != self.server_info_key:
+            self.server_info_key = info_key
+            server = self.config.snapshot.server
+            self.server_info = f"Server: {server.ip}:{server.port} | {self.status_label.text}"
+            self.invalidate()
         super().draw()
+    
+    def draw_background(self, theme):
+        """Draw the title, version and server info."""
+        super().draw_background(theme)
         
         # Draw title
-        font = pygame.font.SysFont(None, 72, bold=True)
+        font = get_font(None, 72, bold=True)
         title = font.render("MULTIPLAYER", True, self.config.text_color)
         self.screen.blit(title, title.get_rect(center=(self.config.resolution[0] // 2, 100)))
         
         # Draw version
-        vfont = pygame.font.SysFont(None, 20)
+        vfont = get_font(None, 20)
         ver = vfont.render(f"v{self.config.get('game.version')}", True, (150, 150, 150))
         self.screen.blit(ver, ver.get_rect(bottomright=(self.config.resolution[0] - 10, self.config.resolution[1] - 10)))
         
         # Draw server info
-        info_font = pygame.font.SysFont(None, 18)
-        server_info = info_font.render(
-            f"Server: {self.config.server_ip}:{self.config.server_port} | {self.status_label.text}",
-            True,
-            (150, 150, 150)
-        )
+        info_font = get_font(None, 18)
+        server_info = info_font.render(self.server_info, True, (150, 150, 150))
         self.screen.blit(server_info, (10, self.config.resolution[1] - 30))
-        
-        pygame.display.flip()
     
     def on_exit(self):
         """Called when leaving this screen."""
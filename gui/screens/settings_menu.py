@@ -1,9 +1,13 @@
 """Settings Menu Screen."""
 
+import logging
 import pygame
 from gui.screens.base_screen import BaseScreen
 from gui.elements.button import Button
 from gui.elements.text_input import TextInput
+from gui.fonts import get_font
+
+log = logging.getLogger("gui")
 
 
 class SettingsMenu(BaseScreen):
@@ -58,33 +62,36 @@ class SettingsMenu(BaseScreen):
             self.config.lobby_name = self.input_map['lobby_name'].get_text()
             self.config.max_players = self.input_map['max_players'].get_text()
             self.config.save()
-            print("Settings saved!")
+            log.info("Settings saved!")
             if self.callback:
                 self.callback()
         except ValueError as e:
-            print(f"Error: {e}")
+            log.error("Invalid settings: %s", e)
         
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 4:
                 self.scroll_y = min(0, self.scroll_y + 30)
+                self.invalidate()
             elif event.button == 5:
                 self.scroll_y -= 30
+                self.invalidate()
         for sec in self.sections:
             for el in sec['elements']:
                 el['input'].rect.y = el['y'] + self.scroll_y
         super().handle_event(event)
     
-    def draw(self):
-        super().draw()
-        self.screen.fill(self.config.bg_color)
-        theme = {'button_color': self.config.button_color, 'button_hover': self.config.button_hover,
-                 'text_color': self.config.text_color, 'input_border': self.config.input_border,
-                 'input_active': self.config.input_active}
-        
-        ft = pygame.font.SysFont(None, 28, bold=True)
-        fl = pygame.font.SysFont(None, 22)
+    def _visible(self, input_field):
+        return not (input_field.rect.bottom < 70 or input_field.rect.top > self.config.resolution[1])
+    
+    def get_widgets(self):
+        return [inp for inp in self.inputs if self._visible(inp)] + self.buttons
+    
+    def draw_background(self, theme):
+        super().draw_background(theme)
+        ft = get_font(None, 28, bold=True)
+        fl = get_font(None, 22)
         
         for sec in self.sections:
             r = sec['rect'].move(0, self.scroll_y)
@@ -94,15 +101,11 @@ class SettingsMenu(BaseScreen):
             t = ft.render(sec['title'], True, self.config.text_color)
             self.screen.blit(t, t.get_rect(centerx=self.config.resolution[0] // 2, top=r.y + 10))
             for el in sec['elements']:
-                if el['input'].rect.bottom < 70 or el['input'].rect.top > self.config.resolution[1]:
+                if not self._visible(el['input']):
                     continue
                 lbl = fl.render(el['label'], True, self.config.text_color)
                 self.screen.blit(lbl, lbl.get_rect(midright=(el['input'].rect.left - 20, el['input'].rect.centery)))
-                el['input'].draw(self.screen, theme)
         
-        for b in self.buttons:
-            b.draw(self.screen, theme)
-        vfont = pygame.font.SysFont(None, 20)
+        vfont = get_font(None, 20)
         ver = vfont.render(f"v{self.config.get('game.version')}", True, (150, 150, 150))
         self.screen.blit(ver, ver.get_rect(bottomright=(self.config.resolution[0] - 10, self.config.resolution[1] - 10)))
-        pygame.display.flip()
@@ -0,0 +1,70 @@
+"""
+Text Surface Cache
+Rendered text shared by every screen and UI element.
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Least-recently-used cache of rendered text surfaces.
+
+    Font.render() costs far more than blitting the result, and names,
+    labels and HUD text rarely change between frames. Surfaces are keyed
+    by (font, text, color, antialias) and shared, so callers must not draw
+    on them.
+    """
+
+    def __init__(self, max_entries=512):
+        """
+        Args:
+            max_entries: Surfaces kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Returns:
+            pygame.Surface: `text` rendered with `font` (cached)
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, entries and hit_rate (0.0-1.0)
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by all screens and elements
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Render `text` through the shared cache (see TextCache.render)."""
+    return text_cache.render(font, text, color, antialias)
@@ -7,15 +7,62 @@ from config.defaults import DEFAULT_CONFIG, CONSTRAINTS
 from library.validators import validate_username, validate_ip, validate_port, universal_validator
 
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return ConfigSnapshot(value)
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ConfigSnapshot:
+    """
+    Read-only view of the settings at one point in time.
+    
+    Sections and keys are plain attributes (snapshot.theme.bg_color) and
+    lists are tuples, so reading a value does no key parsing or copying.
+    Get the current one from ConfigManager.snapshot; it is replaced, never
+    changed, when settings change.
+    """
+    
+    def __init__(self, values, version=None):
+        for key, value in values.items():
+            object.__setattr__(self, key, _freeze(value))
+        if version is not None:
+            object.__setattr__(self, 'version', version)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError("ConfigSnapshot is read-only")
+    
+    def __repr__(self):
+        return f"ConfigSnapshot({vars(self)})"
+
+
 class ConfigManager:
     CONFIG_DIR = Path("config")
     CONFIG_FILE = CONFIG_DIR / "settings.yaml"
     
     def __init__(self):
         self._config = {}
+        self.version = 0       # Bumped on every set() / load()
+        self._snapshot = None  # ConfigSnapshot of the current version
         self.CONFIG_DIR.mkdir(exist_ok=True)
         self.load()
     
+    @property
+    def snapshot(self):
+        """Current settings as a ConfigSnapshot, rebuilt after they change."""
+        if self._snapshot is None:
+            self._snapshot = ConfigSnapshot(self._config, self.version)
+        return self._snapshot
+    
+    def _changed(self):
+        self.version += 1
+        self._snapshot = None
+    
     def load(self):
         if self.CONFIG_FILE.exists():
             try:
@@ -28,6 +75,7 @@ class ConfigManager:
         else:
             self._config = DEFAULT_CONFIG.copy()
             self.save()
+        self._changed()
         if not self.get("user.client_id"):
             self.set("user.client_id", str(uuid.uuid4()))
             self.save()
@@ -70,6 +118,7 @@ class ConfigManager:
                 cfg[k] = {}
             cfg = cfg[k]
         cfg[keys[-1]] = value
+        self._changed()
     
     @property
     def username(self):
@@ -106,7 +155,7 @@ class ConfigManager:
     
     @property
     def resolution(self):
-        return tuple(self.get('display.resolution'))
+        return self.snapshot.display.resolution
     
     @property
     def client_id(self):
@@ -114,35 +163,35 @@ class ConfigManager:
     
     @property
     def bg_color(self):
-        return tuple(self.get('theme.bg_color'))
+        return self.snapshot.theme.bg_color
     
     @property
     def button_color(self):
-        return tuple(self.get('theme.button_color'))
+        return self.snapshot.theme.button_color
     
     @property
     def button_hover(self):
-        return tuple(self.get('theme.button_hover'))
+        return self.snapshot.theme.button_hover
     
     @property
     def button_disabled(self):
-        return tuple(self.get('theme.button_disabled'))
+        return self.snapshot.theme.button_disabled
     
     @property
     def label_color(self):
-        return tuple(self.get('theme.label_color'))
+        return self.snapshot.theme.label_color
     
     @property
     def text_color(self):
-        return tuple(self.get('theme.text_color'))
+        return self.snapshot.theme.text_color
     
     @property
     def input_border(self):
-        return tuple(self.get('theme.input_border'))
+        return self.snapshot.theme.input_border
     
     @property
     def input_active(self):
-        return tuple(self.get('theme.input_active'))
+        return self.snapshot.theme.input_active
     
     @property
     def singleplayer_speed(self):
@@ -0,0 +1,155 @@
+"""
+Logging
+Leveled, rate-limited logging shared by the server and the game client.
+
+Modules log through the standard `logging` module (one named logger per
+area, e.g. "server" or "client"; chatty message types get a child logger
+such as "client.snapshot" so they can be tuned on their own).
+setup_logging() routes every record through a queue to a background
+thread that formats and writes it, so a slow terminal never blocks the
+receive, tick or broadcast loops.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+DEFAULT_RATE = 20.0  # Messages per second per message type
+DEFAULT_BURST = 50   # Messages a type may log at once before the rate applies
+MAX_QUEUED = 10000   # Records waiting for the writer thread before new ones are dropped
+MAX_MESSAGE_TYPES = 1000  # Buckets kept (messages should use %-args, not f-strings)
+
+_listener = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Rate limits (and optionally samples) records per message type.
+
+    A message type is one logging call site: the logger name plus the
+    unformatted message. Each type has a token bucket refilled at `rate`
+    per second; records that find it empty are counted, and the count is
+    appended to the next record of that type that gets through. Sampling
+    keeps only every Nth record of a logger's messages.
+
+    Runs on the calling thread, before anything is queued.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, limits=None, sample=None):
+        """
+        Args:
+            rate: Default messages per second per message type (0 = no limit)
+            burst: Bucket size
+            limits: {logger name: messages per second} overriding `rate` for
+                that logger and its children
+            sample: {logger name: N} to keep one record in N
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})
+        self.sample = dict(sample or {})
+        self.buckets = {}  # {(logger, msg): [tokens, last refill, suppressed, seen]}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        name = record.name
+        key = (name, record.msg)
+        rate = self._lookup(self.limits, name, self.rate)
+        every = self._lookup(self.sample, name, 1)
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                if len(self.buckets) >= MAX_MESSAGE_TYPES:
+                    self.buckets.clear()
+                bucket = self.buckets[key] = [float(self.burst), now, 0, 0]
+            bucket[3] += 1
+            if every > 1 and bucket[3] % every:
+                return False
+            if rate:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    bucket[2] += 1
+                    return False
+                bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar suppressed]"
+        return True
+
+    @staticmethod
+    def _lookup(table, name, default):
+        """Value for the logger or its nearest configured parent."""
+        while name:
+            if name in table:
+                return table[name]
+            name = name.rpartition(".")[0]
+        return default
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the writer thread.
+
+    The stock handler formats every record before queueing it. Records
+    are put as they are instead, so log arguments must not be changed
+    after the call (the game only logs immutable or finished state).
+    """
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Never block the caller; the writer is hopelessly behind
+
+
+def setup_logging(level="INFO", rate=DEFAULT_RATE, limits=None, sample=None, stream=None):
+    """
+    Send all logging through a background writer thread.
+
+    Can be called again to change the settings.
+
+    Args:
+        level: Root level name or number (DEBUG, INFO, WARNING, ERROR)
+        rate, limits, sample: See RateLimitFilter
+        stream: Where to write (default: stdout)
+    """
+    global _listener
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(logging.Formatter(LOG_FORMAT))
+    records = queue.Queue(MAX_QUEUED)
+    handler = _QueueHandler(records)
+    handler.addFilter(RateLimitFilter(rate, limits=limits, sample=sample))
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    shutdown_logging()
+    root.addHandler(handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
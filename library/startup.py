@@ -0,0 +1,59 @@
+"""
+Startup Timing
+Where the time to the first frame goes (see `main.py --startup-timing`).
+"""
+
+import logging
+import sys
+import time
+
+log = logging.getLogger("game")
+
+
+class StartupTimer:
+    """
+    Records how long each startup phase took and what it imported.
+
+    A coarser, always-available take on `python -X importtime`: instead of
+    timing every import it tells which phase was slow and which packages
+    that phase pulled in.
+    """
+
+    def __init__(self, start=None, modules=None):
+        """
+        Args:
+            start: time.perf_counter() value startup began at (default: now)
+            modules: Module names already loaded at that point (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.modules = set(sys.modules if modules is None else modules)
+        self.phases = []  # [(name, seconds, [new module names])]
+
+    def mark(self, name):
+        """End the current phase and start the next one."""
+        now = time.perf_counter()
+        modules = set(sys.modules)
+        self.phases.append((name, now - self.last, sorted(modules - self.modules)))
+        self.last = now
+        self.modules = modules
+
+    @property
+    def total(self):
+        """Seconds from the start to the last mark."""
+        return self.last - self.start
+
+    def report(self, packages=6):
+        """
+        Log each phase's duration and the top-level packages it imported.
+
+        Args:
+            packages: Package names listed per phase
+        """
+        log.info("Startup: %.1f ms to first frame", self.total * 1000)
+        for name, seconds, modules in self.phases:
+            top_level = sorted({module.split('.')[0] for module in modules})
+            listed = ", ".join(top_level[:packages])
+            if len(top_level) > packages:
+                listed += f", ... (+{len(top_level) - packages})"
+            log.info("  %-14s %7.1f ms  %4d modules  %s", name, seconds * 1000, len(modules), listed)
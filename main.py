@@ -1,26 +1,47 @@
 """Dash Dash - Main Entry Point"""
+import sys
+import time
+_started = time.perf_counter(), frozenset(sys.modules)  # For --startup-timing
+
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, message=".*pkg_resources.*")
 import os
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
 
+import argparse
+import logging
 import pygame
-import sys
 from library.config_manager import ConfigManager
-from gui.screens.main_menu import MainMenu
-from gui.screens.settings_menu import SettingsMenu
-from gui.screens.multiplayer_menu import MultiplayerMenu
-from gui.screens.game_screen import GameScreen
+from library.log import setup_logging
+from library.startup import StartupTimer
+from gui.fonts import fonts
+
+log = logging.getLogger("game")
 
 
 class Game:
     """Main game application."""
     
-    def __init__(self):
+    def __init__(self, startup=None, report_startup=False):
+        """
+        Args:
+            startup: StartupTimer started when the process did (default: now)
+            report_startup: Log the startup breakdown after the first frame
+        """
+        self.startup = startup or StartupTimer()
+        self.report_startup = report_startup
+        self.startup.mark("imports")
         pygame.init()
+        self.startup.mark("pygame.init")
         self.config = ConfigManager()
+        setup_logging(self.config.get('logging.level', 'INFO'), self.config.get('logging.rate', 20))
+        self.startup.mark("config")
         self.screen = pygame.display.set_mode(self.config.resolution)
         pygame.display.set_caption(f"{self.config.get('game.name')} v{self.config.get('game.version')}")
+        self.startup.mark("display")
+        # Resolve every font the screens use once, while the window opens
+        fonts.preload()
+        self.startup.mark("fonts")
         self.running = True
         self.clock = pygame.time.Clock()
         self.current_screen = None
@@ -32,45 +53,68 @@ class Game:
         
         self._init_screens()
         self._change_screen('main_menu')
+        self.startup.mark("main menu")
     
     def _init_screens(self):
-        """Initialize all game screens."""
-        main_callbacks = {
+        """Register how to build each screen; screens are built on first use."""
+        self.screen_factories = {
+            'main_menu': self._create_main_menu,
+            'settings': self._create_settings_menu,
+            'multiplayer': self._create_multiplayer_menu
+        }
+    
+    def _main_callbacks(self):
+        return {
             'main_menu': lambda: self._change_screen('main_menu'),
             'singleplayer': self._start_singleplayer,
             'multiplayer': lambda: self._change_screen('multiplayer'),
             'settings': lambda: self._change_screen('settings'),
             'quit': self._quit_game
         }
-        
-        self.screens['main_menu'] = MainMenu(self.screen, self.config, main_callbacks)
-        self.screens['settings'] = SettingsMenu(self.screen, self.config, main_callbacks)
+    
+    def _create_main_menu(self):
+        from gui.screens.main_menu import MainMenu
+        return MainMenu(self.screen, self.config, self._main_callbacks())
+    
+    def _create_settings_menu(self):
+        from gui.screens.settings_menu import SettingsMenu
+        return SettingsMenu(self.screen, self.config, self._main_callbacks())
+    
+    def _create_multiplayer_menu(self):
+        # Imports the networking code
+        from gui.screens.multiplayer_menu import MultiplayerMenu
         
         # Multiplayer menu with start_game callback
         multiplayer_callbacks = {
             'main_menu': lambda: self._change_screen('main_menu'),
             'start_game': self._start_multiplayer_game
         }
-        self.screens['multiplayer'] = MultiplayerMenu(self.screen, self.config, multiplayer_callbacks)
+        return MultiplayerMenu(self.screen, self.config, multiplayer_callbacks)
     
     def _change_screen(self, screen_name):
-        """Switch to a different screen."""
+        """Switch to a different screen, building it on first use."""
         if screen_name not in self.screens:
-            print(f"Warning: Screen '{screen_name}' not found!")
-            return
+            factory = self.screen_factories.get(screen_name)
+            if factory is None:
+                log.warning("Screen '%s' not found!", screen_name)
+                return
+            started = time.perf_counter()
+            self.screens[screen_name] = factory()
+            log.debug("Built screen %s in %.1f ms", screen_name, (time.perf_counter() - started) * 1000)
         
         if self.current_screen:
             self.current_screen.on_exit()
         
         self.current_screen = self.screens[screen_name]
+        self.current_screen.invalidate()
         self.current_screen.on_enter()
         
-        print(f"Switched to screen: {screen_name}")
+        log.info("Switched to screen: %s", screen_name)
     
     def _start_singleplayer(self):
         """Start a singleplayer game."""
-        print("Starting Singleplayer...")
-        print(f"Speed: {self.config.singleplayer_speed}, Username: {self.config.username}")
+        log.info("Starting Singleplayer...")
+        log.info("Speed: %s, Username: %s", self.config.singleplayer_speed, self.config.username)
         # TODO: Implement singleplayer game
     
     def _start_multiplayer_game(self, client, is_host):
@@ -81,7 +125,9 @@ class Game:
             client: NetworkClient instance (already connected)
             is_host: bool, True if hosting
         """
-        print(f"Starting multiplayer game (host={is_host})...")
+        log.info("Starting multiplayer game (host=%s)...", is_host)
+        
+        from gui.screens.game_screen import GameScreen
         
         # Store client reference
         self.network_client = client
@@ -102,7 +148,7 @@ class Game:
     
     def _exit_multiplayer_game(self):
         """Exit multiplayer game and return to multiplayer menu."""
-        print("Exiting multiplayer game...")
+        log.info("Exiting multiplayer game...")
         
         # Remove game screen
         if 'game' in self.screens:
@@ -113,13 +159,14 @@ class Game:
     
     def _quit_game(self):
         """Exit the game."""
-        print("Quitting game...")
+        log.info("Quitting game...")
         self.running = False
     
     def run(self):
         """Main game loop."""
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            # No frame cap before the first frame, so nothing delays it
+            dt = self.clock.tick(0 if self.startup else 60) / 1000.0
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -131,6 +178,14 @@ class Game:
             if self.current_screen:
                 self.current_screen.update(dt)
                 self.current_screen.draw()
+            
+            if self.startup:
+                self.startup.mark("first frame")
+                if self.report_startup:
+                    self.startup.report()
+                else:
+                    log.debug("Startup: %.1f ms to first frame", self.startup.total * 1000)
+                self.startup = None
         
         # Cleanup
         if self.network_client and self.network_client.is_connected():
@@ -141,4 +196,8 @@ class Game:
 
 
 if __name__ == "__main__":
-    Game().run()
+    parser = argparse.ArgumentParser(description="Dash Dash")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="Log how long each startup phase took and what it imported")
+    args = parser.parse_args()
+    Game(StartupTimer(*_started), args.startup_timing).run()
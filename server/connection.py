@@ -0,0 +1,90 @@
+"""
+Outbound Queues
+Per-connection buffering between the game state and socket I/O.
+"""
+
+import threading
+from collections import deque
+
+
+class OutboundQueue:
+    """
+    Bounded queue of frames waiting to be written to one client.
+
+    Producers (the broadcaster) never touch the socket; the I/O layer takes
+    frames out and writes them. When the queue is full the oldest droppable
+    frame (a snapshot, which a newer one supersedes) is discarded. A client
+    whose queue keeps overflowing without the I/O layer making progress is
+    reported as lagging so it can be disconnected.
+    """
+
+    def __init__(self, max_frames=64, max_drops=120):
+        """
+        Args:
+            max_frames: Frames held before dropping
+            max_drops: Drops tolerated since the last write before giving up
+        """
+        self.max_frames = max_frames
+        self.max_drops = max_drops
+        self.frames = deque()  # [(data, droppable), ...]
+        self.drops = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def put(self, data, droppable=False):
+        """
+        Queue a frame.
+
+        Args:
+            data: Encoded frame
+            droppable: True for snapshots, which may be discarded when full
+
+        Returns:
+            bool: False if the queue is closed or the client is lagging
+        """
+        with self.cond:
+            if self.closed:
+                return False
+            if len(self.frames) >= self.max_frames:
+                for index, (_, frame_droppable) in enumerate(self.frames):
+                    if frame_droppable:
+                        del self.frames[index]
+                        break
+                self.drops += 1
+                if self.drops > self.max_drops:
+                    return False
+            self.frames.append((data, droppable))
+            self.cond.notify()
+            return True
+
+    def resize(self, max_frames, max_drops):
+        """Change the limits; frames already queued are kept."""
+        with self.cond:
+            self.max_frames = max_frames
+            self.max_drops = max_drops
+
+    def take(self, timeout=None):
+        """
+        Remove every queued frame, waiting up to `timeout` for one to arrive.
+
+        Returns:
+            bytearray: Frames joined together (empty if none or closed)
+        """
+        with self.cond:
+            if not self.frames and not self.closed:
+                self.cond.wait(timeout)
+            data = bytearray()
+            while self.frames:
+                data += self.frames.popleft()[0]
+            if data:
+                self.drops = 0  # The I/O layer is keeping up again
+            return data
+
+    def close(self):
+        """Stop accepting frames and wake a waiting writer."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
@@ -0,0 +1,94 @@
+"""
+Shard Control Channel
+Messages between the shard supervisor and its worker processes.
+
+Each shard owns one end of a Unix datagram socketpair. The supervisor uses
+it to hand over accepted client sockets (passed as file descriptors along
+with any bytes already read from them); the shard uses it to report how
+many players it hosts per room.
+"""
+
+import json
+import socket
+
+# Message types (first byte of every control datagram)
+CTRL_ADOPT = 1  # supervisor -> shard: client socket fd + bytes already received
+CTRL_LOAD = 2   # shard -> supervisor: JSON {"adopted": int, "rooms": {room: players}}
+
+MAX_CONTROL_SIZE = 65536
+
+# socket.send_fds()/recv_fds() are Unix only (Python 3.9+)
+SHARDING_SUPPORTED = hasattr(socket, "send_fds") and hasattr(socket, "AF_UNIX")
+
+
+class ControlChannel:
+    """One end of a supervisor <-> shard socketpair."""
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    @staticmethod
+    def pair():
+        """
+        Returns:
+            tuple: (supervisor end, shard end) as ControlChannels
+        """
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        return ControlChannel(left), ControlChannel(right)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def setblocking(self, flag):
+        self.sock.setblocking(flag)
+
+    def close(self):
+        self.sock.close()
+
+    def send_connection(self, conn, initial=b""):
+        """
+        Pass a client socket to the other process.
+
+        The caller still owns `conn` and should close its copy afterwards.
+
+        Args:
+            conn: Connected client socket
+            initial: Bytes already read from it (the start of the handshake)
+        """
+        socket.send_fds(self.sock, [bytes([CTRL_ADOPT]) + bytes(initial)], [conn.fileno()])
+
+    def send_load(self, adopted, rooms):
+        """
+        Report a shard's load.
+
+        Args:
+            adopted: Handed-over connections that have since registered or
+                been dropped (the rest are still in flight)
+            rooms: {room: player count}
+        """
+        message = json.dumps({"adopted": adopted, "rooms": rooms}).encode()
+        self.sock.send(bytes([CTRL_LOAD]) + message)
+
+    def receive(self):
+        """
+        Read one control message.
+
+        Returns:
+            tuple: (CTRL_ADOPT, (socket, initial bytes)) or (CTRL_LOAD, dict)
+
+        Raises:
+            BlockingIOError: If non-blocking and nothing is waiting
+            ValueError: For an unknown or malformed message
+        """
+        data, fds, _, _ = socket.recv_fds(self.sock, MAX_CONTROL_SIZE, 1)
+        if not data:
+            raise ValueError("Empty control message")
+        if data[0] == CTRL_ADOPT:
+            if not fds:
+                raise ValueError("Adopt message without a socket")
+            return CTRL_ADOPT, (socket.socket(fileno=fds[0]), data[1:])
+        for fd in fds:
+            socket.close(fd)
+        if data[0] == CTRL_LOAD:
+            return CTRL_LOAD, json.loads(data[1:])
+        raise ValueError(f"Unknown control message {data[0]}")
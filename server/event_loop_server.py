@@ -0,0 +1,287 @@
+"""
+Event Loop Game Server
+Single-threaded GameServer that owns every socket through one selectors loop.
+"""
+
+import logging
+import selectors
+import time
+
+from server.game_server import GameServer
+from server.control import CTRL_ADOPT
+from game.multiplayer.protocol import FrameDecoder, ProtocolError
+
+log = logging.getLogger("server")
+
+
+class _Connection:
+    """Per-socket buffers for the event loop."""
+
+    def __init__(self, sock, addr, player_id, queue, recv_size):
+        self.sock = sock
+        self.addr = addr
+        self.player_id = player_id
+        self.registered = False
+        self.decoder = FrameDecoder(recv_size)  # Reused receive buffer
+        self.queue = queue          # OutboundQueue shared with the game state
+        self.pending = bytearray()  # Taken from the queue, not yet accepted by the socket
+
+
+class EventLoopGameServer(GameServer):
+    """
+    GameServer variant without per-client threads.
+
+    Accepting, reading inputs and broadcasting all happen on the thread
+    that calls run(), so no lock is contended on the hot path.
+    """
+
+    MODE_NAME = "event"
+    MAX_DATAGRAMS_PER_WAKEUP = 256  # Keeps TCP clients served under a UDP flood
+
+    def __init__(self, server_config=None, control=None):
+        super().__init__(server_config, control)
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}  # {player_id: _Connection}
+        self.datagram_buffer = memoryview(bytearray(2048))  # Reused for every datagram
+        if self.server:
+            self.server.setblocking(False)
+            self.selector.register(self.server, selectors.EVENT_READ, None)
+        if self.control:
+            self.control.setblocking(False)
+            self.selector.register(self.control, selectors.EVENT_READ, None)
+        if self.udp:
+            self.udp.setblocking(False)
+            self.selector.register(self.udp, selectors.EVENT_READ, None)
+
+    def run(self):
+        """Serve clients and run simulation ticks until stopped."""
+        self.next_tick = time.perf_counter()
+        try:
+            while self.running:
+                timeout = max(0.0, self.next_tick - time.perf_counter())
+                for key, mask in self.selector.select(timeout=timeout):
+                    if key.fileobj is self.udp:
+                        self._read_udp()
+                        continue
+                    if key.fileobj is self.control:
+                        self._read_control()
+                        continue
+                    if key.data is None:
+                        self._accept()
+                        continue
+                    conn = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._read(conn)
+                    if mask & selectors.EVENT_WRITE and conn.player_id in self.connections:
+                        self._flush(conn)
+                now = time.perf_counter()
+                ticked = now >= self.next_tick
+                if ticked:
+                    self._run_due_ticks(now)
+                    self._reload_config(now)
+                # At most one broadcast per tick, as in the threaded tick loop;
+                # changes between ticks (inputs, joins) wait for the next one
+                if ticked and (self.state_changed.is_set() or self.pending_udp_acks
+                               or self.pending_input_acks or self.settling):
+                    if self._snapshot_due(now):
+                        self._broadcast()
+        finally:
+            for conn in list(self.connections.values()):
+                self._close(conn)
+            self.selector.close()
+
+    def _accept(self):
+        """Accept every pending connection on the listening socket."""
+        while True:
+            try:
+                sock, addr = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            self._open_connection(sock, addr)
+
+    def _read_control(self):
+        """Adopt every client socket handed over by the shard supervisor."""
+        while True:
+            try:
+                msg_type, message = self.control.receive()
+            except (BlockingIOError, InterruptedError):
+                return
+            except (OSError, ValueError) as e:
+                log.error("Control channel: %s", e)
+                return
+            if msg_type != CTRL_ADOPT:
+                continue
+            sock, initial = message
+            try:
+                addr = sock.getpeername()
+            except OSError:
+                addr = None
+            conn = self._open_connection(sock, addr, adopted=True)
+            if conn and initial:
+                # Bytes the supervisor read while routing
+                conn.decoder.feed(initial)
+                self._receive(conn)
+
+    def _open_connection(self, sock, addr, adopted=False):
+        """
+        Allocate a player for a new socket and start watching it.
+
+        Args:
+            sock: Client socket
+            addr: Client address
+            adopted: True if the socket was handed over by the supervisor
+
+        Returns:
+            _Connection or None: None if the server is full
+        """
+        player_id = self._allocate_player(sock, addr, adopted)
+        if player_id is None:
+            sock.close()
+            return None
+        sock.setblocking(False)
+        conn = _Connection(sock, addr, player_id, self.players[player_id]["queue"], self.RECV_BUFFER_SIZE)
+        self.connections[player_id] = conn
+        self.selector.register(sock, selectors.EVENT_READ, conn)
+        log.info("[NEW CONNECTION] Player %s connected from %s", player_id, addr)
+        log.info("[ACTIVE CONNECTIONS] %s / %s", len(self.connections), self.server_config.max_players)
+        return conn
+
+    def _read_udp(self):
+        """Handle every datagram waiting on the UDP socket."""
+        buffer = self.datagram_buffer
+        for _ in range(self.MAX_DATAGRAMS_PER_WAKEUP):
+            try:
+                count, addr = self.udp.recvfrom_into(buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue  # ICMP error reported by Windows
+            try:
+                self._handle_datagram(buffer[:count], addr)
+            except ProtocolError:
+                pass
+            except Exception as e:
+                log.error("Datagram from %s: unexpected error: %s", addr, e, exc_info=True)
+
+    def _read(self, conn):
+        """Read available bytes and handle every complete message."""
+        try:
+            count = conn.decoder.recv_from(conn.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            log.error("Player %s: %s", conn.player_id, e)
+            self._disconnect(conn)
+            return
+        if not count:
+            if not conn.registered:
+                log.error("Player %s disconnected before sending client_id", conn.player_id)
+            self._disconnect(conn)
+            return
+        self._receive(conn)
+
+    def _receive(self, conn):
+        """Handle every complete message in the connection's receive buffer."""
+        try:
+            # Several frames may arrive in one recv (or one across several);
+            # payloads are parsed in place from the buffer
+            for msg_type, payload in conn.decoder.frames():
+                keep_open, reply = self._handle_frame(conn.player_id, msg_type, payload)
+                if reply:
+                    self._send(conn, reply)
+                if not keep_open:
+                    self._flush_and_disconnect(conn)
+                    return
+                if conn.player_id not in self.connections:
+                    return
+                conn.registered = True
+        except ProtocolError as e:
+            log.error("Player %s: %s", conn.player_id, e)
+            self._disconnect(conn)
+        except Exception as e:
+            # A bug handling one client must not stop the loop serving everyone
+            log.error("Player %s: unexpected error, disconnecting: %s", conn.player_id, e, exc_info=True)
+            self._disconnect(conn)
+
+    def _flush_and_disconnect(self, conn):
+        """Best-effort send of pending output (e.g. an error reply), then drop."""
+        try:
+            conn.sock.setblocking(True)
+            conn.sock.settimeout(1)
+            conn.sock.sendall(conn.pending + conn.queue.take(0))
+        except OSError:
+            pass
+        self._disconnect(conn)
+
+    def _send(self, conn, data, droppable=False):
+        """Queue a frame for a connection and write as much as the socket takes."""
+        if not conn.queue.put(data, droppable):
+            log.warning("[LAGGING] Player %s - Send queue kept overflowing, disconnecting", conn.player_id)
+            self._disconnect(conn)
+            return
+        self._flush(conn)
+
+    def _send_frame(self, player_id, frame):
+        """Queue a frame for one player and write as much as the socket takes."""
+        conn = self.connections.get(player_id)
+        if conn:
+            self._send(conn, frame)
+
+    def _flush(self, conn):
+        """Write pending output without blocking."""
+        while True:
+            if not conn.pending:
+                conn.pending = conn.queue.take(0)
+                if not conn.pending:
+                    break
+            try:
+                sent = conn.sock.send(conn.pending)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                log.error("Failed to send update to Player %s: %s", conn.player_id, e)
+                self._disconnect(conn)
+                return
+            del conn.pending[:sent]
+            if conn.pending:
+                break  # Socket buffer full; wait for EVENT_WRITE
+        events = selectors.EVENT_READ
+        if conn.pending:
+            events |= selectors.EVENT_WRITE
+        if self.selector.get_key(conn.sock).events != events:
+            self.selector.modify(conn.sock, events, conn)
+
+    def _broadcast(self):
+        """Send the current state to every registered player if it changed."""
+        self.state_changed.clear()
+        state, settle = self._prepare_broadcast()
+        if state is None:
+            return
+        for conn in list(self.connections.values()):
+            if conn.registered:
+                snapshot = self._build_snapshot(conn.player_id, state, settle)
+                if snapshot and not self._send_snapshot_udp(conn.player_id, snapshot):
+                    self._send(conn, snapshot, droppable=True)
+
+    def _close(self, conn):
+        """Unregister and close a connection socket."""
+        self.connections.pop(conn.player_id, None)
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+    def _disconnect(self, conn):
+        """Drop a connection and its player."""
+        if conn.player_id not in self.connections:
+            return
+        self._close(conn)
+        self._remove_player(conn.player_id)
+        log.info("[DISCONNECTED] Player %s disconnected", conn.player_id)
+        log.info("[ACTIVE PLAYERS] %s player(s) remaining", len(self.players))
@@ -3,55 +3,565 @@ Game Server - Updated with Diagonal Movement and Client ID Validation
 Manages multiplayer game sessions and synchronizes player positions.
 """
 
+import logging
 import socket
+import secrets
 import threading
-import json
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from server.server_config import ServerConfig
+from server.interest import InterestGrid
+from server.connection import OutboundQueue
+from server.records import RecordCache
+from server.control import CTRL_ADOPT
 from game.constants import *
+from game.movement import step
+from game.multiplayer.protocol import *
+from game.multiplayer.udp import wrap_udp_socket
+from library.log import setup_logging
+
+log = logging.getLogger("server")
 
 
 class GameServer:
-    def __init__(self):
+    """Thread-per-client game server."""
+
+    MODE_NAME = "threaded"
+    MAX_CATCHUP_TICKS = 5  # Ticks run back-to-back before dropping the backlog
+    SNAPSHOT_HISTORY = 32  # Unacknowledged snapshots remembered per client
+    RECV_BUFFER_SIZE = 4096  # Per-connection receive buffer (grows for larger frames)
+    CONFIG_POLL_INTERVAL = 1.0  # Seconds between checks of the config file for changes
+
+    def __init__(self, server_config=None, control=None):
+        """
+        Args:
+            server_config: ServerConfig (parsed from the command line if None)
+            control: ControlChannel when running as a shard; connections then
+                come from the supervisor instead of a listening socket
+        """
         self.players = {}  # {player_id: {..., 'conn': conn}}
         self.client_ids = set()
         self.player_id_counter = 1
         self.lock = threading.Lock()
-        self.server_config = ServerConfig()
-        self.server_config.parse_args()
-        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server.bind((self.server_config.host, self.server_config.port))
-        self.server.listen()
+        if server_config is None:
+            server_config = ServerConfig()
+            server_config.parse_args()
+        self.server_config = server_config
+        self.control = control
+        self.adopted = 0  # Supervisor connections that have registered or been dropped
+        self.rooms = {}  # {room: set of registered player ids}
+        self.server = None
+        if control is None:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((self.server_config.host, self.server_config.port))
+            self.server.listen(socket.SOMAXCONN)
+        self.udp = None
+        self.udp_tokens = {}  # {udp token: player_id}
+        self.pending_udp_acks = set()  # UDP players that have not acked their latest snapshot
+        self.pending_input_acks = set()  # Players whose movement changed since their last snapshot
+        if self.server_config.udp:
+            udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # Shards share the TCP port through the supervisor but each needs
+            # its own UDP port, which WELCOME tells the client
+            udp.bind((self.server_config.host, self.server_config.port if control is None else 0))
+            self.udp = wrap_udp_socket(udp, self.server_config.udp_loss)
+        self._build_interest()
+        self.records = RecordCache()
         self.state_changed = threading.Event()
+        self.last_state = None
+        self.settling = False  # State changed in the last broadcast; one more shows it stopped
+        self.next_tick = time.perf_counter()
+        self.tick_count = 0  # Ticks simulated; stamps snapshots for client interpolation
+        self.next_snapshot = 0.0
+        self.next_config_check = time.perf_counter() + self.CONFIG_POLL_INTERVAL
         self.running = True
 
     def start(self):
-        print("=" * 70)
-        print(f"[STARTED] Dash Dash Game Server")
-        print("=" * 70)
-        print(f"  Host: {self.server_config.host}")
-        print(f"  Port: {self.server_config.port}")
-        print(f"  Max Players: {self.server_config.max_players}")
-        print(f"  Config: {ServerConfig.CONFIG_FILE}")
-        print("=" * 70)
-        print("Waiting for connections...")
-        print()
-        threading.Thread(target=self.connection_handler, daemon=True).start()
-        threading.Thread(target=self.broadcaster, daemon=True).start()
+        log.info("=" * 70)
+        log.info("[STARTED] Dash Dash Game Server")
+        log.info("=" * 70)
+        log.info("  Host: %s", self.server_config.host)
+        log.info("  Port: %s", self.server_config.port)
+        log.info("  Max Players: %s", self.server_config.max_players)
+        log.info("  Tick Rate: %s/s", self.server_config.tick_rate)
+        log.info("  Snapshot Rate: %s/s", self.server_config.snapshot_rate or self.server_config.tick_rate)
+        log.info("  Mode: %s", self.MODE_NAME)
+        log.info("  UDP: %s", "on" if self.udp else "off")
+        log.info("  Config: %s", ServerConfig.CONFIG_FILE)
+        log.info("=" * 70)
+        log.info("Waiting for connections...")
         try:
-            while self.running:
-                threading.Event().wait(1)
+            self.run()
         except KeyboardInterrupt:
-            print("\n[SHUTDOWN] Server shutting down...")
+            log.info("[SHUTDOWN] Server shutting down...")
+        finally:
             self.running = False
-            self.server.close()
-            print("[STOPPED] Server stopped")
+            if self.server:
+                self.server.close()
+            if self.udp:
+                self.udp.close()
+            log.info("[STOPPED] Server stopped")
+
+    def run(self):
+        """Serve clients until stopped (one receiver thread per connection)."""
+        if self.server:
+            threading.Thread(target=self.connection_handler, daemon=True).start()
+        if self.control:
+            threading.Thread(target=self.control_handler, daemon=True).start()
+        threading.Thread(target=self.tick_loop, daemon=True).start()
+        if self.udp:
+            threading.Thread(target=self.udp_receiver, daemon=True).start()
+        while self.running:
+            threading.Event().wait(1)
+
+    # ------------------------------------------------------------------
+    # Game state (shared by every server mode; threaded callers hold self.lock)
+    # ------------------------------------------------------------------
+
+    def _allocate_player(self, conn, addr, adopted=False):
+        """
+        Reserve a player slot for a new connection.
+
+        Args:
+            conn: Client socket
+            addr: Client address
+            adopted: True if the connection was handed over by the supervisor
+
+        Returns:
+            int or None: New player id, or None if the server is full
+        """
+        if len(self.players) >= self.server_config.max_players:
+            log.warning("[REJECTED] Connection from %s - Server full (%s/%s)", addr, self.server_config.max_players, self.server_config.max_players)
+            if adopted:
+                self.adopted += 1
+                self._report_load()
+            return None
+        player_id = self.player_id_counter
+        self.player_id_counter += 1
+        queue = OutboundQueue(self.server_config.send_queue_size, self.server_config.send_queue_max_drops)
+        self.players[player_id] = {"conn": conn, "addr": addr, "queue": queue, "adopted": adopted}
+        return player_id
+
+    def _register_player(self, player_id, hello):
+        """
+        Complete the handshake of a connected player.
+
+        Args:
+            player_id: Slot returned by _allocate_player
+            hello: Decoded MSG_HELLO message
+
+        Returns:
+            tuple: (accepted: bool, reply: bytes)
+        """
+        client_id = hello.get("client_id")
+        room = hello.get("room", "")
+        codec = choose_codec(hello.get("codecs", 0))
+        if hello.get("version") != PROTOCOL_VERSION or codec is None:
+            log.warning("[REJECTED] Player %s - Unsupported protocol version %s", player_id, hello.get("version"))
+            return (False, encode_error(ERROR_PROTOCOL_MISMATCH))
+        if client_id and client_id in self.client_ids:
+            log.warning("[REJECTED] Player %s - Client ID already connected: %s", player_id, client_id)
+            return (False, encode_error(ERROR_CLIENT_ALREADY_CONNECTED))
+        if client_id:
+            self.client_ids.add(client_id)
+        udp_token = 0
+        if self.udp and hello.get("flags", 0) & HELLO_UDP:
+            udp_token = self._new_udp_token()
+            self.udp_tokens[udp_token] = player_id
+        self.players[player_id].update({
+            "x": self.server_config.spawn_x,
+            "y": self.server_config.spawn_y,
+            "name": hello.get("name") or f"Player{player_id}",
+            "client_id": client_id,
+            "room": room,
+            "codec": codec,
+            "snapshot_seq": 0,   # Last snapshot seq sent to this client
+            "sent": {},          # {seq: state} sent but not yet superseded by an ack
+            "acked": 0,          # Last snapshot seq the client acknowledged
+            "keyframe_seq": 0,   # Seq of the last full snapshot
+            "last_input_seq": 0,
+            "movement": MOVE_NONE,
+            "input_ticks": 0,    # Ticks simulated since the last input, for client reconciliation
+            "reported_input_seq": 0,  # last_input_seq carried by the latest snapshot
+            "udp_token": udp_token,
+            "udp_addr": None     # Learned from the client's first datagram
+        })
+        self.interest.insert(player_id, self.server_config.spawn_x, self.server_config.spawn_y)
+        self.rooms.setdefault(room, set()).add(player_id)
+        if self.players[player_id].pop("adopted"):
+            self.adopted += 1
+        self._report_load()
+        log.info("[REGISTERED] Player %s - Name: %s, Client ID: %s, Room: %s, Codec: %s", player_id, self.players[player_id]["name"], client_id, room or "-", CODEC_NAMES[codec])
+        self.state_changed.set()
+        udp_port = self.udp.getsockname()[1] if udp_token else 0
+        welcome = encode_welcome(
+            player_id, codec, udp_port, udp_token,
+            self.server_config.tick_rate, self.server_config.player_speed
+        )
+        reply = welcome + self._build_snapshot(player_id, self._snapshot_players())
+        return (True, reply)
+
+    def _handle_frame(self, player_id, msg_type, payload):
+        """
+        Process one frame received from a client.
+
+        Returns:
+            tuple: (keep_open: bool, reply: bytes or None)
+        """
+        pdata = self.players.get(player_id)
+        if pdata is None:
+            return (False, None)
+        if "x" not in pdata:
+            if msg_type != MSG_HELLO:
+                raise ProtocolError(f"Expected hello, got message type {msg_type}")
+            return self._register_player(player_id, decode_hello(payload))
+        if msg_type == MSG_INPUT:
+            for input_state in decode_inputs(payload, pdata["codec"]):
+                self._apply_input(player_id, input_state)
+        elif msg_type == MSG_ACK:
+            self._acknowledge(player_id, decode_ack(payload, pdata["codec"]))
+        return (True, None)
+
+    def _acknowledge(self, player_id, seq):
+        """Record that a client applied snapshot `seq`; it becomes the delta baseline."""
+        pdata = self.players[player_id]
+        sent = pdata["sent"]
+        if seq <= pdata["acked"] or seq not in sent:
+            return
+        pdata["acked"] = seq
+        if seq == pdata["snapshot_seq"]:
+            self.pending_udp_acks.discard(player_id)
+        for old_seq in [s for s in sent if s < seq]:
+            del sent[old_seq]
+
+    def _apply_input(self, player_id, input_state):
+        """
+        Buffer a player's movement input.
+
+        Only the latest bitmask is kept; it is applied once per tick by
+        _tick(), so packet rate does not affect movement speed.
+        """
+        pdata = self.players.get(player_id)
+        if pdata is None:
+            return
+        seq = input_state.get("seq", 0)
+        if seq:
+            if seq <= pdata["last_input_seq"]:
+                return  # Reordered or duplicated datagram
+            pdata["last_input_seq"] = seq
+        movement = input_state.get("movement", MOVE_NONE)
+        if movement != pdata["movement"]:
+            # Even if nothing moves (e.g. a stop), the client needs a snapshot
+            # acknowledging this input to settle its prediction; it goes out
+            # with the next tick's broadcast
+            self.pending_input_acks.add(player_id)
+        pdata["movement"] = movement
+        pdata["input_ticks"] = 0
+        if input_state.get("name") and input_state["name"] != pdata["name"]:
+            pdata["name"] = input_state["name"]
+            self.state_changed.set()
+
+    def _tick(self):
+        """Advance the simulation by one fixed step."""
+        self.tick_count += 1
+        speed = self.server_config.player_speed
+        for pid, pdata in self.players.items():
+            if "x" not in pdata:
+                continue
+            pdata["input_ticks"] += 1
+            movement = pdata["movement"]
+            if movement == MOVE_NONE:
+                continue
+            x, y = step(pdata["x"], pdata["y"], movement, speed)
+            if x != pdata["x"] or y != pdata["y"]:
+                pdata["x"] = x
+                pdata["y"] = y
+                self.interest.move(pid, x, y)
+                self.state_changed.set()
+
+    def _run_due_ticks(self, now):
+        """Run every tick due by `now`, dropping the backlog if too far behind."""
+        interval = 1.0 / self.server_config.tick_rate
+        ticks = 0
+        while self.next_tick <= now and ticks < self.MAX_CATCHUP_TICKS:
+            self._tick()
+            self.next_tick += interval
+            ticks += 1
+        if self.next_tick <= now:
+            self.next_tick = now + interval
+
+    def _reload_config(self, now):
+        """
+        Apply changes to the config file (checked every CONFIG_POLL_INTERVAL).
+
+        Called between ticks, so no tick sees a mix of old and new settings.
+        """
+        if now < self.next_config_check:
+            return
+        self.next_config_check = now + self.CONFIG_POLL_INTERVAL
+        changes = self.server_config.reload()
+        if not changes:
+            return
+        if "log_level" in changes:
+            logging.getLogger().setLevel(changes["log_level"])
+        if "player_speed" in changes:
+            # Clients predict with the speed from WELCOME until told otherwise
+            settings = encode_settings(changes["player_speed"])
+            for pid in [pid for pid, pdata in self.players.items() if "x" in pdata]:
+                self._send_frame(pid, settings)
+        if "view_radius" in changes:
+            self._build_interest()
+        if "send_queue_size" in changes or "send_queue_max_drops" in changes:
+            for pdata in self.players.values():
+                pdata["queue"].resize(self.server_config.send_queue_size, self.server_config.send_queue_max_drops)
+        # What each client sees may have changed (e.g. view radius)
+        self.state_changed.set()
+
+    def _build_interest(self):
+        """(Re)build the interest grid; its cell size follows the view radius."""
+        self.interest = InterestGrid(self.server_config.view_radius or PLAYER_SIZE * 10)
+        for pid, pdata in self.players.items():
+            if "x" in pdata:
+                self.interest.insert(pid, pdata["x"], pdata["y"])
+
+    def _snapshot_due(self, now):
+        """
+        Check the snapshot rate limit (snapshots are otherwise sent every tick).
+
+        Returns:
+            bool: True if a broadcast may happen at `now`
+        """
+        rate = self.server_config.snapshot_rate
+        if rate <= 0:
+            return True
+        if now < self.next_snapshot:
+            return False
+        interval = 1.0 / rate
+        self.next_snapshot += interval
+        if self.next_snapshot <= now:
+            self.next_snapshot = now + interval
+        return True
+
+    def _send_frame(self, player_id, frame):
+        """Queue a frame for one player outside of a broadcast."""
+        self.players[player_id]["queue"].put(frame)
+
+    def _remove_player(self, player_id):
+        """Forget a player, release its client_id and close its socket."""
+        if player_id not in self.players:
+            return
+        client_id = self.players[player_id].get("client_id")
+        if client_id:
+            self.client_ids.discard(client_id)
+        self.udp_tokens.pop(self.players[player_id].get("udp_token"), None)
+        if self.players[player_id].get("adopted"):
+            self.adopted += 1  # Left before registering
+        room = self.players[player_id].get("room")
+        members = self.rooms.get(room)
+        if members is not None:
+            members.discard(player_id)
+            if not members:
+                del self.rooms[room]
+        self.pending_udp_acks.discard(player_id)
+        self.pending_input_acks.discard(player_id)
+        self.players[player_id]["queue"].close()
+        conn = self.players[player_id]["conn"]
+        try:
+            # Also wakes a sender thread blocked writing to a lagging client
+            conn.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+        del self.players[player_id]
+        self.interest.remove(player_id)
+        self.records.discard(player_id)
+        self._report_load()
+        self.state_changed.set()
+
+    def _snapshot_players(self):
+        """Public state of every registered player: {pid: (x, y, name)}."""
+        return {
+            pid: (pdata["x"], pdata["y"], pdata["name"])
+            for pid, pdata in self.players.items()
+            if "x" in pdata
+        }
+
+    def _visible_state(self, player_id, state):
+        """Restrict `state` to this client's room and view radius."""
+        radius = self.server_config.view_radius
+        members = self.rooms.get(self.players[player_id]["room"], set())
+        if radius > 0:
+            visible = self.interest.visible_to(player_id, radius) & members
+        elif len(self.rooms) > 1:
+            visible = members
+        else:
+            return state
+        return {pid: state[pid] for pid in visible if pid in state}
+
+    def _report_load(self):
+        """Tell the supervisor (if any) how many players this shard hosts."""
+        if self.control is None:
+            return
+        try:
+            self.control.send_load(self.adopted, {room: len(members) for room, members in self.rooms.items()})
+        except OSError as e:
+            log.error("Failed to report load to supervisor: %s", e)
+
+    def _prepare_broadcast(self):
+        """
+        Decide whether a broadcast is needed.
+
+        After the state stops changing one more (usually empty) snapshot is
+        sent, so clients interpolating or extrapolating remote players see
+        that they stopped instead of waiting for a snapshot that never comes.
+
+        Returns:
+            tuple: (state or None if nothing to send, settle: bool)
+        """
+        state = self._snapshot_players()
+        changed = state != self.last_state
+        settle = self.settling and not changed
+        self.settling = changed
+        if not changed and not settle and not self.pending_udp_acks and not self.pending_input_acks:
+            return (None, False)
+        self.pending_input_acks.clear()
+        self.last_state = state
+        return (state, settle)
+
+    def _build_snapshot(self, player_id, state, force=False):
+        """
+        Encode the part of `state` visible to one client as a delta against
+        the last snapshot it acknowledged, or as a keyframe when there is no
+        usable baseline or one is due.
+
+        Args:
+            player_id: Receiving client
+            state: _snapshot_players() result
+            force: Send even if the client already has this state
+
+        Returns:
+            bytes or None: Snapshot frame, or None if the client already has it
+        """
+        pdata = self.players[player_id]
+        state = self._visible_state(player_id, state)
+        sent = pdata["sent"]
+        unchanged = sent.get(pdata["snapshot_seq"]) == state and pdata["reported_input_seq"] == pdata["last_input_seq"]
+        if unchanged and not force:
+            # Over UDP the latest snapshot may have been lost: resend until acked
+            if pdata["udp_addr"] is None or pdata["acked"] == pdata["snapshot_seq"]:
+                return None
+        seq = pdata["snapshot_seq"] + 1
+        codec = pdata["codec"]
+        baseline = sent.get(pdata["acked"])
+        if baseline is None or seq - pdata["keyframe_seq"] >= self.server_config.keyframe_interval:
+            base = KEYFRAME
+            entries = [
+                self.records.entry(pid, record, FIELD_POSITION | FIELD_NAME, codec)
+                for pid, record in state.items()
+            ]
+            removed = []
+            pdata["keyframe_seq"] = seq
+        else:
+            base = pdata["acked"]
+            entries = []
+            for pid, record in state.items():
+                old = baseline.get(pid)
+                if old == record:
+                    continue
+                flags = 0
+                if old is None or old[0] != record[0] or old[1] != record[1]:
+                    flags |= FIELD_POSITION
+                if old is None or old[2] != record[2]:
+                    flags |= FIELD_NAME
+                entries.append(self.records.entry(pid, record, flags, codec))
+            removed = [pid for pid in baseline if pid not in state]
+        pdata["snapshot_seq"] = seq
+        pdata["reported_input_seq"] = pdata["last_input_seq"]
+        sent[seq] = state
+        if len(sent) > self.SNAPSHOT_HISTORY:
+            # Client stopped acknowledging; the next snapshot will be a keyframe
+            del sent[next(iter(sent))]
+        return encode_snapshot_entries(
+            seq, base, entries, removed, codec,
+            pdata["last_input_seq"], pdata["input_ticks"], self.tick_count
+        )
+
+    # ------------------------------------------------------------------
+    # UDP channel
+    # ------------------------------------------------------------------
+
+    def _new_udp_token(self):
+        """Random non-zero token identifying a player's datagrams."""
+        while True:
+            token = secrets.randbits(32)
+            if token and token not in self.udp_tokens:
+                return token
+
+    def _handle_datagram(self, data, addr):
+        """Process one datagram (address binding, inputs and acks)."""
+        msg_type, token, payload = decode_datagram(data)
+        pdata = self.players.get(self.udp_tokens.get(token))
+        if pdata is None:
+            return
+        player_id = self.udp_tokens[token]
+        pdata["udp_addr"] = addr
+        if msg_type == MSG_UDP_BIND:
+            self._send_datagram(pdata, encode_frame(MSG_UDP_BIND))
+        elif msg_type == MSG_INPUT:
+            for input_state in decode_inputs(payload, pdata["codec"]):
+                self._apply_input(player_id, input_state)
+        elif msg_type == MSG_ACK:
+            self._acknowledge(player_id, decode_ack(payload, pdata["codec"]))
+
+    def _send_datagram(self, pdata, frame):
+        """Send a frame as a datagram to a bound player (losses are expected)."""
+        try:
+            self.udp.sendto(encode_datagram(frame, pdata["udp_token"]), pdata["udp_addr"])
+        except OSError:
+            pass
+
+    def _send_snapshot_udp(self, player_id, snapshot):
+        """
+        Send a snapshot over UDP if the player has a bound UDP address.
+
+        Returns:
+            bool: False if the caller must send it over TCP instead
+        """
+        pdata = self.players[player_id]
+        if pdata["udp_addr"] is None or len(snapshot) > MAX_DATAGRAM_SIZE:
+            return False
+        self._send_datagram(pdata, snapshot)
+        self.pending_udp_acks.add(player_id)
+        return True
+
+    def udp_receiver(self):
+        buffer = memoryview(bytearray(2048))  # Reused for every datagram
+        while self.running:
+            try:
+                count, addr = self.udp.recvfrom_into(buffer)
+            except OSError:
+                # Closed on shutdown, or an ICMP error reported by Windows
+                continue
+            with self.lock:
+                try:
+                    self._handle_datagram(buffer[:count], addr)
+                except ProtocolError:
+                    pass
+                except Exception as e:
+                    log.error("Datagram from %s: unexpected error: %s", addr, e, exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Threaded I/O
+    # ------------------------------------------------------------------
 
     def connection_handler(self):
         while self.running:
@@ -59,121 +569,148 @@ class GameServer:
                 conn, addr = self.server.accept()
             except Exception:
                 break
-            with self.lock:
-                if len(self.players) >= self.server_config.max_players:
-                    print(f"[REJECTED] Connection from {addr} - Server full ({self.server_config.max_players}/{self.server_config.max_players})")
-                    conn.close()
-                    continue
-                player_id = self.player_id_counter
-                self.player_id_counter += 1
-                self.players[player_id] = {"conn": conn, "addr": addr}
-            threading.Thread(target=self.receiver, args=(conn, addr, player_id), daemon=True).start()
-            print(f"[ACTIVE CONNECTIONS] {threading.active_count() - 1} / {self.server_config.max_players}")
-
-    def receiver(self, conn, addr, player_id):
-        print(f"[NEW CONNECTION] Player {player_id} connected from {addr}")
+            self._start_client(conn, addr)
+
+    def control_handler(self):
+        """Adopt client sockets handed over by the shard supervisor."""
+        while self.running:
+            try:
+                msg_type, message = self.control.receive()
+            except (OSError, ValueError) as e:
+                if self.running:
+                    log.error("Control channel: %s", e)
+                break
+            if msg_type != CTRL_ADOPT:
+                continue
+            conn, initial = message
+            try:
+                addr = conn.getpeername()
+            except OSError:
+                addr = None
+            self._start_client(conn, addr, initial, adopted=True)
+
+    def _start_client(self, conn, addr, initial=b"", adopted=False):
+        """Allocate a player for a new connection and start its I/O threads."""
+        with self.lock:
+            player_id = self._allocate_player(conn, addr, adopted)
+        if player_id is None:
+            conn.close()
+            return
+        threading.Thread(target=self.receiver, args=(conn, addr, player_id, initial), daemon=True).start()
+        threading.Thread(target=self.sender, args=(conn, player_id), daemon=True).start()
+        log.info("[ACTIVE CONNECTIONS] %s / %s", threading.active_count() - 1, self.server_config.max_players)
+
+    def receiver(self, conn, addr, player_id, initial=b""):
+        log.info("[NEW CONNECTION] Player %s connected from %s", player_id, addr)
+        decoder = FrameDecoder(self.RECV_BUFFER_SIZE)
+        decoder.feed(initial)  # Bytes the supervisor read while routing come first
         try:
-            data = conn.recv(1024)
-            if not data:
-                print(f"[ERROR] Player {player_id} disconnected before sending client_id")
-                conn.close()
-                return
-            input_state = json.loads(data.decode())
-            client_id = input_state.get("client_id")
-            with self.lock:
-                if client_id and client_id in self.client_ids:
-                    print(f"[REJECTED] Player {player_id} - Client ID already connected: {client_id}")
-                    error_response = {"error": "CLIENT_ALREADY_CONNECTED"}
-                    conn.sendall(json.dumps(error_response).encode())
-                    conn.close()
-                    return
-                if client_id:
-                    self.client_ids.add(client_id)
-                self.players[player_id].update({
-                    "x": self.server_config.spawn_x,
-                    "y": self.server_config.spawn_y,
-                    "name": input_state.get("name", f"Player{player_id}"),
-                    "client_id": client_id
-                })
-                # Only send serializable player info
-                serializable_players = {
-                    pid: {k: v for k, v in pdata.items() if k != "conn" and k != "addr"}
-                    for pid, pdata in self.players.items()
-                }
-                conn.sendall(json.dumps(serializable_players).encode())
-                print(f"[REGISTERED] Player {player_id} - Name: {self.players[player_id]['name']}, Client ID: {client_id}")
             while self.running:
-                data = conn.recv(1024)
-                if not data:
-                    break
-                input_state = json.loads(data.decode())
+                # Handle every complete frame before reading again
+                rejection = None
                 with self.lock:
-                    if player_id in self.players:
-                        movement = input_state.get("movement", MOVE_NONE)
-                        dx = dy = 0
-                        if movement & MOVE_UP:
-                            dy -= 1
-                        if movement & MOVE_DOWN:
-                            dy += 1
-                        if movement & MOVE_LEFT:
-                            dx -= 1
-                        if movement & MOVE_RIGHT:
-                            dx += 1
-                        if dx != 0 and dy != 0:
-                            speed = PLAYER_SPEED_DIAGONAL
-                        else:
-                            speed = self.server_config.player_speed
-                        self.players[player_id]["x"] += dx * speed
-                        self.players[player_id]["y"] += dy * speed
-                        if input_state.get("name"):
-                            self.players[player_id]["name"] = input_state["name"]
-                        self.state_changed.set()
+                    for msg_type, payload in decoder.frames():
+                        keep_open, reply = self._handle_frame(player_id, msg_type, payload)
+                        if not keep_open:
+                            rejection = reply
+                            break
+                        if reply:
+                            self.players[player_id]["queue"].put(reply)
+                if rejection is not None:
+                    conn.sendall(rejection)
+                    break
+                if not decoder.recv_from(conn):
+                    if "x" not in self.players.get(player_id, {}):
+                        log.error("Player %s disconnected before sending client_id", player_id)
+                    break
         except Exception as e:
-            print(f"[ERROR] Player {player_id}: {e}")
+            log.error("Player %s: %s", player_id, e)
         finally:
             with self.lock:
-                if player_id in self.players:
-                    client_id = self.players[player_id].get("client_id")
-                    if client_id:
-                        self.client_ids.discard(client_id)
-                    try:
-                        self.players[player_id]["conn"].close()
-                    except Exception:
-                        pass
-                    del self.players[player_id]
-            print(f"[DISCONNECTED] Player {player_id} disconnected")
-            print(f"[ACTIVE PLAYERS] {len(self.players)} player(s) remaining")
-
-    def broadcaster(self):
-        last_state = None
+                self._remove_player(player_id)
+                remaining = len(self.players)
+            log.info("[DISCONNECTED] Player %s disconnected", player_id)
+            log.info("[ACTIVE PLAYERS] %s player(s) remaining", remaining)
+
+    def sender(self, conn, player_id):
+        """Write queued frames to one client; only this thread blocks on its socket."""
+        with self.lock:
+            pdata = self.players.get(player_id)
+            if pdata is None:
+                return
+            queue = pdata["queue"]
+        try:
+            while self.running and not queue.closed:
+                data = queue.take(timeout=1)
+                if data:
+                    conn.sendall(data)
+        except OSError as e:
+            if not queue.closed:
+                log.error("Failed to send update to Player %s: %s", player_id, e)
+                try:
+                    # Wake the receiver, which removes the player
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def tick_loop(self):
+        """Run the simulation at the configured tick rate and broadcast changes."""
+        self.next_tick = time.perf_counter()
         while self.running:
-            self.state_changed.wait()
+            delay = self.next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
             with self.lock:
-                # Only send serializable player info
-                serializable_players = {
-                    pid: {k: v for k, v in pdata.items() if k != "conn" and k != "addr"}
-                    for pid, pdata in self.players.items()
-                }
-                state = json.dumps(serializable_players).encode()
-                if state != last_state:
-                    disconnected_pids = []
-                    for pid, pdata in self.players.items():
-                        conn_obj = pdata.get("conn")
-                        if conn_obj:
-                            try:
-                                conn_obj.sendall(state)
-                            except Exception as e:
-                                print(f"[ERROR] Failed to send update to Player {pid}: {e}")
-                                disconnected_pids.append(pid)
-                    for pid in disconnected_pids:
-                        if pid in self.players:
-                            try:
-                                self.players[pid]["conn"].close()
-                            except Exception:
-                                pass
-                            del self.players[pid]
-                    last_state = state
-                self.state_changed.clear()
+                now = time.perf_counter()
+                self._run_due_ticks(now)
+                self._reload_config(now)
+                pending = (self.state_changed.is_set() or self.pending_udp_acks
+                           or self.pending_input_acks or self.settling)
+                if pending and self._snapshot_due(now):
+                    self.state_changed.clear()
+                    self._broadcast_state()
+
+    def _broadcast_state(self):
+        """Send the current state to every registered player if it changed."""
+        state, settle = self._prepare_broadcast()
+        if state is None:
+            return
+        disconnected_pids = []
+        for pid, pdata in self.players.items():
+            conn_obj = pdata.get("conn")
+            if conn_obj and "x" in pdata:
+                snapshot = self._build_snapshot(pid, state, settle)
+                if snapshot is None or self._send_snapshot_udp(pid, snapshot):
+                    continue
+                if not pdata["queue"].put(snapshot, droppable=True):
+                    log.warning("[LAGGING] Player %s - Send queue kept overflowing, disconnecting", pid)
+                    disconnected_pids.append(pid)
+        for pid in disconnected_pids:
+            self._remove_player(pid)
+
+
+def create_server(server_config, control=None):
+    """
+    Build the server implementation selected by the config.
+
+    Args:
+        server_config: ServerConfig instance (already parsed)
+        control: ControlChannel when building a shard for the supervisor
+
+    Returns:
+        GameServer: GameServer or EventLoopGameServer, or a ShardSupervisor
+            when more than one shard is configured
+    """
+    if control is None and server_config.shards > 1:
+        from server.supervisor import ShardSupervisor
+        from server.control import SHARDING_SUPPORTED
+        if SHARDING_SUPPORTED:
+            return ShardSupervisor(server_config)
+        log.warning("Sharding needs Unix socket fd passing; running a single process")
+    if server_config.mode == "event":
+        from server.event_loop_server import EventLoopGameServer
+        return EventLoopGameServer(server_config, control)
+    return GameServer(server_config, control)
 
 
 if __name__ == "__main__":
@@ -186,6 +723,13 @@ if __name__ == "__main__":
     print("  python game_server.py                    # Use config/defaults")
     print("  python game_server.py -H 0.0.0.0 -p 5000 # Override settings")
     print("  python game_server.py -p 8080 --save     # Save to config")
+    print("  python game_server.py --mode event       # Single-threaded event loop")
+    print("  python game_server.py --shards 4         # One process per shard, routed by room")
+    print("  python game_server.py --log-level DEBUG  # More (or less) logging")
     print()
-    
-    GameServer().start()
+
+    setup_logging()
+    config = ServerConfig()
+    config.parse_args()
+    setup_logging(config.log_level, config.log_rate)
+    create_server(config).start()
@@ -0,0 +1,87 @@
+"""
+Interest Management
+Uniform spatial hash used to decide which players each client can see.
+"""
+
+import math
+
+
+class InterestGrid:
+    """
+    Uniform grid of square cells holding player ids.
+
+    Positions are updated incrementally: moving inside the same cell only
+    stores the new coordinates, so the per-tick cost is proportional to the
+    number of players that cross a cell border.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = max(1, cell_size)
+        self.cells = {}      # {(cx, cy): set of player ids}
+        self.positions = {}  # {player_id: (x, y, cell)}
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, player_id, x, y):
+        """Add a player (or move it if already present)."""
+        if player_id in self.positions:
+            self.move(player_id, x, y)
+            return
+        cell = self._cell(x, y)
+        self.cells.setdefault(cell, set()).add(player_id)
+        self.positions[player_id] = (x, y, cell)
+
+    def move(self, player_id, x, y):
+        """Update a player's position."""
+        entry = self.positions.get(player_id)
+        if entry is None:
+            self.insert(player_id, x, y)
+            return
+        cell = self._cell(x, y)
+        old_cell = entry[2]
+        if cell != old_cell:
+            self._discard(player_id, old_cell)
+            self.cells.setdefault(cell, set()).add(player_id)
+        self.positions[player_id] = (x, y, cell)
+
+    def remove(self, player_id):
+        """Forget a player."""
+        entry = self.positions.pop(player_id, None)
+        if entry is not None:
+            self._discard(player_id, entry[2])
+
+    def _discard(self, player_id, cell):
+        members = self.cells.get(cell)
+        if members is not None:
+            members.discard(player_id)
+            if not members:
+                del self.cells[cell]
+
+    def query(self, x, y, radius):
+        """
+        Find players within `radius` of a point.
+
+        Returns:
+            set: Player ids
+        """
+        min_cx, min_cy = self._cell(x - radius, y - radius)
+        max_cx, max_cy = self._cell(x + radius, y + radius)
+        radius_sq = radius * radius
+        found = set()
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for player_id in self.cells.get((cx, cy), ()):
+                    px, py, _ = self.positions[player_id]
+                    if (px - x) * (px - x) + (py - y) * (py - y) <= radius_sq:
+                        found.add(player_id)
+        return found
+
+    def visible_to(self, player_id, radius):
+        """Players within `radius` of `player_id` (always including itself)."""
+        entry = self.positions.get(player_id)
+        if entry is None:
+            return set()
+        found = self.query(entry[0], entry[1], radius)
+        found.add(player_id)
+        return found
@@ -0,0 +1,56 @@
+"""
+Player Records
+Cache of encoded snapshot entries so unchanged players are not re-encoded.
+"""
+
+from game.multiplayer.protocol import FIELD_NAME, FIELD_POSITION, encode_entry
+
+
+class RecordCache:
+    """
+    Encoded snapshot entries per player.
+
+    Each player's entries are keyed by (FIELD_* flags, codec) and tied to the
+    (x, y, name) record they were encoded from. When the record changes the
+    player's entries are dropped and re-encoded on first use, so building a
+    snapshot only encodes the players that changed since the last one; every
+    other entry is a cached fragment that is concatenated as is.
+    """
+
+    def __init__(self):
+        self.records = {}  # {player_id: (record, {(flags, codec): bytes})}
+
+    def entry(self, player_id, record, flags, codec):
+        """
+        Encoded entry for a player.
+
+        Args:
+            player_id: Player the entry describes
+            record: Current (x, y, name)
+            flags: FIELD_* flags to include
+            codec: CODEC_BINARY or CODEC_JSON
+
+        Returns:
+            bytes: Fragment for encode_snapshot_entries()
+        """
+        cached = self.records.get(player_id)
+        if cached is None or cached[0] != record:
+            cached = (record, {})
+            self.records[player_id] = cached
+        entries = cached[1]
+        key = (flags, codec)
+        data = entries.get(key)
+        if data is None:
+            fields = {}
+            if flags & FIELD_POSITION:
+                fields["x"] = record[0]
+                fields["y"] = record[1]
+            if flags & FIELD_NAME:
+                fields["name"] = record[2]
+            data = encode_entry(player_id, fields, codec)
+            entries[key] = data
+        return data
+
+    def discard(self, player_id):
+        """Forget a player that left."""
+        self.records.pop(player_id, None)
@@ -5,8 +5,13 @@ Handles server config file and command-line arguments.
 
 import yaml
 import argparse
+import logging
 from pathlib import Path
 
+from library.log import LOG_LEVELS
+
+log = logging.getLogger("server")
+
 
 DEFAULT_SERVER_CONFIG = {
     "host": "0.0.0.0",      # Listen on all interfaces
@@ -14,7 +19,46 @@ DEFAULT_SERVER_CONFIG = {
     "max_players": 8,
     "player_speed": 5,
     "spawn_x": 400,
-    "spawn_y": 300
+    "spawn_y": 300,
+    "tick_rate": 60,        # Simulation ticks per second
+    "snapshot_rate": 0,     # Snapshots per second per client (0 = every tick)
+    "keyframe_interval": 60,  # Full snapshot every N snapshots per client
+    "view_radius": 0,       # Players farther than this are not sent (0 = everyone)
+    "udp": False,           # Offer a UDP channel (same port number) for inputs/snapshots
+    "udp_loss": 0.0,        # Artificial UDP packet loss for testing (0.0-1.0)
+    "send_queue_size": 64,  # Frames buffered per client before dropping old snapshots
+    "send_queue_max_drops": 120,  # Drops without progress before a client is kicked
+    "mode": "threaded",     # "threaded" (thread per client) or "event" (single event loop)
+    "shards": 1,            # Worker processes; rooms are spread across them (Unix only)
+    "log_level": "INFO",    # DEBUG, INFO, WARNING or ERROR
+    "log_rate": 20          # Log messages per second per message type (0 = no limit)
+}
+
+SERVER_MODES = ("threaded", "event")
+
+
+def _count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Settings a running server picks up when the config file changes, each with
+# a check for the new value. Everything else (host, port, mode, tick rate,
+# ...) is fixed once the server has started.
+RELOADABLE = {
+    "max_players": lambda v: _count(v) and v > 0,
+    "player_speed": lambda v: _number(v) and v > 0,
+    "spawn_x": _number,
+    "spawn_y": _number,
+    "snapshot_rate": _count,
+    "keyframe_interval": lambda v: _count(v) and v > 0,
+    "view_radius": lambda v: _number(v) and v >= 0,
+    "send_queue_size": lambda v: _count(v) and v > 0,
+    "send_queue_max_drops": lambda v: _count(v) and v > 0,
+    "log_level": lambda v: v in LOG_LEVELS
 }
 
 
@@ -25,10 +69,84 @@ class ServerConfig:
     
     def __init__(self):
         self.config = {}
+        self.file_config = {}  # Settings as last read from the file
+        self.mtime = None      # Modification time of the file when last read
         self.load()
     
     def load(self):
         """Load config from file or create default."""
+        self._load()
+        self.file_config = dict(self.config)
+        self.mtime = self._file_mtime()
+    
+    def _file_mtime(self):
+        try:
+            return self.CONFIG_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload(self):
+        """
+        Apply changes made to the config file since it was last read.
+        
+        Only keys whose value in the file changed are considered, so
+        command-line overrides stay in effect. A key removed from the file
+        counts as changed back to its default. Changes to RELOADABLE keys are
+        validated and applied together by swapping in a new config dict (if
+        any value is invalid, none are); changes to other keys need a restart
+        and are logged and ignored.
+        
+        Returns:
+            dict: Applied changes {key: new value}, empty if nothing changed
+        """
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self.mtime:
+            return {}
+        self.mtime = mtime
+        try:
+            with open(self.CONFIG_FILE, 'r') as f:
+                loaded = yaml.safe_load(f) or {}
+            if not isinstance(loaded, dict):
+                raise ValueError("expected a mapping of settings")
+        except Exception as e:
+            log.error("Config reload failed, keeping current settings: %s", e)
+            return {}
+        loaded = {**DEFAULT_SERVER_CONFIG, **loaded}
+        
+        changed = {key: value for key, value in loaded.items() if self.file_config.get(key) != value}
+        applied = {}
+        fixed = []
+        invalid = []
+        for key, value in changed.items():
+            check = RELOADABLE.get(key)
+            if check is None:
+                fixed.append(key)
+            elif check(value):
+                applied[key] = value
+            else:
+                invalid.append(key)
+        if invalid:
+            log.error(
+                "Config reload rejected, invalid values: %s",
+                ", ".join(f"{key}={changed[key]!r}" for key in invalid)
+            )
+            return {}
+        
+        self.file_config.update(changed)
+        if fixed:
+            log.warning(
+                "Config changes need a restart, ignored: %s",
+                ", ".join(f"{key} ({self.config.get(key)!r} -> {changed[key]!r})" for key in fixed)
+            )
+        if applied:
+            log.info(
+                "Config reloaded: %s",
+                ", ".join(f"{key} {self.config.get(key)!r} -> {value!r}" for key, value in applied.items())
+            )
+            self.config = {**self.config, **applied}
+        return applied
+    
+    def _load(self):
         if self.CONFIG_FILE.exists():
             try:
                 with open(self.CONFIG_FILE, 'r') as f:
@@ -39,11 +157,11 @@ class ServerConfig:
                         self.config = DEFAULT_SERVER_CONFIG.copy()
                         self.save()
             except Exception as e:
-                print(f"[WARNING] Error loading config: {e}")
+                log.warning("Error loading config: %s", e)
                 self.config = DEFAULT_SERVER_CONFIG.copy()
                 self.save()
         else:
-            print("[INFO] Config file not found, creating default...")
+            log.info("Config file not found, creating default...")
             self.config = DEFAULT_SERVER_CONFIG.copy()
             self.save()
     
@@ -57,7 +175,7 @@ class ServerConfig:
                 yaml.safe_dump(self.config, f, default_flow_style=False)
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to save config: {e}")
+            log.error("Failed to save config: %s", e)
             return False
     
     def parse_args(self):
@@ -78,6 +196,43 @@ class ServerConfig:
             type=int,
             help=f"Maximum players (default: {self.config['max_players']})"
         )
+        parser.add_argument(
+            '-t', '--tick-rate',
+            type=int,
+            help=f"Simulation ticks per second (default: {self.config['tick_rate']})"
+        )
+        parser.add_argument(
+            '--snapshot-rate',
+            type=int,
+            help=f"Snapshots per second, 0 for every tick (default: {self.config['snapshot_rate']})"
+        )
+        parser.add_argument(
+            '--udp',
+            action='store_true',
+            default=None,
+            help=f"Offer a UDP channel for inputs and snapshots (default: {self.config['udp']})"
+        )
+        parser.add_argument(
+            '--udp-loss',
+            type=float,
+            help=f"Drop this fraction of UDP packets, for testing (default: {self.config['udp_loss']})"
+        )
+        parser.add_argument(
+            '--mode',
+            choices=SERVER_MODES,
+            help=f"Server I/O mode (default: {self.config['mode']})"
+        )
+        parser.add_argument(
+            '--shards',
+            type=int,
+            help=f"Worker processes sharing the port, routed by room (default: {self.config['shards']})"
+        )
+        parser.add_argument(
+            '--log-level',
+            choices=LOG_LEVELS,
+            type=str.upper,
+            help=f"Logging level (default: {self.config['log_level']})"
+        )
         parser.add_argument(
             '--save',
             action='store_true',
@@ -93,12 +248,28 @@ class ServerConfig:
             self.config['port'] = args.port
         if args.max_players:
             self.config['max_players'] = args.max_players
+        if args.tick_rate:
+            self.config['tick_rate'] = args.tick_rate
+        if args.snapshot_rate is not None:
+            self.config['snapshot_rate'] = args.snapshot_rate
+        if args.udp:
+            self.config['udp'] = True
+        if args.udp_loss is not None:
+            self.config['udp_loss'] = args.udp_loss
+        if args.mode:
+            self.config['mode'] = args.mode
+        if args.shards:
+            self.config['shards'] = args.shards
+        if args.log_level:
+            self.config['log_level'] = args.log_level
         
         # Save if requested
         if args.save:
-            print("[INFO] Saving configuration...")
+            log.info("Saving configuration...")
             self.save()
-            print(f"[INFO] Configuration saved to {self.CONFIG_FILE}")
+            self.file_config = dict(self.config)
+            self.mtime = self._file_mtime()
+            log.info("Configuration saved to %s", self.CONFIG_FILE)
     
     @property
     def host(self):
@@ -123,3 +294,51 @@ class ServerConfig:
     @property
     def spawn_y(self):
         return self.config['spawn_y']
+    
+    @property
+    def tick_rate(self):
+        return self.config['tick_rate']
+    
+    @property
+    def snapshot_rate(self):
+        return self.config['snapshot_rate']
+    
+    @property
+    def keyframe_interval(self):
+        return self.config['keyframe_interval']
+    
+    @property
+    def view_radius(self):
+        return self.config['view_radius']
+    
+    @property
+    def udp(self):
+        return self.config['udp']
+    
+    @property
+    def udp_loss(self):
+        return self.config['udp_loss']
+    
+    @property
+    def send_queue_size(self):
+        return self.config['send_queue_size']
+    
+    @property
+    def send_queue_max_drops(self):
+        return self.config['send_queue_max_drops']
+    
+    @property
+    def mode(self):
+        return self.config['mode']
+    
+    @property
+    def shards(self):
+        return self.config['shards']
+    
+    @property
+    def log_level(self):
+        return self.config['log_level']
+    
+    @property
+    def log_rate(self):
+        return self.config['log_rate']
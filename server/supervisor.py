@@ -0,0 +1,292 @@
+"""
+Shard Supervisor
+Runs several GameServer shards in worker processes behind one port.
+
+The supervisor owns the listening socket. It reads each new client's HELLO
+to learn which room it wants, picks the shard hosting that room (new rooms
+go to the least loaded shard) and passes the socket to that shard over its
+control channel. Shards report their per-room player counts back, which
+the supervisor uses to enforce max_players across all shards.
+"""
+
+import logging
+import multiprocessing
+import selectors
+import socket
+import time
+
+from server.control import CTRL_LOAD, ControlChannel
+from server.server_config import ServerConfig
+from game.multiplayer.protocol import HEADER, MSG_HELLO, FrameDecoder, ProtocolError, decode_hello
+from library.log import setup_logging
+
+log = logging.getLogger("server")
+
+
+def run_shard(index, server_config, control):
+    """Worker process entry point: serve connections handed over by the supervisor."""
+    from server.game_server import create_server
+
+    setup_logging(server_config.log_level, server_config.log_rate)
+    server = create_server(server_config, control)
+    log.info("[SHARD %s] Started (%s mode)", index, server.MODE_NAME)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.running = False
+        if server.udp:
+            server.udp.close()
+
+
+class _Shard:
+    """Supervisor-side view of one worker process."""
+
+    def __init__(self, index, process, control):
+        self.index = index
+        self.process = process
+        self.control = control
+        self.rooms = {}    # {room: players}, as last reported
+        self.handed = 0    # Connections passed to the shard
+        self.adopted = 0   # Handed-over connections the shard has registered or dropped
+
+    @property
+    def players(self):
+        """Reported players plus connections handed over but not yet reported."""
+        return sum(self.rooms.values()) + self.handed - self.adopted
+
+
+class _PendingClient:
+    """A connection whose HELLO has not fully arrived yet."""
+
+    def __init__(self, sock, addr, deadline):
+        self.sock = sock
+        self.addr = addr
+        self.deadline = deadline
+        self.decoder = FrameDecoder()
+        self.received = bytearray()
+
+
+class ShardSupervisor:
+    """Accepts clients and routes them to shard processes by room."""
+
+    MODE_NAME = "sharded"
+    HANDSHAKE_TIMEOUT = 5.0    # Seconds a client has to send its HELLO
+    MAX_HELLO_SIZE = 1024      # A HELLO is at most a few hundred bytes
+    POLL_INTERVAL = 0.5        # Seconds between handshake timeout / shard health checks
+
+    def __init__(self, server_config=None):
+        if server_config is None:
+            server_config = ServerConfig()
+            server_config.parse_args()
+        self.server_config = server_config
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((self.server_config.host, self.server_config.port))
+        self.server.listen(socket.SOMAXCONN)
+        self.server.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        # Spawned (not forked) workers do not inherit the listening socket
+        self.context = multiprocessing.get_context("spawn")
+        self.shards = []
+        self.room_shards = {}  # {room: shard index}
+        self.pending = {}      # {socket: _PendingClient}
+        self.last_total = 0
+        self.running = True
+
+    def start(self):
+        log.info("=" * 70)
+        log.info("[STARTED] Dash Dash Game Server")
+        log.info("=" * 70)
+        log.info("  Host: %s", self.server_config.host)
+        log.info("  Port: %s", self.server_config.port)
+        log.info("  Max Players: %s", self.server_config.max_players)
+        log.info("  Tick Rate: %s/s", self.server_config.tick_rate)
+        log.info("  Snapshot Rate: %s/s", self.server_config.snapshot_rate or self.server_config.tick_rate)
+        log.info("  Mode: %s (%s x %s)", self.MODE_NAME, self.server_config.shards, self.server_config.mode)
+        log.info("  UDP: %s", "on" if self.server_config.udp else "off")
+        log.info("  Config: %s", ServerConfig.CONFIG_FILE)
+        log.info("=" * 70)
+        log.info("Waiting for connections...")
+        try:
+            for index in range(self.server_config.shards):
+                self.shards.append(self._spawn_shard(index))
+            self.run()
+        except KeyboardInterrupt:
+            log.info("[SHUTDOWN] Server shutting down...")
+        finally:
+            self.running = False
+            self.server.close()
+            for pending in list(self.pending.values()):
+                pending.sock.close()
+            for shard in self.shards:
+                shard.process.join(timeout=2)
+                if shard.process.is_alive():
+                    shard.process.terminate()
+                shard.control.close()
+            self.selector.close()
+            log.info("[STOPPED] Server stopped")
+
+    def _spawn_shard(self, index):
+        """Start a worker process and register its control channel."""
+        control, shard_end = ControlChannel.pair()
+        process = self.context.Process(
+            target=run_shard,
+            args=(index, self.server_config, shard_end),
+            name=f"shard-{index}",
+            daemon=True
+        )
+        process.start()
+        shard_end.close()
+        control.setblocking(False)
+        shard = _Shard(index, process, control)
+        self.selector.register(control, selectors.EVENT_READ, shard)
+        return shard
+
+    def run(self):
+        """Accept and route clients until stopped."""
+        next_check = time.monotonic() + self.POLL_INTERVAL
+        while self.running:
+            for key, _ in self.selector.select(timeout=self.POLL_INTERVAL):
+                if key.data is None:
+                    self._accept()
+                elif isinstance(key.data, _Shard):
+                    self._read_control(key.data)
+                else:
+                    self._read_pending(key.data)
+            now = time.monotonic()
+            if now >= next_check:
+                next_check = now + self.POLL_INTERVAL
+                self.server_config.reload()  # Shards reload on their own
+                self._expire_pending(now)
+                self._check_shards()
+
+    def total_players(self):
+        """Players across every shard, including connections being handed over."""
+        return sum(shard.players for shard in self.shards)
+
+    def _accept(self):
+        """Accept new clients and wait for their HELLO."""
+        while True:
+            try:
+                sock, addr = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            max_players = self.server_config.max_players
+            if self.total_players() + len(self.pending) >= max_players:
+                log.warning("[REJECTED] Connection from %s - Server full (%s/%s)", addr, max_players, max_players)
+                sock.close()
+                continue
+            sock.setblocking(False)
+            pending = _PendingClient(sock, addr, time.monotonic() + self.HANDSHAKE_TIMEOUT)
+            self.pending[sock] = pending
+            self.selector.register(sock, selectors.EVENT_READ, pending)
+
+    def _read_pending(self, pending):
+        """Buffer handshake bytes and route the client once its HELLO is complete."""
+        try:
+            data = pending.sock.recv(self.MAX_HELLO_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop_pending(pending)
+            return
+        pending.received += data
+        try:
+            pending.decoder.feed(data)
+            frames = list(pending.decoder.frames())
+            if not frames:
+                if len(pending.received) > self.MAX_HELLO_SIZE + HEADER.size:
+                    raise ProtocolError("Handshake too large")
+                return
+            msg_type, payload = frames[0]
+            if msg_type != MSG_HELLO:
+                raise ProtocolError(f"Expected hello, got message type {msg_type}")
+            hello = decode_hello(payload)
+        except ProtocolError as e:
+            log.error("Connection from %s: %s", pending.addr, e)
+            self._drop_pending(pending)
+            return
+        self._route(pending, hello.get("room", ""))
+
+    def _route(self, pending, room):
+        """Hand a client over to the shard hosting its room."""
+        self.selector.unregister(pending.sock)
+        del self.pending[pending.sock]
+        max_players = self.server_config.max_players
+        if self.total_players() >= max_players:
+            log.warning("[REJECTED] Connection from %s - Server full (%s/%s)", pending.addr, max_players, max_players)
+            pending.sock.close()
+            return
+        index = self.room_shards.get(room)
+        if index is None:
+            index = min(self.shards, key=lambda shard: shard.players).index
+            self.room_shards[room] = index
+        shard = self.shards[index]
+        try:
+            pending.sock.setblocking(True)
+            shard.control.send_connection(pending.sock, pending.received)
+            shard.handed += 1
+            log.info("[ROUTED] Connection from %s - Room: %s -> Shard %s", pending.addr, room or "-", index)
+        except OSError as e:
+            log.error("Failed to hand connection to Shard %s: %s", index, e)
+        finally:
+            pending.sock.close()  # The shard has its own copy
+
+    def _drop_pending(self, pending):
+        self.selector.unregister(pending.sock)
+        del self.pending[pending.sock]
+        pending.sock.close()
+
+    def _expire_pending(self, now):
+        """Drop clients that connected but never sent a HELLO."""
+        for pending in [p for p in self.pending.values() if p.deadline <= now]:
+            log.error("Connection from %s - No handshake within %.0fs", pending.addr, self.HANDSHAKE_TIMEOUT)
+            self._drop_pending(pending)
+
+    def _read_control(self, shard):
+        """Apply load reports from a shard."""
+        while True:
+            try:
+                msg_type, message = shard.control.receive()
+            except (BlockingIOError, InterruptedError):
+                break
+            except (OSError, ValueError) as e:
+                log.error("Shard %s control channel: %s", shard.index, e)
+                break
+            if msg_type == CTRL_LOAD:
+                shard.rooms = message.get("rooms", {})
+                shard.adopted = message.get("adopted", 0)
+        if shard.handed == shard.adopted:
+            # Empty rooms may move to another shard next time
+            for room, index in list(self.room_shards.items()):
+                if index == shard.index and room not in shard.rooms:
+                    del self.room_shards[room]
+        self._report_total()
+
+    def _report_total(self):
+        total = self.total_players()
+        if total != self.last_total:
+            self.last_total = total
+            per_shard = ", ".join(str(shard.players) for shard in self.shards)
+            log.info("[ACTIVE PLAYERS] %s / %s across %s shard(s) (%s)", total, self.server_config.max_players, len(self.shards), per_shard)
+
+    def _check_shards(self):
+        """Restart shards whose process died; their players are lost."""
+        for shard in list(self.shards):
+            if shard.process.is_alive():
+                continue
+            log.error("Shard %s exited (code %s), restarting", shard.index, shard.process.exitcode)
+            self.selector.unregister(shard.control)
+            shard.control.close()
+            for room, index in list(self.room_shards.items()):
+                if index == shard.index:
+                    del self.room_shards[room]
+            self.shards[shard.index] = self._spawn_shard(shard.index)
+        self._report_total()
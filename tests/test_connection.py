@@ -0,0 +1,82 @@
+"""
+Tests for the bounded per-connection send queue.
+"""
+
+import threading
+
+from server.connection import OutboundQueue
+
+
+def _fill(queue, count, start=0, droppable=True):
+    for i in range(start, start + count):
+        assert queue.put(b"%d;" % i, droppable)
+
+
+def test_frames_are_taken_in_order():
+    queue = OutboundQueue(max_frames=8)
+    _fill(queue, 3)
+    assert len(queue) == 3
+    assert queue.take(0) == b"0;1;2;"
+    assert len(queue) == 0
+    assert queue.take(0) == b""
+
+
+def test_overflow_drops_the_oldest_snapshots():
+    queue = OutboundQueue(max_frames=4, max_drops=100)
+    _fill(queue, 7)
+    assert len(queue) == 4
+    assert queue.drops == 3
+    assert queue.take(0) == b"3;4;5;6;"
+
+
+def test_overflow_keeps_frames_that_cannot_be_dropped():
+    queue = OutboundQueue(max_frames=3, max_drops=100)
+    assert queue.put(b"welcome;")
+    _fill(queue, 4)
+    assert queue.drops == 2
+    assert queue.take(0) == b"welcome;2;3;"
+
+
+def test_queue_grows_when_nothing_can_be_dropped():
+    queue = OutboundQueue(max_frames=2, max_drops=100)
+    _fill(queue, 3, droppable=False)
+    assert queue.drops == 1
+    assert queue.take(0) == b"0;1;2;"
+
+
+def test_lagging_client_is_reported_after_max_drops():
+    queue = OutboundQueue(max_frames=2, max_drops=3)
+    _fill(queue, 2 + 3)              # Three drops are tolerated
+    assert queue.drops == 3
+    assert not queue.put(b"x;", droppable=True)
+    assert queue.drops == 4
+
+
+def test_taking_frames_resets_the_drop_count():
+    queue = OutboundQueue(max_frames=2, max_drops=3)
+    _fill(queue, 5)
+    queue.take(0)
+    assert queue.drops == 0
+    _fill(queue, 5, start=5)         # Another three drops are fine
+    assert queue.take(0) == b"8;9;"
+
+
+def test_resize_applies_to_later_frames():
+    queue = OutboundQueue(max_frames=4, max_drops=100)
+    _fill(queue, 4)
+    queue.resize(2, 100)
+    assert queue.put(b"4;", droppable=True)
+    assert queue.drops == 1
+    assert queue.take(0) == b"1;2;3;4;"  # Frames already queued are kept
+
+
+def test_closed_queue_rejects_frames_and_wakes_the_writer():
+    queue = OutboundQueue()
+    taken = []
+    writer = threading.Thread(target=lambda: taken.append(queue.take(timeout=5)))
+    writer.start()
+    queue.close()
+    writer.join(1)
+    assert not writer.is_alive()
+    assert taken == [b""]
+    assert not queue.put(b"late;")
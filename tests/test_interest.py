@@ -0,0 +1,101 @@
+"""
+Tests for the interest grid used to filter snapshots by view radius.
+"""
+
+from server.interest import InterestGrid
+
+
+def _members(grid):
+    """{cell: set of player ids}, without empty cells."""
+    return {cell: set(players) for cell, players in grid.cells.items()}
+
+
+def test_players_are_bucketed_by_cell():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(2, 99, 99)
+    grid.insert(3, 100, 0)
+    grid.insert(4, -1, -1)
+    assert _members(grid) == {(0, 0): {1, 2}, (1, 0): {3}, (-1, -1): {4}}
+
+
+def test_move_within_a_cell_keeps_the_bucket():
+    grid = InterestGrid(100)
+    grid.insert(1, 10, 10)
+    grid.move(1, 90, 90)
+    assert _members(grid) == {(0, 0): {1}}
+    assert grid.positions[1] == (90, 90, (0, 0))
+
+
+def test_move_across_a_cell_boundary():
+    grid = InterestGrid(100)
+    grid.insert(1, 99, 50)
+    grid.insert(2, 50, 50)
+    grid.move(1, 100, 50)
+    assert _members(grid) == {(0, 0): {2}, (1, 0): {1}}
+    grid.move(2, 50, 150)
+    assert _members(grid) == {(1, 0): {1}, (0, 1): {2}}  # Emptied cells are dropped
+
+
+def test_insert_of_a_known_player_moves_it():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(1, 250, 0)
+    assert _members(grid) == {(2, 0): {1}}
+
+
+def test_remove():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(2, 10, 0)
+    grid.remove(1)
+    grid.remove(3)  # Unknown players are ignored
+    assert _members(grid) == {(0, 0): {2}}
+    assert 1 not in grid.positions
+
+
+def test_query_includes_players_exactly_at_the_radius():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(2, 100, 0)    # Distance 100, in the next cell
+    grid.insert(3, 101, 0)    # Just outside
+    grid.insert(4, 60, 80)    # Distance 100 diagonally
+    grid.insert(5, 71, 71)    # Inside the square, outside the circle
+    assert grid.query(0, 0, 100) == {1, 2, 4}
+
+
+def test_query_reaches_into_neighbouring_cells():
+    grid = InterestGrid(100)
+    # Just across each edge of cell (0, 0) from a point near its corner
+    grid.insert(1, -1, -1)
+    grid.insert(2, 100, 99)
+    grid.insert(3, 99, 100)
+    grid.insert(4, 200, 200)
+    assert grid.query(99, 99, 10) == {2, 3}
+    assert grid.query(0, 0, 2) == {1}
+
+
+def test_query_with_a_radius_larger_than_a_cell():
+    grid = InterestGrid(10)
+    for player_id, x in enumerate(range(0, 100, 10), start=1):
+        grid.insert(player_id, x, 0)
+    assert grid.query(0, 0, 35) == {1, 2, 3, 4}
+
+
+def test_visible_to_includes_the_player_itself():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(2, 500, 500)
+    assert grid.visible_to(1, 50) == {1}
+    assert grid.visible_to(3, 50) == set()
+
+
+def test_results_follow_moves():
+    grid = InterestGrid(100)
+    grid.insert(1, 0, 0)
+    grid.insert(2, 300, 0)
+    assert grid.visible_to(1, 150) == {1}
+    grid.move(2, 150, 0)
+    assert grid.visible_to(1, 150) == {1, 2}
+    grid.move(2, 151, 0)
+    assert grid.visible_to(1, 150) == {1}
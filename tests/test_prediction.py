@@ -0,0 +1,105 @@
+"""
+Tests for client-side prediction and reconciliation with the server.
+"""
+
+import pytest
+
+from game.constants import *
+from game.multiplayer.prediction import Predictor
+
+TICK_RATE = 50
+INTERVAL = 1.0 / TICK_RATE
+START = 100.0
+
+
+@pytest.fixture
+def predictor():
+    predictor = Predictor(TICK_RATE, speed=5)
+    predictor.reconcile(0, 0, 0, 0)  # First snapshot
+    predictor.advance(START)         # Local ticks start one interval later
+    return predictor
+
+
+def _run_ticks(predictor, ticks):
+    """Advance exactly `ticks` local ticks."""
+    predictor.advance(predictor.next_tick + (ticks - 1) * INTERVAL + INTERVAL / 10)
+
+
+def test_inputs_move_the_player_before_the_server_answers(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 3)
+    assert predictor.position == (15, 0)
+    assert list(predictor.pending) == [[1, MOVE_RIGHT, 3]]
+
+
+def test_matching_snapshot_changes_nothing(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 3)
+    predictor.reconcile(10, 0, input_seq=1, input_ticks=2)
+    assert predictor.position == (15, 0)
+    assert predictor.get_position() == (15, 0)
+
+
+def test_correction_replays_unacknowledged_inputs(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 3)
+    predictor.record_input(2, MOVE_DOWN)
+    _run_ticks(predictor, 2)
+    predictor.record_input(3, MOVE_DOWN_LEFT)
+    _run_ticks(predictor, 1)
+    assert predictor.position == (15 - PLAYER_SPEED_DIAGONAL, 10 + PLAYER_SPEED_DIAGONAL)
+
+    # The server applied input 1 for two ticks but from a different position
+    predictor.reconcile(8, 4, input_seq=1, input_ticks=2)
+
+    # One more tick right, two down and one diagonal on top of the server's position
+    expected = (8 + 5 - PLAYER_SPEED_DIAGONAL, 4 + 10 + PLAYER_SPEED_DIAGONAL)
+    assert predictor.position == pytest.approx(expected)
+    assert [seq for seq, _, _ in predictor.pending] == [1, 2, 3]
+
+    # The difference is blended out rather than snapped
+    assert predictor.get_position() == pytest.approx((15 - PLAYER_SPEED_DIAGONAL, 10 + PLAYER_SPEED_DIAGONAL))
+
+
+def test_acknowledged_inputs_are_forgotten(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 2)
+    predictor.record_input(2, MOVE_UP)
+    _run_ticks(predictor, 2)
+    predictor.reconcile(10, -5, input_seq=2, input_ticks=1)
+    assert [seq for seq, _, _ in predictor.pending] == [2]
+    assert predictor.position == (10, -10)
+
+
+def test_server_running_an_input_longer_moves_the_prediction_back(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 2)
+    # The server already simulated three ticks of it (and says where that got it)
+    predictor.reconcile(20, 0, input_seq=1, input_ticks=3)
+    assert predictor.position == (15, 0)
+
+
+def test_large_corrections_snap(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 1)
+    predictor.reconcile(500, 500, input_seq=1, input_ticks=1)
+    assert predictor.position == (500, 500)
+    assert predictor.get_position() == (500, 500)
+
+
+def test_small_corrections_are_blended_out(predictor):
+    predictor.record_input(1, MOVE_NONE)
+    predictor.reconcile(6, 8, input_seq=1, input_ticks=1)
+    assert predictor.get_position() == (0, 0)
+    predictor.advance(predictor.last_advance + 1.0)
+    x, y = predictor.get_position()
+    assert (x, y) != (0, 0)
+    assert x == pytest.approx(6, abs=1e-3) and y == pytest.approx(8, abs=1e-3)
+
+
+def test_new_speed_applies_to_replayed_ticks(predictor):
+    predictor.record_input(1, MOVE_RIGHT)
+    _run_ticks(predictor, 3)
+    predictor.set_speed(10)
+    predictor.reconcile(0, 0, input_seq=1, input_ticks=0)
+    assert predictor.position == (30, 0)
@@ -0,0 +1,176 @@
+"""
+Tests for the wire protocol: frame parsing and input validation.
+"""
+
+import json
+import socket
+
+import pytest
+
+from game.constants import *
+from game.multiplayer.protocol import *
+
+
+def _frames(decoder):
+    """Complete frames in the decoder, with payloads copied out of its buffer."""
+    return [(msg_type, bytes(payload)) for msg_type, payload in decoder.frames()]
+
+
+def _payload(frame):
+    """Payload of an encoded frame, without the header."""
+    return frame[HEADER.size:]
+
+
+# ----------------------------------------------------------------------
+# FrameDecoder
+# ----------------------------------------------------------------------
+
+def test_several_frames_in_one_read():
+    decoder = FrameDecoder()
+    decoder.feed(encode_frame(MSG_INPUT, b"one") + encode_frame(MSG_ACK, b"") + encode_frame(MSG_SNAPSHOT, b"three"))
+    assert _frames(decoder) == [(MSG_INPUT, b"one"), (MSG_ACK, b""), (MSG_SNAPSHOT, b"three")]
+    assert _frames(decoder) == []
+
+
+def test_partial_header_waits_for_the_rest():
+    frame = encode_frame(MSG_INPUT, b"payload")
+    decoder = FrameDecoder()
+    decoder.feed(frame[:3])
+    assert _frames(decoder) == []
+    decoder.feed(frame[3:])
+    assert _frames(decoder) == [(MSG_INPUT, b"payload")]
+
+
+def test_frame_split_across_reads():
+    frame = encode_frame(MSG_SNAPSHOT, bytes(range(200)))
+    decoder = FrameDecoder()
+    received = []
+    # One byte at a time: every split point inside header and payload
+    for i in range(len(frame)):
+        decoder.feed(frame[i:i + 1])
+        received += _frames(decoder)
+    assert received == [(MSG_SNAPSHOT, bytes(range(200)))]
+
+
+def test_trailing_partial_frame_is_kept():
+    first = encode_frame(MSG_INPUT, b"first")
+    second = encode_frame(MSG_INPUT, b"second")
+    decoder = FrameDecoder()
+    decoder.feed(first + second[:4])
+    assert _frames(decoder) == [(MSG_INPUT, b"first")]
+    decoder.feed(second[4:])
+    assert _frames(decoder) == [(MSG_INPUT, b"second")]
+
+
+def test_buffer_grows_for_a_frame_larger_than_it():
+    payload = bytes(range(256)) * 40
+    frame = encode_frame(MSG_SNAPSHOT, payload)
+    decoder = FrameDecoder(size=64)
+    decoder.feed(frame[:10])
+    assert _frames(decoder) == []
+    decoder.feed(frame[10:])
+    assert _frames(decoder) == [(MSG_SNAPSHOT, payload)]
+    assert len(decoder.buffer) >= len(frame)
+
+
+def test_buffer_is_reused_after_compacting():
+    decoder = FrameDecoder(size=64)
+    frame = encode_frame(MSG_INPUT, b"x" * 20)
+    for _ in range(50):
+        decoder.feed(frame)
+        assert _frames(decoder) == [(MSG_INPUT, b"x" * 20)]
+    assert len(decoder.buffer) == 64
+
+
+def test_oversized_frame_is_rejected():
+    decoder = FrameDecoder()
+    decoder.feed(HEADER.pack(MAX_PAYLOAD_SIZE + 1, MSG_SNAPSHOT))
+    with pytest.raises(ProtocolError):
+        _frames(decoder)
+
+
+def test_largest_allowed_frame_waits_instead_of_failing():
+    decoder = FrameDecoder()
+    decoder.feed(HEADER.pack(MAX_PAYLOAD_SIZE, MSG_SNAPSHOT))
+    assert _frames(decoder) == []
+
+
+def test_recv_from_reads_split_frames_from_a_socket():
+    a, b = socket.socketpair()
+    try:
+        frames = encode_frame(MSG_INPUT, b"abc") + encode_frame(MSG_ACK, b"defg")
+        decoder = FrameDecoder(size=16)
+        received = []
+        for chunk in (frames[:2], frames[2:9], frames[9:]):
+            a.sendall(chunk)
+            assert decoder.recv_from(b) == len(chunk)
+            received += _frames(decoder)
+        assert received == [(MSG_INPUT, b"abc"), (MSG_ACK, b"defg")]
+        a.close()
+        assert decoder.recv_from(b) == 0
+    finally:
+        a.close()
+        b.close()
+
+
+# ----------------------------------------------------------------------
+# decode_inputs
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("codec", [CODEC_BINARY, CODEC_JSON])
+def test_inputs_round_trip(codec):
+    inputs = [(1, MOVE_UP), (2, MOVE_DOWN_RIGHT), (3, MOVE_NONE)]
+    decoded = decode_inputs(_payload(encode_inputs(inputs, codec)), codec)
+    assert [(i["seq"], i["movement"]) for i in decoded] == inputs
+
+
+def test_json_single_input_object():
+    payload = json.dumps({"seq": 4, "movement": MOVE_LEFT, "name": "Bob"}).encode()
+    assert decode_inputs(payload, CODEC_JSON) == [{"seq": 4, "movement": MOVE_LEFT, "name": "Bob"}]
+
+
+@pytest.mark.parametrize("message", [
+    [1, 2],                                                  # Not an object
+    {"inputs": {"seq": 1, "movement": 1}},                   # Inputs not a list
+    {"inputs": [1]},                                         # Input not an object
+    {"inputs": [{"seq": 1, "movement": "x"}]},               # Movement not an int
+    {"inputs": [{"seq": 1, "movement": 1.0}]},
+    {"inputs": [{"seq": 1, "movement": None}]},
+    {"inputs": [{"seq": 1, "movement": 16}]},                # Outside MOVEMENT_MASK
+    {"inputs": [{"seq": 1, "movement": -1}]},
+    {"inputs": [{"seq": 1}]},                                # Missing movement
+    {"inputs": [{"movement": 1}]},                           # Missing seq
+    {"inputs": [{"seq": "a", "movement": 1}]},               # Seq not an int
+    {"inputs": [{"seq": True, "movement": 1}]},
+    {"inputs": [{"seq": -1, "movement": 1}]},
+    {"inputs": [{"seq": MAX_INPUT_SEQ + 1, "movement": 1}]},
+    {"inputs": [{"seq": 1, "movement": 1}, {"seq": 2, "movement": "x"}]},  # One bad input in a batch
+    {"seq": 1, "movement": 1, "name": 5},                    # Name not a string
+    {"inputs": [{"seq": i, "movement": 0} for i in range(MAX_INPUT_BATCH + 1)]},
+])
+def test_malformed_json_inputs_are_rejected(message):
+    with pytest.raises(ProtocolError):
+        decode_inputs(json.dumps(message).encode(), CODEC_JSON)
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    b"not json",
+    b"\xff\xfe",
+])
+def test_undecodable_json_inputs_are_rejected(payload):
+    with pytest.raises(ProtocolError):
+        decode_inputs(payload, CODEC_JSON)
+
+
+@pytest.mark.parametrize("payload", [
+    b"",                                          # Empty batch
+    b"\x00\x00\x00\x01",                          # Truncated input
+    _payload(encode_input(1, MOVE_UP, CODEC_BINARY)) + b"\x00",
+    b"\x00\x00\x00\x01\x10",                      # Movement outside MOVEMENT_MASK
+    b"\x00\x00\x00\x01\xff",
+    _payload(encode_inputs([(i, 0) for i in range(1, MAX_INPUT_BATCH + 2)], CODEC_BINARY)),
+])
+def test_malformed_binary_inputs_are_rejected(payload):
+    with pytest.raises(ProtocolError):
+        decode_inputs(payload, CODEC_BINARY)
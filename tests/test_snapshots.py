@@ -0,0 +1,209 @@
+"""
+Tests for per-client delta snapshots: baselines, acks and keyframes.
+
+The server side builds snapshots with GameServer._build_snapshot and a
+NetworkClient (never connected) merges them, so every step checks that
+the client ends up with exactly the server's state.
+"""
+
+import pytest
+
+from game.multiplayer.client import NetworkClient
+from game.multiplayer.protocol import *
+from server.game_server import GameServer
+from server.server_config import ServerConfig
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(ServerConfig, "CONFIG_FILE", tmp_path / "server_config.yaml")
+    config = ServerConfig()
+    config.config.update(host="127.0.0.1", port=0, keyframe_interval=1000)
+    server = GameServer(config)
+    yield server
+    server.server.close()
+
+
+def _decode(frames):
+    """Snapshots in a run of encoded frames."""
+    decoder = FrameDecoder()
+    decoder.feed(frames)
+    return [decode_snapshot(payload, CODEC_BINARY) for msg_type, payload in decoder.frames() if msg_type == MSG_SNAPSHOT]
+
+
+def _join(server, name):
+    """Register a player; returns (player_id, snapshots in the welcome reply)."""
+    player_id = server._allocate_player(None, ("127.0.0.1", 0))
+    hello = {"version": PROTOCOL_VERSION, "codecs": CODEC_BINARY, "flags": 0,
+             "name": name, "client_id": None, "room": ""}
+    accepted, reply = server._register_player(player_id, hello)
+    assert accepted
+    return player_id, _decode(reply)
+
+
+def _client(player_id, snapshots=()):
+    client = NetworkClient()
+    client.player_id = player_id
+    for snapshot in snapshots:
+        client._merge_snapshot(snapshot)
+    return client
+
+
+def _move(server, player_id, x, y):
+    server.players[player_id].update(x=x, y=y)
+    server.interest.move(player_id, x, y)
+
+
+def _send(server, player_id, client, force=False):
+    """Build the next snapshot for `player_id` and merge it into `client`."""
+    frame = server._build_snapshot(player_id, server._snapshot_players(), force)
+    if frame is None:
+        return None
+    (snapshot,) = _decode(frame)
+    assert client._merge_snapshot(snapshot) == snapshot["seq"]
+    return snapshot
+
+
+def _server_state(server):
+    return {pid: {"x": x, "y": y, "name": name} for pid, (x, y, name) in server._snapshot_players().items()}
+
+
+def _client_state(client):
+    return {pid: dict(fields) for pid, fields in client.players.items()}
+
+
+def test_first_snapshot_is_a_keyframe(server):
+    a, snapshots = _join(server, "a")
+    (snapshot,) = snapshots
+    assert snapshot["seq"] == 1
+    assert snapshot["base"] == KEYFRAME
+    assert _client_state(_client(a, snapshots)) == _server_state(server)
+
+
+def test_delta_carries_only_changed_fields(server):
+    a, snapshots = _join(server, "a")
+    b, _ = _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+
+    joined = _send(server, a, client)
+    assert joined["base"] == 1
+    assert joined["players"] == {b: {"x": server.server_config.spawn_x, "y": server.server_config.spawn_y, "name": "b"}}
+
+    server._acknowledge(a, joined["seq"])
+    _move(server, b, 10, 20)
+    moved = _send(server, a, client)
+    assert moved["base"] == joined["seq"]
+    assert moved["players"] == {b: {"x": 10, "y": 20}}
+    assert _client_state(client) == _server_state(server)
+
+
+def test_unchanged_state_is_not_resent(server):
+    a, snapshots = _join(server, "a")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+    assert _send(server, a, client) is None
+    assert _send(server, a, client, force=True)["players"] == {}
+
+
+def test_delta_merge_across_a_dropped_ack(server):
+    a, snapshots = _join(server, "a")
+    b, _ = _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+
+    # The client applies seq 2 but its ack never arrives
+    lost_ack = _send(server, a, client)
+    assert lost_ack["base"] == 1
+
+    # So seq 3 is still a delta against seq 1, and repeats b's join
+    _move(server, b, 30, 40)
+    resent = _send(server, a, client)
+    assert resent["base"] == 1
+    assert resent["players"] == {b: {"x": 30, "y": 40, "name": "b"}}
+    assert _client_state(client) == _server_state(server)
+
+    # Once seq 3 is acked, deltas build on it and b leaves
+    server._acknowledge(a, resent["seq"])
+    server._remove_player(b)
+    left = _send(server, a, client)
+    assert left["base"] == resent["seq"]
+    assert left["players"] == {}
+    assert left["removed"] == [b]
+    assert _client_state(client) == _server_state(server)
+
+
+def test_stale_ack_does_not_move_the_baseline_back(server):
+    a, snapshots = _join(server, "a")
+    _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+    second = _send(server, a, client)
+    server._acknowledge(a, second["seq"])
+    server._acknowledge(a, 1)  # Reordered datagram
+    assert server.players[a]["acked"] == second["seq"]
+
+
+def test_keyframe_is_forced_every_keyframe_interval(server):
+    server.server_config.config["keyframe_interval"] = 3
+    a, snapshots = _join(server, "a")
+    b, _ = _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+
+    bases = []
+    for step in range(6):
+        _move(server, b, step, step)
+        snapshot = _send(server, a, client)
+        server._acknowledge(a, snapshot["seq"])
+        bases.append(snapshot["base"])
+        if snapshot["base"] == KEYFRAME:
+            assert snapshot["players"] == _server_state(server)
+        assert _client_state(client) == _server_state(server)
+    # Seqs 2-7: a keyframe at seq 4 and seq 7, deltas against the previous seq otherwise
+    assert bases == [1, 2, KEYFRAME, 4, 5, KEYFRAME]
+
+
+def test_keyframe_replaces_state_after_a_missed_removal(server):
+    server.server_config.config["keyframe_interval"] = 3
+    a, snapshots = _join(server, "a")
+    b, _ = _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+    _send(server, a, client)
+    server._acknowledge(a, 2)
+
+    # Over UDP, the delta announcing b's removal is lost on the way
+    server.players[a]["udp_addr"] = ("127.0.0.1", 1)
+    server._remove_player(b)
+    lost = server._build_snapshot(a, server._snapshot_players())
+    assert _decode(lost)[0]["removed"] == [b]
+    assert b in client.players
+
+    # Unacked, so it is sent again; by now a keyframe is due
+    keyframe = _send(server, a, client)
+    assert keyframe["base"] == KEYFRAME
+    assert _client_state(client) == _server_state(server)
+
+
+def test_keyframe_when_the_client_stops_acknowledging(server):
+    a, snapshots = _join(server, "a")
+    b, _ = _join(server, "b")
+    client = _client(a, snapshots)
+    server._acknowledge(a, 1)
+
+    for step in range(GameServer.SNAPSHOT_HISTORY + 1):
+        _move(server, b, step, 0)
+        snapshot = _send(server, a, client)
+    # The acked baseline fell out of the history, so nothing is left to delta against
+    assert snapshot["base"] == KEYFRAME
+    assert _client_state(client) == _server_state(server)
+
+
+def test_client_drops_a_delta_with_an_unknown_baseline(server):
+    a, snapshots = _join(server, "a")
+    client = _client(a, snapshots)
+    delta = {"seq": 5, "base": 4, "input_seq": 0, "input_ticks": 0, "tick": 0,
+             "players": {a: {"x": 1.0, "y": 2.0}}, "removed": []}
+    assert client._merge_snapshot(delta) is None
+    assert client.snapshot_seq == 1